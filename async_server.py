@@ -0,0 +1,291 @@
+import asyncio
+from concurrent import futures
+import argparse
+import time
+
+import grpc
+import rfcontrol_pb2_grpc
+import rfcontrol_pb2
+
+from server import RFControllerServicer, add_servicer_arguments, enable_reflection, servicer_options
+from rpc_log import add_logging_arguments, log, log_call, setup_logging, setup_logging_from_args
+from status_hub import watch_delay
+
+
+class AsyncRFControllerServicer(RFControllerServicer):
+    """
+    asyncio version of RFControllerServicer for grpc.aio.
+
+    Streams are coroutines on the event loop, so open streams do not hold a
+    thread each. Device calls are queued on the device's actor and awaited;
+    other blocking work (upstream calls, FFTs, file I/O) runs on a bounded executor.
+    """
+    def __init__(self, max_workers=4, **options):
+        super().__init__(**options)
+        self.executor = futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="device")
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def _get_device_async(self, device_id, context, ready=False):
+        # Waiting for a device that is still opening blocks, so do it off the event loop
+        available = self.devices.ready(device_id) if ready else device_id in self.devices
+        if available or not self.devices.discovering:
+            return self._get_device(device_id, context, ready)
+        return await self._run(self._get_device, device_id, context, ready)
+
+    async def _device_call(self, device, func, *args):
+        # Queue on the device's actor and await its future, without holding an executor thread
+        return await asyncio.wrap_future(device.submit(func, *args))
+
+    async def _device_request_async(self, device_id, context, call, ready=False):
+        # Like _device_request: await call(device), looking the device up again
+        # once if a rescan retired or replaced it meanwhile
+        for attempt in range(2):
+            device = await self._get_device_async(device_id, context, ready)
+            if device is None:
+                return None
+            try:
+                return await call(device)
+            except RuntimeError:
+                if not device.closed:
+                    raise
+        self._device_removed(device_id, context)
+        return None
+
+    async def _cached(self, func, device, capability):
+        # Cache hits are answered on the event loop, misses query the device on its actor
+        if self.capabilities.has(device, capability):
+            return func(device)
+        return await self._device_call(device, func, device)
+
+    async def setRFSettings(self, request, context):
+        log_call("setRFSettings", "Config: frequency=%s, gain=%s", request.frequency, request.gain, device_id=request.device_id)
+
+        response = await self._device_request_async(
+            request.device_id, context,
+            lambda device: self._device_call(device, self._apply_rf_settings, device, request), ready=True)
+        if response is None:
+            return rfcontrol_pb2.RFResponse(success=False, message=context.details())
+        return response
+
+    async def GetDeviceInformation(self, request, context):
+        # VISA and FlexSDR calls are blocking network round trips
+        return await self._run(super().GetDeviceInformation, request, context)
+
+    async def ExecuteBatch(self, request, context):
+        return await self._run(super().ExecuteBatch, request, context)
+
+    async def FanOutCommand(self, request, context):
+        fan = self._fan_out(request, context)
+        if fan is None:
+            return
+        # Node calls are gRPC futures; waiting for them costs no thread here
+        try:
+            async for result in fan:
+                yield self._fan_out_result(result)
+        finally:
+            fan.cancel()
+
+    async def getDeviceStatus(self, request, context):
+        log_call("getDeviceStatus", "Request", device_id=request.device_id)
+
+        response = await self._device_request_async(
+            request.device_id, context, lambda device: self._device_call(device, self._device_status, device))
+        if response is None:
+            return rfcontrol_pb2.DeviceStatusResponse()
+        return response
+
+    async def getPPString(self, request, context):
+        log_call("getPPString", "Request", device_id=request.device_id)
+
+        response = await self._device_request_async(
+            request.device_id, context, lambda device: self._cached(self._pp_string, device, "pp_string"))
+        if response is None:
+            return rfcontrol_pb2.PPStringResponse(pp_string="")
+        return response
+
+    async def getGainRange(self, request, context):
+        log_call("getGainRange", "Request", device_id=request.device_id)
+
+        response = await self._device_request_async(
+            request.device_id, context, lambda device: self._cached(self._gain_range, device, "gain_range"))
+        if response is None:
+            return rfcontrol_pb2.RangeResponse()
+        return response
+
+    async def getFrequencyRange(self, request, context):
+        log_call("getFrequencyRange", "Request", device_id=request.device_id)
+
+        response = await self._device_request_async(
+            request.device_id, context, lambda device: self._cached(self._frequency_range, device, "freq_range"))
+        if response is None:
+            return rfcontrol_pb2.RangeResponse()
+        return response
+
+    async def WatchDeviceStatus(self, request, context):
+        device_ids = self._watch_device_ids(request, context)
+        if device_ids is None:
+            return
+        log_call("WatchDeviceStatus", "Watching %s", device_ids or "all devices")
+
+        # The hub calls back from its poller thread; waiting costs no thread here
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        callback = lambda: loop.call_soon_threadsafe(wakeup.set)
+        self.status_hub.subscribe(callback)
+        try:
+            for device_id in self._watched(device_ids):
+                await self._run(self.status_hub.notify, device_id)
+            seen = {}
+            last_sent = 0.0
+            while True:
+                wakeup.clear()
+                if not self.status_hub.changed(self._watched(device_ids), dict(seen)):
+                    await wakeup.wait()
+                    continue
+                if seen:
+                    await asyncio.sleep(watch_delay(last_sent, request.min_interval, request.coalesce))
+                for device_id, version, status in self.status_hub.changed(self._watched(device_ids), seen):
+                    yield self._status_response(status, version)
+                last_sent = time.monotonic()
+        finally:
+            self.status_hub.unsubscribe(callback)
+
+    async def _run_batch_async(self, requests, field, call):
+        jobs = self._submit_batch(requests, field, call)
+        results = await asyncio.gather(*(asyncio.wrap_future(job) for job in jobs))
+        return rfcontrol_pb2.BatchDeviceResponse(results=results)
+
+    async def batchSetRFSettings(self, request, context):
+        log_call("batchSetRFSettings", "%d requests", len(request.requests))
+        return await self._run_batch_async([(r.device_id, r) for r in request.requests], "rf", self._apply_rf_settings)
+
+    async def batchGetDeviceStatus(self, request, context):
+        log_call("batchGetDeviceStatus", "%d devices", len(request.device_ids))
+        return await self._run_batch_async([(d, None) for d in request.device_ids], "status", self._device_status)
+
+    async def batchGetPPString(self, request, context):
+        log_call("batchGetPPString", "%d devices", len(request.device_ids))
+        return await self._run_batch_async([(d, None) for d in request.device_ids], "pp_string", self._pp_string)
+
+    async def batchGetGainRange(self, request, context):
+        log_call("batchGetGainRange", "%d devices", len(request.device_ids))
+        return await self._run_batch_async([(d, None) for d in request.device_ids], "range", self._gain_range)
+
+    async def batchGetFrequencyRange(self, request, context):
+        log_call("batchGetFrequencyRange", "%d devices", len(request.device_ids))
+        return await self._run_batch_async([(d, None) for d in request.device_ids], "range", self._frequency_range)
+
+    async def getDeviceQueueStats(self, request, context):
+        return super().getDeviceQueueStats(request, context)
+
+    async def Greet(self, request, context):
+        return super().Greet(request, context)
+
+    async def Chat(self, request_iterator, context):
+        async for request in request_iterator:
+            yield rfcontrol_pb2.GreetingResponse(greeting=f"Welcome, {request.name}!")
+
+    async def SendFFTCoefficients(self, request, context):
+        return super().SendFFTCoefficients(request, context)
+
+    async def StreamFFTCoefficients(self, request_iterator, context):
+        chunk_count = 0
+        async for request in request_iterator:
+            chunk_count += 1
+            try:
+                response = self._process_fft_chunk(request)
+            except ValueError as e:
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details(f"Chunk {request.chunk_id}: {e}")
+                return
+            if self._ack_due(request.ack_every, chunk_count, request.is_last_chunk):
+                yield response
+
+    async def ComputeSpectrum(self, request_iterator, context):
+        context.set_compression(self.compression_policy.transport("ComputeSpectrum"))
+        compression = self.compression_policy.stream(context, "ComputeSpectrum")
+        engine = None
+        async for block in request_iterator:
+            if engine is None:
+                engine = self._create_spectrum_engine(block, context)
+                if engine is None:
+                    return
+            try:
+                # FFTs are CPU bound, keep them off the event loop
+                frames = await self._run(self._spectrum_frames, engine, block)
+            except ValueError as e:
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details(str(e))
+                return
+            for frame in frames:
+                compression.apply(frame.power.data)
+                yield frame
+            if block.is_last:
+                break
+
+    async def TransferData(self, request_iterator, context):
+        context.set_compression(self.compression_policy.transport("TransferData"))
+        compression = self.compression_policy.stream(context, "TransferData")
+        sink = None
+        completed = False
+        chunk_count = 0
+        try:
+            async for chunk in request_iterator:
+                chunk_count += 1
+                try:
+                    if chunk_count == 1:
+                        sink = await self._run(self._open_transfer_sink, chunk)
+                    if sink is not None:
+                        # File and memory map writes may block on disk
+                        response = await self._run(self._process_data_chunk, chunk, chunk_count, sink)
+                    else:
+                        response = self._process_data_chunk(chunk, chunk_count)
+                except ValueError as e:
+                    context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+                    context.set_details(str(e))
+                    return
+                completed = chunk.is_last
+                if sink is None or self._ack_due(chunk.ack_every, chunk_count, chunk.is_last):
+                    compression.apply(response.data)
+                    yield response
+                if chunk.is_last:
+                    log_call("TransferData", "Processed %d chunks", chunk_count)
+                    break
+        finally:
+            self._close_transfer_sink(sink, completed)
+
+    async def GetTransferStatus(self, request, context):
+        return super().GetTransferStatus(request, context)
+
+
+def create_async_server(port=5555, max_workers=4, servicer=None, **options):
+    server = grpc.aio.server()
+    servicer = servicer or AsyncRFControllerServicer(max_workers, **options)
+    rfcontrol_pb2_grpc.add_RFControllerServicer_to_server(servicer, server)
+    enable_reflection(server)
+    server.add_insecure_port(f'[::]:{port}')
+    return server
+
+async def serve_async(port=5555, max_workers=4, **options):
+    setup_logging()
+    server = create_async_server(port, max_workers, **options)
+    await server.start()
+    log.info("Async server started on port %d", port)
+
+    try:
+        await server.wait_for_termination()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await server.stop(0)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='RF Control gRPC Server (asyncio)')
+    parser.add_argument('-p', '--port', type=int, default=5555, help='Port to run the gRPC server on')
+    parser.add_argument('-w', '--workers', type=int, default=4, help='Size of the executor for blocking calls')
+    add_servicer_arguments(parser)
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    setup_logging_from_args(args)
+    asyncio.run(serve_async(port=args.port, max_workers=args.workers, **servicer_options(args)))
@@ -0,0 +1,92 @@
+"""
+CPU cost against bytes saved for each compression codec on typical payloads.
+
+gzip and deflate are what gRPC transport compression runs (zlib at its
+default level); zlib-1, lz4 and zstd are the PackedArray payload codecs of
+compression.py. lz4 and zstd are only listed when installed.
+
+    python bench_compression.py --repeats 5
+"""
+import argparse
+import time
+import zlib
+
+import numpy as np
+
+from compression import CODECS, sampled_ratio
+from fft_calculator import calculate_fft
+from packed_array import pack_array, pack_coefficients
+
+
+def deflate_raw(data):
+    compressor = zlib.compressobj(wbits=-15)
+    return compressor.compress(data) + compressor.flush()
+
+def inflate_raw(data, max_size):
+    return zlib.decompress(data, wbits=-15)
+
+
+def codecs():
+    result = {
+        "gzip": (zlib.compress, lambda data, max_size: zlib.decompress(data)),
+        "deflate": (deflate_raw, inflate_raw),
+        "zlib-1": CODECS["zlib"],
+    }
+    for name in ("lz4", "zstd"):
+        if name in CODECS:
+            result[name] = CODECS[name]
+    return result
+
+def payloads(size):
+    rng = np.random.default_rng(0)
+    t = np.arange(size // 8) / 1000.0
+    signal = np.sin(2 * np.pi * 10.0 * t) + 0.01 * rng.standard_normal(len(t))
+    _, real, imag = calculate_fft(signal)
+    power = real.astype(np.float32) ** 2 + imag.astype(np.float32) ** 2
+    return {
+        "FFT complex64": pack_coefficients(real, imag, "complex64").data,
+        "power float32": pack_array(power, "float32").data,
+        "raw capture": rng.integers(0, 256, size, dtype=np.uint8).tobytes(),
+        "demo text": (b"ABC XYZ " * (size // 8 + 1))[:size],
+    }
+
+def measure(data, compress, decompress, repeats):
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    for _ in range(repeats):
+        compressed = compress(data)
+    compress_cpu = (time.process_time() - cpu) / repeats
+    compress_wall = (time.perf_counter() - wall) / repeats
+
+    wall = time.perf_counter()
+    for _ in range(repeats):
+        decompress(compressed, len(data))
+    decompress_wall = (time.perf_counter() - wall) / repeats
+
+    mb = len(data) / 1e6
+    return {
+        "ratio": len(compressed) / len(data),
+        "saved": len(data) - len(compressed),
+        "cpu_ms_per_mb": compress_cpu * 1e3 / mb,
+        "compress_mb_s": mb / compress_wall if compress_wall else float("inf"),
+        "decompress_mb_s": mb / decompress_wall if decompress_wall else float("inf"),
+        "sampled": sampled_ratio(data, compress),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Compression codec benchmark')
+    parser.add_argument('--size', type=int, default=4 * 1024 * 1024, help='Approximate payload size in bytes')
+    parser.add_argument('--repeats', type=int, default=5, help='Runs per codec and payload')
+    args = parser.parse_args()
+
+    print(f"{'payload':<15}{'codec':<9}{'size':>10}{'ratio':>7}{'sampled':>9}{'saved KB':>10}"
+          f"{'CPU ms/MB':>11}{'comp MB/s':>11}{'dec MB/s':>10}")
+    for payload, data in payloads(args.size).items():
+        for name, (compress, decompress) in codecs().items():
+            r = measure(data, compress, decompress, args.repeats)
+            print(f"{payload:<15}{name:<9}{len(data):>10}{r['ratio']:>7.2f}{r['sampled']:>9.2f}"
+                  f"{r['saved'] / 1024:>10.0f}{r['cpu_ms_per_mb']:>11.2f}"
+                  f"{r['compress_mb_s']:>11.1f}{r['decompress_mb_s']:>10.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+One SCPI command per round trip against batched commands, on the mock instrument.
+
+Each query on a real VISA instrument pays a bus or network round trip;
+ExecuteBatch sends a batch as one message and reads all replies at once.
+
+    python bench_scpi.py --latency 0.005 --commands 20
+"""
+import argparse
+import time
+
+from visa_wrapper import VisaWrapper
+
+
+def commands(count):
+    base = ["*IDN?", "SYST:ERR?", "FREQ?", "GAIN?", "FREQ 2e6", "GAIN 12"]
+    return [base[i % len(base)] for i in range(count)]
+
+def measure(wrapper, batch, repeats, batched):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        if batched:
+            wrapper.ExecuteBatch(batch)
+        else:
+            for command in batch:
+                wrapper.ExecuteBatch([command])
+    return (time.perf_counter() - start) / repeats
+
+def main():
+    parser = argparse.ArgumentParser(description='SCPI batching benchmark')
+    parser.add_argument('--latency', type=float, default=0.005, help='Round trip latency of the mock instrument in seconds')
+    parser.add_argument('--commands', type=int, default=20, help='Commands per batch')
+    parser.add_argument('--repeats', type=int, default=5, help='Runs per mode')
+    args = parser.parse_args()
+
+    wrapper = VisaWrapper("bench", query_delay=args.latency)
+    wrapper.open()
+    batch = commands(args.commands)
+    single = measure(wrapper, batch, args.repeats, batched=False)
+    batched = measure(wrapper, batch, args.repeats, batched=True)
+    print(f"{args.commands} commands, {args.latency * 1e3:.1f} ms round trip")
+    print(f"{'one per round trip':<20} {single * 1e3:8.1f} ms")
+    print(f"{'batched':<20} {batched * 1e3:8.1f} ms  ({single / batched:.1f}x)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Compare the thread pool server with the grpc.aio server on the mock device.
+
+For each server a number of Chat streams are opened and held, then a burst of
+getDeviceStatus calls is sent while the streams stay open. Each server runs
+in its own process; the report shows how many streams were served, unary
+latency, timeouts and the server's OS thread count.
+
+    python bench_server.py --streams 200 --calls 500
+"""
+import asyncio
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import grpc
+import rfcontrol_pb2
+import rfcontrol_pb2_grpc
+
+
+async def hold_stream(stub, opened, release, timeout):
+    async def requests():
+        yield rfcontrol_pb2.GreetingRequest(name="bench")
+        await release.wait()
+
+    call = stub.Chat(requests())
+    try:
+        await asyncio.wait_for(call.read(), timeout)
+        opened.append(call)
+        await release.wait()
+        while await call.read() != grpc.aio.EOF:
+            pass
+    except (asyncio.TimeoutError, grpc.aio.AioRpcError):
+        call.cancel()
+
+async def timed_status(stub, timeout):
+    start = time.perf_counter()
+    try:
+        await stub.getDeviceStatus(rfcontrol_pb2.DeviceRequest(device_id="mock"), timeout=timeout)
+    except grpc.aio.AioRpcError as e:
+        if e.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
+            return None
+        raise
+    return time.perf_counter() - start
+
+def server_threads(proc):
+    # OS thread count of the server process (Linux only)
+    try:
+        with open(f"/proc/{proc.pid}/status") as f:
+            for line in f:
+                if line.startswith("Threads:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return -1
+
+async def run_load(proc, port, streams, calls, timeout):
+    async with grpc.aio.insecure_channel(f'localhost:{port}') as channel:
+        await asyncio.wait_for(channel.channel_ready(), 10)
+        stub = rfcontrol_pb2_grpc.RFControllerStub(channel)
+        opened = []
+        release = asyncio.Event()
+        holders = [asyncio.ensure_future(hold_stream(stub, opened, release, timeout)) for _ in range(streams)]
+        await asyncio.sleep(timeout)
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(timed_status(stub, timeout) for _ in range(calls)))
+        elapsed = time.perf_counter() - start
+        threads = server_threads(proc)
+
+        release.set()
+        await asyncio.gather(*holders)
+
+    done = sorted(l for l in latencies if l is not None)
+    return {
+        "streams": len(opened),
+        "ok": len(done),
+        "timeouts": len(latencies) - len(done),
+        "p50_ms": done[len(done) // 2] * 1e3 if done else float("nan"),
+        "p99_ms": done[int(len(done) * 0.99) - 1] * 1e3 if done else float("nan"),
+        "calls_per_s": len(done) / elapsed,
+        "threads": threads,
+    }
+
+def bench(port, args, use_async):
+    server = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py")
+    cmd = [sys.executable, server, "-p", str(port), "-w", str(args.workers)]
+    if use_async:
+        cmd.append("--async")
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        return asyncio.run(run_load(proc, port, args.streams, args.calls, args.timeout))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description='Threaded vs asyncio server benchmark')
+    parser.add_argument('-p', '--port', type=int, default=50555, help='First port to bind the servers on')
+    parser.add_argument('--streams', type=int, default=200, help='Concurrent Chat streams held open')
+    parser.add_argument('--calls', type=int, default=500, help='getDeviceStatus calls sent while streams are open')
+    parser.add_argument('--workers', type=int, default=4, help='Thread pool / device executor size')
+    parser.add_argument('--timeout', type=float, default=2.0, help='Per-call deadline in seconds')
+    args = parser.parse_args()
+
+    results = {
+        "threaded": bench(args.port, args, use_async=False),
+        "async": bench(args.port + 1, args, use_async=True),
+    }
+
+    print(f"{args.streams} streams held, {args.calls} getDeviceStatus calls, {args.workers} workers")
+    print(f"{'server':<10}{'streams':>9}{'ok':>7}{'timeout':>9}{'p50 ms':>9}{'p99 ms':>9}{'calls/s':>10}{'threads':>9}")
+    for name, r in results.items():
+        print(f"{name:<10}{r['streams']:>9}{r['ok']:>7}{r['timeouts']:>9}{r['p50_ms']:>9.2f}"
+              f"{r['p99_ms']:>9.2f}{r['calls_per_s']:>10.1f}{r['threads']:>9}")
+
+if __name__ == '__main__':
+    main()
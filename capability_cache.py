@@ -0,0 +1,72 @@
+import itertools
+import threading
+
+
+class CapabilityCache:
+    """
+    Per-device cache of values that do not change while a device is open:
+    gain and frequency ranges and the printable device string.
+
+    Entries are keyed by the device object, so a reconnected device (a new
+    object) never sees values of the old one. Call invalidate() when a device
+    is closed or reopened, and invalidate(device, "pp_string") after settings
+    that the printable string reports. A value queried while the device's
+    entries were invalidated is returned but not cached, so a query that
+    raced a setting change cannot put the old value back.
+
+    usage:
+    cache = CapabilityCache()
+    cache.fill(device)
+    min_gain, max_gain = cache.get(device, "gain_range")
+    """
+    QUERIES = {
+        "gain_range": lambda device: device.get_rx_gain_range(),
+        "freq_range": lambda device: device.get_rx_freq_range(),
+        "pp_string": lambda device: device.get_pp_string(),
+    }
+
+    def __init__(self):
+        self._entries = {}
+        # device -> generation, changed by every invalidate()
+        self._generations = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, device, name):
+        """Cached value of name for device, queried from the device on a miss."""
+        with self._lock:
+            entries = self._entries.get(device)
+            if entries is not None and name in entries:
+                self.hits += 1
+                return entries[name]
+            self.misses += 1
+            generation = self._generations.setdefault(device, next(self._counter))
+        value = self.QUERIES[name](device)
+        with self._lock:
+            if self._generations.get(device) == generation:
+                self._entries.setdefault(device, {})[name] = value
+        return value
+
+    def has(self, device, name):
+        with self._lock:
+            return name in self._entries.get(device, ())
+
+    def fill(self, device):
+        """Query every capability of a newly opened device."""
+        for name in self.QUERIES:
+            self.get(device, name)
+
+    def invalidate(self, device, *names):
+        """Drop the given entries of device, or all of them if no names are given."""
+        with self._lock:
+            if not names:
+                self._entries.pop(device, None)
+                self._generations.pop(device, None)
+                return
+            self._generations[device] = next(self._counter)
+            entries = self._entries.get(device)
+            if entries is not None:
+                for name in names:
+                    entries.pop(name, None)
@@ -5,9 +5,14 @@ from datetime import datetime
 import sys
 import argparse
 import numpy as np
-from fft_calculator import calculate_fft, chunk_fft_data
+from fft_calculator import calculate_fft, chunk_fft_data, stft_stream
+from packed_array import pack_coefficients, pack_array, unpack_array
+from compression import CompressionPolicy
+from transfer import (AdaptiveChunkSizer, BufferSink, FlowControl, MmapSink, MmapSource,
+                      DEFAULT_CHUNK_SIZE, ECHO_SUFFIX, MAX_CHUNK_SIZE)
 import logging
 import time
+import uuid
 
 try:
     from tkinter import *
@@ -17,11 +22,22 @@ except ImportError:
     gui = False
     print("Tkinter is not available. Running in CLI mode.\nTo enable GUI, please install Tkinter.\n python -m pip install tk\n\n")
 
+# Per-method compression rules, see compression.py (--compression to load a JSON file)
+compression_policy = CompressionPolicy()
+
+# grpc.StatusCode names by numeric value, for per-device batch results
+status_names = {code.value[0]: code.name for code in grpc.StatusCode}
+
 method_options = ["setRFSettings", "getDeviceStatus", "getDevicePPString", "getGainRange", 
                   "getFrequencyRange", "Chat", "FFTCoefficients", "StreamFFTCoefficients",
-                  "TransferData",
+                  "StreamSTFTCoefficients",
+                  "TransferData", "ComputeSpectrum",
+                  "batchSetRFSettings", "batchGetDeviceStatus", "WatchDeviceStatus",
+                  "getDeviceQueueStats",
                   " ------------------ ",
                   "GetDeviceInformation",
+                  "ExecuteBatch",
+                  "FanOutCommand",
                   "GetRFDCCenterFrequency",
                   "RFDCEnableStatus",
                   "RFDCiBW",
@@ -66,22 +82,30 @@ class Client:
         t = np.linspace(0, n_samples/sampling_rate, n_samples, endpoint=False)
         return np.sin(2 * np.pi * freq * t)
     
-    def send_fft_coefficients(stub):
+    def send_fft_coefficients(stub, packed_dtype="complex64"):
         # Generate sample signal
         signal = Client.generate_sample_signal()
     
         # Calculate FFT
         frequencies, real_coeffs, imag_coeffs = calculate_fft(signal)
     
-        # Create request
-        request = rfcontrol_pb2.FFTCoefficientsRequest(
-            real=real_coeffs.tolist(),
-            imag=imag_coeffs.tolist()
-        )
+        # Create request, packed as raw bytes unless packed_dtype is None
+        if packed_dtype:
+            request = rfcontrol_pb2.FFTCoefficientsRequest(
+                coefficients=pack_coefficients(real_coeffs, imag_coeffs, packed_dtype,
+                                               compression_policy.codec("SendFFTCoefficients"))
+            )
+        else:
+            request = rfcontrol_pb2.FFTCoefficientsRequest(
+                real=real_coeffs.tolist(),
+                imag=imag_coeffs.tolist()
+            )
         
         # Send request
         try:
-            response = stub.SendFFTCoefficients(request)
+            payload = request.coefficients.data if packed_dtype else None
+            response = stub.SendFFTCoefficients(
+                request, compression=compression_policy.transport("SendFFTCoefficients", payload))
             print(f"Server response: {response.status}")
             return response
         except grpc.RpcError as e:
@@ -93,7 +117,7 @@ class Client:
         t = np.linspace(0, n_samples/sampling_rate, n_samples, endpoint=False)
         return np.sin(2 * np.pi * freq * t)
 
-    def stream_fft_coefficients(stub):
+    def stream_fft_coefficients(stub, packed_dtype="complex64", ack_every=8):
         # Generate large signal
         signal = Client.generate_large_signal()
     
@@ -105,56 +129,287 @@ class Client:
         ##with grpc.insecure_channel('localhost:50051') as channel:
             ##stub = fft_stream_service_pb2_grpc.FFTStreamServiceStub(channel)
         
+        # With ack_every > 1 the server replies every ack_every chunks and the
+        # chunk size (in coefficients) adapts to the measured throughput
+        flow = None
+        if ack_every > 1:
+            sizer = AdaptiveChunkSizer(initial=16384, minimum=1000, maximum=MAX_CHUNK_SIZE // 16)
+            flow = FlowControl(ack_every, sizer=sizer)
+
+        codec = compression_policy.codec("StreamFFTCoefficients")
+
         def make_requests():
             # Stream chunks of FFT coefficients
-            for chunk_id, real_chunk, imag_chunk, is_last_chunk in chunk_fft_data(real_coeffs, imag_coeffs):
-                yield rfcontrol_pb2.FFTCoefficientsStreamRequest(
-                    real=real_chunk.tolist(),
-                    imag=imag_chunk.tolist(),
-                    chunk_id=chunk_id,
-                    is_last_chunk=is_last_chunk
-                )
+            chunks = chunk_fft_data(real_coeffs, imag_coeffs, sizer=flow.sizer if flow else None)
+            for chunk_id, real_chunk, imag_chunk, is_last_chunk in chunks:
+                if flow is not None:
+                    if not flow.acquire():
+                        return
+                    flow.sent(chunk_id, len(real_chunk))
+                if packed_dtype:
+                    yield rfcontrol_pb2.FFTCoefficientsStreamRequest(
+                        coefficients=pack_coefficients(real_chunk, imag_chunk, packed_dtype, codec),
+                        chunk_id=chunk_id,
+                        is_last_chunk=is_last_chunk,
+                        ack_every=ack_every
+                    )
+                else:
+                    yield rfcontrol_pb2.FFTCoefficientsStreamRequest(
+                        real=real_chunk.tolist(),
+                        imag=imag_chunk.tolist(),
+                        chunk_id=chunk_id,
+                        is_last_chunk=is_last_chunk,
+                        ack_every=ack_every
+                    )
         
         # Send and receive streams
         try:
-            responses = stub.StreamFFTCoefficients(make_requests())
+            # Decide on transport compression from a sample of the whole spectrum
+            payload = np.ascontiguousarray(real_coeffs)
+            responses = stub.StreamFFTCoefficients(
+                make_requests(), compression=compression_policy.transport("StreamFFTCoefficients", payload))
             ##print( responses )
             for response in responses:
+                if flow is not None:
+                    flow.acked(response.chunk_id)
                 print(f"Server response for chunk {response.chunk_id}: {response.status}")
             #return responses
         except grpc.RpcError as e:
             print(f"Error streaming FFT coefficients: {e}")
+        finally:
+            if flow is not None:
+                flow.close()
 
-    
-    def generate_chunks(file_data, chunk_size=1024*1024):  # 1MB chunks
-        chunk_id = 0
-        for i in range(0, len(file_data), chunk_size):
-            chunk_id += 1
-            is_last = i + chunk_size >= len(file_data)
-            yield rfcontrol_pb2.DataChunk(
-                data=file_data[i:i + chunk_size],
-                chunk_id=chunk_id,
-                is_last=is_last
-            )
+    ## Generate a long capture block by block - Sine Wave
+    def generate_signal_blocks(n_blocks=100, block_size=65536, freq=10.0, sampling_rate=1000.0):
+        """Yield a long sine wave capture in blocks, without holding it in memory."""
+        for i in range(n_blocks):
+            t = (np.arange(block_size) + i * block_size) / sampling_rate
+            yield np.sin(2 * np.pi * freq * t)
+
+    def stream_stft_coefficients(stub, fft_size=4096, overlap=0.5, packed_dtype="complex64"):
+        # Short-time FFT of a long capture, streamed frame by frame in constant memory
+        blocks = Client.generate_signal_blocks()
+
+        def make_requests():
+            for frame_index, real, imag, is_last in stft_stream(blocks, fft_size, overlap, sampling_rate=1000.0):
+                yield rfcontrol_pb2.FFTCoefficientsStreamRequest(
+                    coefficients=pack_coefficients(real, imag, packed_dtype),
+                    chunk_id=frame_index,
+                    is_last_chunk=is_last
+                )
+
+        try:
+            responses = stub.StreamFFTCoefficients(make_requests())
+            for response in responses:
+                print(f"Server response for frame {response.chunk_id}: {response.status}")
+        except grpc.RpcError as e:
+            print(f"Error streaming STFT coefficients: {e}")
+
+    def compute_spectrum(stub, block_size=8192, fft_size=1024, overlap=0.5, averaging=8,
+                         window="hann", sampling_rate=1000.0, bin_start=0, bin_stop=0):
+        # Stream raw samples and let the server compute the spectrum
+        signal = Client.generate_large_signal(sampling_rate=sampling_rate)
+        config = rfcontrol_pb2.SpectrumConfig(
+            window=window,
+            fft_size=fft_size,
+            overlap=overlap,
+            averaging=averaging,
+            sampling_rate=sampling_rate,
+            bin_start=bin_start,
+            bin_stop=bin_stop,
+        )
 
-    def transfer_data(stub, data):
-        # Send data chunks and receive processed chunks
+        def make_blocks():
+            for i in range(0, len(signal), block_size):
+                yield rfcontrol_pb2.SampleBlock(
+                    config=config if i == 0 else None,
+                    samples=pack_array(signal[i:i + block_size], "float32"),
+                    is_last=i + block_size >= len(signal)
+                )
+
+        frequencies = None
+        spectra = []
+        try:
+            compression = compression_policy.transport("ComputeSpectrum")
+            for frame in stub.ComputeSpectrum(make_blocks(), compression=compression):
+                if frame.HasField("frequencies"):
+                    frequencies = unpack_array(frame.frequencies)
+                spectra.append(unpack_array(frame.power))
+            peak = frequencies[np.argmax(spectra[-1])]
+            print(f"Received {len(spectra)} spectra of {len(frequencies)} bins, peak at {peak:.2f} Hz")
+        except grpc.RpcError as e:
+            print(f"Error computing spectrum: {e}")
+        return frequencies, spectra
+
+    def generate_chunks(file_data, chunk_size=DEFAULT_CHUNK_SIZE, session_id="", start_offset=0, flow=None):  # 1MB chunks
+        # file_data may be bytes or any buffer (e.g. an MmapSource view);
+        # memoryview slices avoid copying until the chunk goes into its message.
+        # With a session_id, chunks carry their byte offset and start at start_offset.
+        # With a FlowControl, chunk sizes adapt and sending waits for ack credit.
+        file_data = memoryview(file_data)
+        ack_every = flow.ack_every if flow is not None else 0
+        try:
+            if start_offset >= len(file_data):
+                # Nothing left to send, but the server still needs the last chunk
+                yield rfcontrol_pb2.DataChunk(
+                    chunk_id=1,
+                    is_last=True,
+                    session_id=session_id,
+                    offset=len(file_data)
+                )
+                return
+            chunk_id = 0
+            i = start_offset
+            while i < len(file_data):
+                if flow is not None:
+                    if not flow.acquire():
+                        return
+                    chunk_size = flow.chunk_size
+                chunk_id += 1
+                chunk = rfcontrol_pb2.DataChunk(
+                    data=bytes(file_data[i:i + chunk_size]),
+                    chunk_id=chunk_id,
+                    is_last=i + chunk_size >= len(file_data),
+                    session_id=session_id,
+                    offset=i,
+                    ack_every=ack_every
+                )
+                if flow is not None:
+                    flow.sent(chunk_id, len(chunk.data))
+                yield chunk
+                i += chunk_size
+        finally:
+            # Let an MmapSource close its mapping
+            file_data.release()
+
+    def transfer_data(stub, data, sink=None, flow=None):
+        # Send data chunks and receive processed chunks into a sink
+        # (preallocated buffer by default, see transfer.py)
         logging.info("Starting data transfer...")
         start_time = time.time()
         logging.info(f"Start Time: {start_time} ")
+        if sink is None:
+            # The server appends ECHO_SUFFIX to every chunk it echoes
+            chunks = -(-len(data) // DEFAULT_CHUNK_SIZE)
+            sink = BufferSink(size_hint=len(data) + chunks * len(ECHO_SUFFIX))
         # Send chunks to server and receive responses
-        responses = stub.TransferData(Client.generate_chunks(data))
+        responses = stub.TransferData(Client.generate_chunks(data, flow=flow),
+                                      compression=compression_policy.transport("TransferData", data))
     
-        received_data = b""
-        for response in responses:
-            logging.info(f"Received chunk {response.chunk_id}")
-            received_data += response.data
-            if response.is_last:
-                break
+        try:
+            for response in responses:
+                logging.info(f"Received chunk {response.chunk_id}")
+                if flow is not None:
+                    flow.acked(response.chunk_id)
+                sink.add(response.chunk_id, response.data)
+                if response.is_last and not sink.pending:
+                    break
+        finally:
+            if flow is not None:
+                flow.close()
+            sink.close()
     
         end_time = time.time()
-        logging.info(f"Transfer completed in {end_time - start_time:.2f} seconds")
-        return received_data
+        logging.info(f"Transfer completed in {end_time - start_time:.2f} seconds, "
+                     f"received {sink.size} bytes in {sink.chunks} chunks ({sink.throughput / 1e6:.1f} MB/s)")
+        if isinstance(sink, BufferSink):
+            return sink.getbuffer()
+        return sink
+
+    def transfer_file(stub, path, output_path=None, ack_every=4):
+        # Stream a file from a memory map with adaptive chunk sizes;
+        # replies go to a memory-mapped output file if given
+        with MmapSource(path) as view:
+            sink = MmapSink(output_path, size_hint=len(view)) if output_path else None
+            return Client.transfer_data(stub, view, sink, FlowControl(ack_every))
+
+    def resume_transfer(stub, path, session_id=None, retries=5, ack_every=4):
+        # Upload a file in a resumable session: ask the server for the committed
+        # offset and send only the rest, again after every dropped stream
+        session_id = session_id or uuid.uuid4().hex
+        logging.info(f"Transfer session {session_id} for {path}")
+        sizer = AdaptiveChunkSizer()
+        with MmapSource(path) as view:
+            for attempt in range(retries + 1):
+                flow = FlowControl(ack_every, sizer=sizer)
+                try:
+                    status = stub.GetTransferStatus(rfcontrol_pb2.TransferStatusRequest(session_id=session_id))
+                    if status.complete:
+                        break
+                    logging.info(f"Resuming {session_id} at offset {status.committed_offset} of {len(view)}")
+                    chunks = Client.generate_chunks(view, session_id=session_id,
+                                                    start_offset=status.committed_offset, flow=flow)
+                    compression = compression_policy.transport("TransferData", view[status.committed_offset:])
+                    for response in stub.TransferData(chunks, compression=compression):
+                        flow.acked(response.chunk_id)
+                        if response.is_last:
+                            break
+                    break
+                except grpc.RpcError as e:
+                    if attempt == retries:
+                        raise
+                    logging.warning(f"Transfer {session_id} interrupted ({e.code()}), retrying")
+                    time.sleep(min(2 ** attempt, 30))
+                finally:
+                    flow.close()
+        logging.info(f"Final chunk size {sizer.chunk_size} bytes, {(sizer.throughput or 0) / 1e6:.1f} MB/s")
+        return stub.GetTransferStatus(rfcontrol_pb2.TransferStatusRequest(session_id=session_id))
+
+    def batch_set_rf_settings(stub, device_ids, frequency=-9999, gain=-9999):
+        # Retune many devices in one round trip; each result has its own status code
+        request = rfcontrol_pb2.BatchRFRequest(requests=[
+            rfcontrol_pb2.RFRequest(device_id=device_id.strip(), frequency=frequency, gain=gain)
+            for device_id in device_ids
+        ])
+        return stub.batchSetRFSettings(request)
+
+    def batch_get_device_status(stub, device_ids):
+        # Status sweep over many devices in one round trip
+        request = rfcontrol_pb2.BatchDeviceRequest(device_ids=[device_id.strip() for device_id in device_ids])
+        return stub.batchGetDeviceStatus(request)
+
+    def watch_device_status(stub, device_ids=(), min_interval=0.0, coalesce=0.0, max_updates=None):
+        # Follow status changes instead of polling getDeviceStatus; an empty
+        # device_ids list watches every device. Stops after max_updates or Ctrl-C.
+        request = rfcontrol_pb2.WatchStatusRequest(
+            device_ids=[device_id.strip() for device_id in device_ids],
+            min_interval=min_interval,
+            coalesce=coalesce,
+        )
+        updates = []
+        call = stub.WatchDeviceStatus(request)
+        try:
+            for status in call:
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] {status.device_id}: frequency={status.frequency} "
+                      f"gain={status.gain} ref_locked={status.ref_locked} lo_locked={status.lo_locked}")
+                updates.append(status)
+                if max_updates and len(updates) >= max_updates:
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            call.cancel()
+        return updates
+
+    def execute_batch(stub, device_id, commands):
+        # SCPI commands for one instrument, sent in one message instead of a round trip each
+        request = rfcontrol_pb2.ScpiBatchRequest(device_id=device_id, commands=commands)
+        response = stub.ExecuteBatch(request)
+        return "\n".join(f"{command} -> {reply}" for command, reply in zip(commands, response.replies))
+
+    def fan_out_command(stub, nodes=(), command="pwd", mode="all", count=1, timeout=0.0):
+        # Run a custom command on several FlexSDR nodes; results print as each node answers
+        request = rfcontrol_pb2.FanOutRequest(
+            nodes=[node.strip() for node in nodes if node.strip()],
+            command=command, mode=mode, count=count, timeout=timeout,
+        )
+        results = []
+        for result in stub.FanOutCommand(request):
+            outcome = result.message if not result.code else f"{status_names.get(result.code, result.code)} {result.details}"
+            print(f"{result.node} ({result.target}) {result.elapsed_ms:.0f} ms: {outcome}")
+            results.append(result)
+        return results
 
     def update_form(self, method):
         for widget in self.form_frame.winfo_children():
@@ -166,7 +421,7 @@ class Client:
         Label(self.form_frame, text="Device ID:").grid(row=0, column=0)
         Entry(self.form_frame, textvariable=self.device_id).grid(row=0, column=1)
 
-        if method == "setRFSettings":
+        if method in ("setRFSettings", "batchSetRFSettings"):
             Label(self.form_frame, text="Frequency (Hz):").grid(row=1, column=0)
             Entry(self.form_frame, textvariable=self.frequency).grid(row=1, column=1)
             Label(self.form_frame, text="Gain (dB):").grid(row=2, column=0)
@@ -193,6 +448,14 @@ def parse_response(response):
             result_txt = f"Error:\n{response.message}"
     elif isinstance(response, rfcontrol_pb2.PPStringResponse):
         result_txt = f"{response.pp_string}"
+    elif isinstance(response, rfcontrol_pb2.BatchDeviceResponse):
+        lines = []
+        for result in response.results:
+            if result.code:
+                lines.append(f"{result.device_id}: {status_names.get(result.code, result.code)} {result.details}")
+            else:
+                lines.append(f"{result.device_id}: OK\n{getattr(result, result.WhichOneof('result'))}".strip())
+        result_txt = "\n".join(lines)
     else:
         result_txt = str(response)
         print(response)
@@ -209,11 +472,30 @@ def send_grpc(stub, method, device_id, frequency_in, gain_in):
         elif method == "getDeviceStatus":
             request = rfcontrol_pb2.DeviceRequest(device_id=device_id)
             response = stub.getDeviceStatus(request)
+        elif method == "batchSetRFSettings":
+            frequency = float(frequency_in) if frequency_in else -9999
+            gain = float(gain_in) if gain_in else -9999
+            response = Client.batch_set_rf_settings(stub, device_id.split(","), frequency, gain)
+        elif method == "batchGetDeviceStatus":
+            response = Client.batch_get_device_status(stub, device_id.split(","))
+        elif method == "getDeviceQueueStats":
+            request = rfcontrol_pb2.BatchDeviceRequest(device_ids=[d.strip() for d in device_id.split(",") if d.strip()])
+            response = stub.getDeviceQueueStats(request)
+        elif method == "WatchDeviceStatus":
+            response = Client.watch_device_status(stub, device_id.split(","))
+            response = f"{len(response)} status updates"
         ### VISA Commands Starts ###
         elif method == "GetDeviceInformation":
             request = rfcontrol_pb2.DeviceInformationRequest(device_id=device_id,error_queue_populate=True)
             response = stub.GetDeviceInformation(request)
+        elif method == "ExecuteBatch":
+            response = Client.execute_batch(stub, device_id, ["*IDN?", "SYST:ERR?", "FREQ?", "GAIN?"])
         ### VISA Commands Implentation Ends ###
+        elif method == "FanOutCommand":
+            # device_id holds the FlexSDR nodes or groups, comma separated
+            results = Client.fan_out_command(stub, device_id.split(","))
+            response = f"{sum(1 for r in results if not r.code)} of {len(results)} nodes answered"
+
         elif method == "getDevicePPString":
             request = rfcontrol_pb2.DeviceRequest(device_id=device_id)
             response = stub.getPPString(request)
@@ -232,6 +514,10 @@ def send_grpc(stub, method, device_id, frequency_in, gain_in):
             ##response = stub.Chat(request)
         elif method == "StreamFFTCoefficients":
             response = Client.stream_fft_coefficients(stub)
+        elif method == "StreamSTFTCoefficients":
+            response = Client.stream_stft_coefficients(stub)
+        elif method == "ComputeSpectrum":
+            response = Client.compute_spectrum(stub)
         elif method == "TransferData":
             # Simulate large data (10MB)
             large_data = b"ABC XYZ " * (10 * 1024 * 1024)
@@ -281,10 +567,10 @@ def run_cli(host='localhost', port=5555):
                 print("Invalid choice. Please try again.")
                 continue
             method = method_options[int(choice) - 1]
-            device_id = input("Enter device_id (default: mock): ") or "mock"
+            device_id = input("Enter device_id, comma separated for batch methods (default: mock): ") or "mock"
             frequency = None
             gain = None
-            if method == "setRFSettings":
+            if method in ("setRFSettings", "batchSetRFSettings"):
                 frequency = input("Enter frequency (Hz, default: None): ") or "-9999"
                 gain = input("Enter gain (dB, default: None): ") or "-9999"
 
@@ -301,7 +587,11 @@ def main():
     parser.add_argument("--cli", action="store_true", help="Run in CLI mode")
     parser.add_argument("--host", default="localhost", help="Host to connect to (default: localhost)")
     parser.add_argument("-p", "--port", default="5555", help="Port to connect to (default: 5555)")
+    parser.add_argument("--compression", default=None, help="JSON file with per-method compression rules (see compression.py)")
     args = parser.parse_args()
+    if args.compression:
+        global compression_policy
+        compression_policy = CompressionPolicy.load(args.compression)
     use_cli = args.cli or not gui
     host = args.host
     port = args.port
@@ -0,0 +1,241 @@
+"""
+Compression policy for RFController calls.
+
+Two layers are covered:
+* gRPC transport compression (gzip/deflate), chosen per call and per message
+* payload codecs (zlib, and lz4/zstd when installed) applied to PackedArray data
+
+Both are skipped when the payload is small or a compressed sample of it does
+not shrink enough, e.g. raw IQ captures in TransferData.
+"""
+import json
+import zlib
+
+import grpc
+
+try:
+    import lz4.frame
+    lz4_codec = True
+except ImportError:
+    lz4_codec = False
+
+try:
+    import zstandard
+    zstd_codec = True
+except ImportError:
+    zstd_codec = False
+
+TRANSPORT = {
+    None: grpc.Compression.NoCompression,
+    "gzip": grpc.Compression.Gzip,
+    "deflate": grpc.Compression.Deflate,
+}
+
+def _zlib_decompress(data, max_size):
+    decompressor = zlib.decompressobj()
+    # One byte more than allowed tells an oversized payload from one that fits exactly
+    data = decompressor.decompress(data, max_size + 1)
+    if len(data) <= max_size and not decompressor.eof:
+        raise ValueError("Truncated zlib payload")
+    return data
+
+
+def _lz4_decompress(data, max_size):
+    decompressor = lz4.frame.LZ4FrameDecompressor()
+    data = decompressor.decompress(data, max_size + 1)
+    if len(data) <= max_size and not decompressor.eof:
+        raise ValueError("Truncated lz4 payload")
+    return data
+
+
+def _zstd_decompress(data, max_size):
+    # The frame header usually declares the size; without it max_output_size caps the output
+    if zstandard.frame_content_size(data) > max_size:
+        raise ValueError(f"Payload decompresses to more than {max_size} bytes")
+    return zstandard.ZstdDecompressor().decompress(data, max_output_size=max_size + 1)
+
+
+# codec -> (compress(data), decompress(data, max_size))
+CODECS = {
+    "zlib": (lambda data: zlib.compress(data, 1), _zlib_decompress),
+}
+if lz4_codec:
+    CODECS["lz4"] = (lz4.frame.compress, _lz4_decompress)
+if zstd_codec:
+    CODECS["zstd"] = (lambda data: zstandard.ZstdCompressor(level=1).compress(data), _zstd_decompress)
+
+SAMPLE_SIZE = 64 * 1024
+
+
+def sampled_ratio(data, compress=CODECS["zlib"][0], sample_size=SAMPLE_SIZE):
+    """
+    Estimate the compression ratio (compressed / original) of data from a sample.
+
+    Up to four slices spread over the payload are compressed instead of the
+    whole payload, with fast zlib level 1 unless compress is given.
+    """
+    data = memoryview(data)
+    if len(data) <= sample_size:
+        sample = bytes(data)
+    else:
+        step = len(data) // 4
+        part = sample_size // 4
+        sample = b"".join(bytes(data[i:i + part]) for i in range(0, 4 * step, step))
+    if not sample:
+        return 1.0
+    return len(compress(sample)) / len(sample)
+
+
+def compress_payload(data, codec, max_ratio=0.9):
+    """
+    Compress data with codec if a sample shows it is worth it.
+
+    Returns:
+        tuple: (payload, codec used or "" when sent raw)
+    """
+    if not codec:
+        return data, ""
+    if codec not in CODECS:
+        raise ValueError(f"Codec '{codec}' is not available, use one of {', '.join(CODECS)}")
+    compress, _ = CODECS[codec]
+    if sampled_ratio(data, compress) > max_ratio:
+        return data, ""
+    return compress(data), codec
+
+
+def decompress_payload(data, codec, max_size):
+    """
+    Decompress data of a received message.
+
+    The codec is picked by the sender, so the output is limited to
+    max_size, the size the message declares; a payload that decompresses
+    to more raises ValueError before it is held in memory.
+    """
+    if not codec:
+        return data
+    if codec not in CODECS:
+        raise ValueError(f"Codec '{codec}' is not available, use one of {', '.join(CODECS)}")
+    try:
+        data = CODECS[codec][1](data, max_size)
+    except ValueError:
+        raise
+    except Exception as e:
+        # zlib.error, lz4's RuntimeError, ZstdError: all mean a malformed payload
+        raise ValueError(f"Corrupt {codec} payload: {e}") from e
+    if len(data) > max_size:
+        raise ValueError(f"Payload decompresses to more than {max_size} bytes")
+    return data
+
+
+class CompressionRule:
+    """
+    Compression settings for one method.
+
+    Args:
+        algorithm (str): gRPC transport compression, "gzip", "deflate" or None
+        codec (str): Payload codec for PackedArray data, "zlib", "lz4", "zstd" or None
+        min_size (int): Messages with fewer payload bytes are sent uncompressed
+        max_ratio (float): Skip compression when a sample compresses worse than this
+    """
+    def __init__(self, algorithm=None, codec=None, min_size=4096, max_ratio=0.9):
+        if algorithm not in TRANSPORT:
+            raise ValueError(f"Unknown transport compression '{algorithm}'")
+        self.algorithm = algorithm
+        if codec is not None and codec not in CODECS:
+            raise ValueError(f"Codec '{codec}' is not available, use one of {', '.join(CODECS)}")
+        self.codec = codec
+        self.min_size = min_size
+        self.max_ratio = max_ratio
+
+
+DEFAULT_RULES = {
+    # Raw captures are mostly noise and rarely compress: sent as is, as before
+    "TransferData": CompressionRule(algorithm=None, min_size=64 * 1024),
+    "SendFFTCoefficients": CompressionRule(algorithm="gzip"),
+    "StreamFFTCoefficients": CompressionRule(algorithm="gzip"),
+    "ComputeSpectrum": CompressionRule(algorithm="gzip"),
+}
+
+
+class CompressionPolicy:
+    """
+    Per-method compression rules.
+
+    usage:
+    policy = CompressionPolicy.load("compression.json")
+    stub.SendFFTCoefficients(request, compression=policy.transport("SendFFTCoefficients", payload))
+
+    compression.json maps method names to CompressionRule arguments:
+    {"TransferData": {"algorithm": null}, "SendFFTCoefficients": {"algorithm": "gzip", "codec": "zstd"}}
+    """
+    def __init__(self, rules=None):
+        self.rules = dict(DEFAULT_RULES)
+        if rules:
+            self.rules.update(rules)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            config = json.load(f)
+        return cls({method: CompressionRule(**rule) for method, rule in config.items()})
+
+    def rule(self, method):
+        return self.rules.get(method, CompressionRule())
+
+    def worth_compressing(self, method, payload):
+        """True if the payload is large enough and a sample of it compresses."""
+        rule = self.rule(method)
+        if payload is None:
+            return True
+        if len(payload) < rule.min_size:
+            return False
+        return sampled_ratio(payload) <= rule.max_ratio
+
+    def transport(self, method, payload=None):
+        """gRPC compression for a call or message of method carrying payload."""
+        rule = self.rule(method)
+        if rule.algorithm is None or not self.worth_compressing(method, payload):
+            return grpc.Compression.NoCompression
+        return TRANSPORT[rule.algorithm]
+
+    def codec(self, method):
+        """Payload codec for PackedArray data of method, or None."""
+        return self.rule(method).codec
+
+    def stream(self, context, method):
+        """Server side: per-message compression decisions for one response stream of method."""
+        return StreamCompression(context, self.rule(method))
+
+
+class StreamCompression:
+    """
+    Skips compression of response messages that are not worth it.
+
+    Payloads of one stream are alike, so only the first sample_messages
+    payloads of at least min_size are sampled; the last decision is kept
+    for the rest of the stream. Smaller payloads are never compressed.
+
+    usage:
+    compression = policy.stream(context, "ComputeSpectrum")
+    for frame in frames:
+        compression.apply(frame.power.data)
+        yield frame
+    """
+    def __init__(self, context, rule, sample_messages=2):
+        self.context = context
+        self.rule = rule
+        self.remaining_samples = sample_messages
+        self.compress = True
+
+    def apply(self, payload):
+        """Call before yielding each message, with its payload."""
+        if self.rule.algorithm is None:
+            return
+        if len(payload) < self.rule.min_size:
+            self.context.disable_next_message_compression()
+            return
+        if self.remaining_samples:
+            self.remaining_samples -= 1
+            self.compress = sampled_ratio(payload) <= self.rule.max_ratio
+        if not self.compress:
+            self.context.disable_next_message_compression()
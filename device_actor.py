@@ -0,0 +1,107 @@
+import queue
+import threading
+import time
+from concurrent import futures
+
+
+class DeviceActor:
+    """
+    Owns one device and runs every command for it on its own thread.
+
+    Commands queue up and run one at a time in submission order, so two
+    requests never drive the same device concurrently, while commands for
+    different devices run in parallel on their own actors.
+
+    Device methods can be called on the actor directly: actor.set_gain(10)
+    queues the call and waits for its result. To run several device calls as
+    one command, pass a function to call() or submit(); device calls made
+    from the actor thread itself run inline.
+
+    usage:
+    actor = DeviceActor("mock", MockDevice())
+    actor.set_center_frequency(2e6)
+    future = actor.submit(configure, actor, request)
+    """
+    def __init__(self, device_id, device):
+        self.device_id = device_id
+        self.device = device
+        # Set by DeviceRegistry: discovery key, and whether device is a stand-in
+        # serving snapshot data until the real device is open
+        self.key = device_id
+        self.provisional = False
+        self.submitted = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.closed = False
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"device-{device_id}", daemon=True)
+        self._thread.start()
+
+    def __getattr__(self, name):
+        # Only called for attributes the actor does not have: forward to the device
+        attr = getattr(self.device, name)
+        if not callable(attr):
+            return attr
+        return lambda *args, **kwargs: self.call(attr, *args, **kwargs)
+
+    def submit(self, func, *args, **kwargs):
+        """Queue func(*args, **kwargs) and return a concurrent.futures.Future for its result."""
+        future = futures.Future()
+        with self._lock:
+            if self.closed:
+                raise RuntimeError(f"Device '{self.device_id}' has been removed")
+            self.submitted += 1
+            self._queue.put((future, time.perf_counter(), func, args, kwargs))
+        return future
+
+    def call(self, func, *args, timeout=None, **kwargs):
+        """Run func on the actor thread and wait for its result."""
+        if threading.current_thread() is self._thread:
+            return func(*args, **kwargs)
+        return self.submit(func, *args, **kwargs).result(timeout)
+
+    @property
+    def depth(self):
+        """Commands waiting to run."""
+        return self._queue.qsize()
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "device_id": self.device_id,
+                "depth": self.depth,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "mean_wait_ms": self.total_wait / self.completed * 1e3 if self.completed else 0.0,
+                "max_wait_ms": self.max_wait * 1e3,
+            }
+
+    def close(self, wait=True):
+        """Stop the actor after the commands already queued; wait=False returns without waiting for them."""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            self._queue.put(None)
+        if wait and threading.current_thread() is not self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, queued_at, func, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            wait = time.perf_counter() - queued_at
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            with self._lock:
+                self.completed += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
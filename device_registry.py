@@ -0,0 +1,196 @@
+import threading
+from concurrent import futures
+
+from device_actor import DeviceActor
+from rpc_log import log
+
+
+class DeviceRegistry:
+    """
+    device_id -> DeviceActor map, kept in sync with the connected hardware.
+
+    Behaves like a read-only dict. Every change publishes a new dict, so
+    lookups read the current one without locking.
+
+    A scan is a callable returning (key, opener) pairs, one per connected
+    device: key identifies the device across scans (e.g. its device address)
+    and opener opens it and returns (device_id, device). discover() runs one
+    scan in the background and registers each device as soon as it is open;
+    start_rescan() repeats the scan, opening new devices and retiring devices
+    that are gone. If a scan raises, nothing is retired.
+
+    Listeners are called as callback(event, device_id, actor) with event
+    "added" or "removed". prepare(device_id, actor), if given, is called for
+    every opened (not provisional) device before it is published, so commands
+    it submits run before any request reaches the device.
+
+    usage:
+    registry = DeviceRegistry()
+    registry.discover(lambda: [("mock", lambda: ("mock", MockDevice()))])
+    device = registry.wait_for("mock", timeout=5.0)
+    """
+    def __init__(self, open_workers=8, prepare=None):
+        self.open_workers = open_workers
+        self.prepare = prepare
+        self.discovering = False
+        self._devices = {}
+        self._keys = {}
+        self._listeners = []
+        self._cond = threading.Condition()
+        self._scan_lock = threading.Lock()
+        self._rescan_thread = None
+        self._stopped = threading.Event()
+
+    def __getitem__(self, device_id):
+        return self._devices[device_id]
+
+    def __contains__(self, device_id):
+        return device_id in self._devices
+
+    def __iter__(self):
+        return iter(self._devices)
+
+    def __len__(self):
+        return len(self._devices)
+
+    def get(self, device_id, default=None):
+        return self._devices.get(device_id, default)
+
+    def items(self):
+        return self._devices.items()
+
+    def add_listener(self, callback):
+        """Call callback(event, device_id, actor) for every device added or removed from now on."""
+        self._listeners.append(callback)
+
+    def _notify(self, event, device_id, actor):
+        for callback in self._listeners:
+            try:
+                callback(event, device_id, actor)
+            except Exception as e:
+                log.warning("Device listener failed for %s %s: %s", event, device_id, e, extra={"device_id": device_id})
+
+    def register(self, device_id, device, key=None, provisional=False):
+        """
+        Wrap device in an actor and publish it.
+
+        A provisional device stands in until a scan opens the device found
+        under key, which then replaces it.
+        """
+        actor = DeviceActor(device_id, device)
+        actor.key = key if key is not None else device_id
+        actor.provisional = provisional
+        if self.prepare is not None and not provisional:
+            self.prepare(device_id, actor)
+        with self._cond:
+            devices = dict(self._devices)
+            replaced = devices.get(device_id)
+            devices[device_id] = actor
+            self._devices = devices
+            # A device found under a new key (e.g. a new address) replaces its old entry
+            for old_key in [k for k, v in self._keys.items() if v == device_id]:
+                del self._keys[old_key]
+            self._keys[actor.key] = device_id
+            self._cond.notify_all()
+        if replaced is not None:
+            # Not joined: a device hung in a call must not stall the scan
+            replaced.close(wait=False)
+            self._notify("removed", device_id, replaced)
+        self._notify("added", device_id, actor)
+        return actor
+
+    def retire(self, key):
+        """Unpublish the device found under key; its actor stops after its queued commands."""
+        with self._cond:
+            device_id = self._keys.pop(key, None)
+            if device_id is None or device_id not in self._devices:
+                return None
+            devices = dict(self._devices)
+            actor = devices.pop(device_id)
+            self._devices = devices
+        log.info("Device removed: %s", device_id, extra={"device_id": device_id})
+        actor.close(wait=False)
+        self._notify("removed", device_id, actor)
+        return actor
+
+    def ready(self, device_id):
+        """True if device_id is registered and not a provisional stand-in."""
+        actor = self._devices.get(device_id)
+        return actor is not None and not actor.provisional
+
+    def wait_for(self, device_id, timeout=None, ready=False):
+        """
+        Wait until device_id is registered (and opened, with ready=True) or
+        discovery has finished.
+
+        Returns:
+            DeviceActor or None if the device is not (yet) available
+        """
+        def available():
+            return self.ready(device_id) if ready else device_id in self._devices
+
+        with self._cond:
+            self._cond.wait_for(lambda: available() or not self.discovering, timeout)
+            return self._devices.get(device_id) if available() else None
+
+    def discover(self, scan):
+        """Run one scan on a background thread, opening devices concurrently."""
+        with self._cond:
+            self.discovering = True
+        threading.Thread(target=self._discover, args=(scan,), name="discovery", daemon=True).start()
+
+    def _discover(self, scan):
+        try:
+            self.rescan(scan)
+        finally:
+            with self._cond:
+                self.discovering = False
+                self._cond.notify_all()
+
+    def rescan(self, scan):
+        """
+        Open devices that appeared since the last scan and retire those that are gone.
+
+        Returns:
+            tuple: (device_ids added, device_ids removed)
+        """
+        added, removed = [], []
+        with self._scan_lock:
+            seen = set()
+            complete = False
+            with futures.ThreadPoolExecutor(self.open_workers, thread_name_prefix="open") as pool:
+                jobs = {}
+                try:
+                    for key, opener in scan():
+                        seen.add(key)
+                        if key not in self._keys or not self.ready(self._keys[key]):
+                            jobs[pool.submit(opener)] = key
+                    complete = True
+                except Exception as e:
+                    log.warning("Device scan failed: %s", e)
+                for job in futures.as_completed(jobs):
+                    try:
+                        device_id, device = job.result()
+                    except Exception as e:
+                        log.warning("Could not open device %s: %s", jobs[job], e)
+                        continue
+                    self.register(device_id, device, jobs[job])
+                    added.append(device_id)
+            if complete:
+                for key in [key for key in self._keys if key not in seen]:
+                    actor = self.retire(key)
+                    if actor is not None:
+                        removed.append(actor.device_id)
+        return added, removed
+
+    def start_rescan(self, scan, interval=10.0):
+        """Rescan every interval seconds on a background thread until stop()."""
+        def loop():
+            while not self._stopped.wait(interval):
+                self.rescan(scan)
+
+        self._rescan_thread = threading.Thread(target=loop, name="rescan", daemon=True)
+        self._rescan_thread.start()
+
+    def stop(self):
+        self._stopped.set()
@@ -0,0 +1,125 @@
+import atexit
+import json
+import os
+import threading
+
+from rpc_log import log
+
+
+class DeviceSnapshot:
+    """
+    Discovered devices and their last known state, persisted to a JSON file.
+
+    For each device_id the file keeps the discovery key, capabilities and the
+    last status (frequency, gain, lock state). Changes are written to the file
+    at most every save_delay seconds, through a temporary file and a rename,
+    so a crash never leaves a half-written snapshot.
+
+    usage:
+    snapshot = DeviceSnapshot("devices.json")
+    snapshot.record_status("mock", device.get_status(), device.get_pp_string())
+    """
+    def __init__(self, path, save_delay=0.5):
+        self.path = path
+        self.save_delay = save_delay
+        self.devices = {}
+        self._lock = threading.Lock()
+        self._timer = None
+        self.load()
+        # Write pending changes when the server exits
+        atexit.register(self.flush)
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                self.devices = json.load(f).get("devices", {})
+        except FileNotFoundError:
+            self.devices = {}
+        except (OSError, ValueError) as e:
+            log.warning("Ignoring unreadable device snapshot %s: %s", self.path, e)
+            self.devices = {}
+        return self.devices
+
+    def record_device(self, device_id, key, capabilities, status):
+        with self._lock:
+            self.devices[device_id] = {
+                "key": key,
+                "gain_range": list(capabilities["gain_range"]),
+                "freq_range": list(capabilities["freq_range"]),
+                "pp_string": capabilities["pp_string"],
+                "status": dict(status),
+            }
+        self._schedule_save()
+
+    def record_status(self, device_id, status, pp_string):
+        """Record new settings; pp_string reports them too, so it is stored along."""
+        with self._lock:
+            if device_id not in self.devices:
+                return
+            self.devices[device_id]["status"] = dict(status)
+            self.devices[device_id]["pp_string"] = pp_string
+        self._schedule_save()
+
+    def forget(self, device_id):
+        with self._lock:
+            if self.devices.pop(device_id, None) is None:
+                return
+        self._schedule_save()
+
+    def _schedule_save(self):
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.save_delay, self.save)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write pending changes now."""
+        with self._lock:
+            timer = self._timer
+        if timer is not None:
+            timer.cancel()
+            self.save()
+
+    def save(self):
+        with self._lock:
+            self._timer = None
+            data = json.dumps({"devices": self.devices}, indent=2)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.warning("Could not write device snapshot %s: %s", self.path, e)
+
+
+class SnapshotDevice:
+    """
+    Stand-in for a device that is still opening after a restart.
+
+    Answers status, range and identity queries from the snapshot. It cannot
+    change settings; writes wait for the real device (see DeviceRegistry.wait_for).
+    """
+    def __init__(self, device_id, entry):
+        self.device_id = device_id
+        self.entry = entry
+
+    def get_status(self):
+        return dict(self.entry["status"])
+
+    def get_rx_gain_range(self):
+        return tuple(self.entry["gain_range"])
+
+    def get_rx_freq_range(self):
+        return tuple(self.entry["freq_range"])
+
+    def get_pp_string(self):
+        return self.entry["pp_string"]
+
+    def set_center_frequency(self, frequency):
+        return False, "Device is still opening"
+
+    def set_gain(self, gain):
+        return False, "Device is still opening"
@@ -0,0 +1,153 @@
+import asyncio
+import queue
+import threading
+
+import grpc
+
+MODES = ("all", "first", "quorum")
+
+
+class NodeResult:
+    """Answer (or error) of one upstream node in a fan-out."""
+    def __init__(self, name, target, response=None, error=None, elapsed=0.0):
+        self.name = name
+        self.target = target
+        self.response = response
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def code(self):
+        if self.error is None:
+            return grpc.StatusCode.OK
+        if isinstance(self.error, grpc.RpcError):
+            return self.error.code()
+        if isinstance(self.error, ValueError):
+            return grpc.StatusCode.INVALID_ARGUMENT
+        if isinstance(self.error, TimeoutError):
+            return grpc.StatusCode.DEADLINE_EXCEEDED
+        return grpc.StatusCode.UNAVAILABLE
+
+    @property
+    def details(self):
+        if isinstance(self.error, grpc.RpcError):
+            return self.error.details()
+        return str(self.error) if self.error is not None else ""
+
+
+class FanOut:
+    """
+    Results of one request sent to several upstream nodes, in the order they answer.
+
+    Calls are in flight concurrently as gRPC futures; no thread waits per node.
+    The fan-out is done when enough nodes answered successfully:
+    * "all": every node answered or failed
+    * "first": count nodes answered successfully
+    * "quorum": a majority of the nodes answered successfully
+    or when that can no longer happen. Calls still in flight are then cancelled.
+
+    Iterate it from a thread, or with async for from a coroutine; the latter
+    waits on the event loop.
+
+    usage:
+    fan = upstreams.fan_out(["flexsdr"], "runCustomCmd", {"customCmdName": "pwd"}, mode="quorum")
+    for result in fan:
+        print(result.name, result.response if result.ok else result.details)
+    """
+    def __init__(self, nodes, mode="all", count=1):
+        if mode not in MODES:
+            raise ValueError(f"Unknown fan-out mode '{mode}', use one of {', '.join(MODES)}")
+        if not nodes:
+            raise ValueError("No upstream nodes to send to")
+        self.nodes = list(nodes)
+        self.mode = mode
+        if mode == "first":
+            self.needed = max(1, min(count, len(self.nodes)))
+        elif mode == "quorum":
+            self.needed = len(self.nodes) // 2 + 1
+        else:
+            self.needed = len(self.nodes)
+        self.received = 0
+        self.successes = 0
+        self.done = False
+        self._calls = []
+        self._queue = queue.Queue()
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_call(self, call):
+        """Track a call in flight, so it can be cancelled once the fan-out is done."""
+        with self._lock:
+            if not self.done:
+                self._calls.append(call)
+                return
+        call.cancel()
+
+    def deliver(self, result):
+        with self._lock:
+            if self.done:
+                return
+            self.received += 1
+            self.successes += result.ok
+            failures = self.received - self.successes
+            finished = (self.successes >= self.needed
+                        or self.received == len(self.nodes)
+                        # Too many failures to still reach needed
+                        or (self.mode != "all" and failures > len(self.nodes) - self.needed))
+            self._queue.put(result)
+            if finished:
+                self.done = True
+                self._queue.put(None)
+                calls, self._calls = self._calls, []
+            listeners = list(self._listeners)
+        if finished:
+            for call in calls:
+                call.cancel()
+        for callback in listeners:
+            callback()
+
+    def cancel(self):
+        """Stop waiting for the remaining nodes."""
+        with self._lock:
+            if self.done:
+                return
+            self.done = True
+            self._queue.put(None)
+            calls, self._calls = self._calls, []
+            listeners = list(self._listeners)
+        for call in calls:
+            call.cancel()
+        for callback in listeners:
+            callback()
+
+    def __iter__(self):
+        while True:
+            result = self._queue.get()
+            if result is None:
+                return
+            yield result
+
+    async def __aiter__(self):
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        callback = lambda: loop.call_soon_threadsafe(wakeup.set)
+        with self._lock:
+            self._listeners.append(callback)
+        try:
+            while True:
+                wakeup.clear()
+                try:
+                    result = self._queue.get_nowait()
+                except queue.Empty:
+                    await wakeup.wait()
+                    continue
+                if result is None:
+                    return
+                yield result
+        finally:
+            with self._lock:
+                self._listeners.remove(callback)
@@ -0,0 +1,173 @@
+"""
+FFT backends for fft_calculator.
+
+numpy is always available; scipy.fft and pyFFTW are registered when they can
+be imported. The active backend is read from fft_backend.json if a previous
+benchmark stored a choice there, otherwise numpy is used.
+
+To benchmark the installed backends for your frame sizes and store the fastest:
+
+    python fft_backends.py --sizes 1024 4096 65536
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+try:
+    import scipy.fft
+    scipy_fft = True
+except ImportError:
+    scipy_fft = False
+
+try:
+    import pyfftw
+    import pyfftw.interfaces.numpy_fft
+    pyfftw_available = True
+except ImportError:
+    pyfftw_available = False
+
+CHOICE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fft_backend.json")
+
+
+class NumpyBackend:
+    name = "numpy"
+
+    def __init__(self, workers=None):
+        self.workers = workers
+
+    def fft(self, x, axis=-1):
+        return np.fft.fft(x, axis=axis)
+
+    def rfft(self, x, axis=-1):
+        return np.fft.rfft(x, axis=axis)
+
+
+class ScipyBackend:
+    name = "scipy"
+
+    def __init__(self, workers=None):
+        self.workers = workers
+
+    def fft(self, x, axis=-1):
+        return scipy.fft.fft(x, axis=axis, workers=self.workers)
+
+    def rfft(self, x, axis=-1):
+        return scipy.fft.rfft(x, axis=axis, workers=self.workers)
+
+
+class PyFFTWBackend:
+    name = "pyfftw"
+
+    def __init__(self, workers=None):
+        self.workers = workers or 1
+        # Keep FFTW plans between calls for repeated frame sizes
+        pyfftw.interfaces.cache.enable()
+
+    def fft(self, x, axis=-1):
+        return pyfftw.interfaces.numpy_fft.fft(x, axis=axis, threads=self.workers)
+
+    def rfft(self, x, axis=-1):
+        return pyfftw.interfaces.numpy_fft.rfft(x, axis=axis, threads=self.workers)
+
+
+BACKENDS = {"numpy": NumpyBackend}
+if scipy_fft:
+    BACKENDS["scipy"] = ScipyBackend
+if pyfftw_available:
+    BACKENDS["pyfftw"] = PyFFTWBackend
+
+_backend = NumpyBackend()
+
+
+def get_backend():
+    """Return the active FFT backend."""
+    return _backend
+
+
+def set_backend(name, workers=None):
+    """
+    Switch the active FFT backend.
+
+    Args:
+        name (str): Registered backend name (see BACKENDS)
+        workers (int): Threads the backend may use per transform, None for its default
+
+    Returns:
+        The new active backend
+    """
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"FFT backend '{name}' is not available, use one of {', '.join(BACKENDS)}")
+    _backend = BACKENDS[name](workers)
+    return _backend
+
+
+def benchmark_backends(sizes, repeats=50, workers=None):
+    """
+    Time a real-input FFT of every frame size on every available backend.
+
+    Returns:
+        dict: backend name -> total seconds per round over all sizes
+    """
+    rng = np.random.default_rng(0)
+    signals = [rng.standard_normal(n) for n in sizes]
+    timings = {}
+    for name, backend_cls in BACKENDS.items():
+        backend = backend_cls(workers)
+        for signal in signals:
+            backend.rfft(signal)  # warm up plans and caches
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for signal in signals:
+                backend.rfft(signal)
+        timings[name] = (time.perf_counter() - start) / repeats
+    return timings
+
+
+def select_backend(sizes, repeats=50, workers=None, path=CHOICE_FILE):
+    """
+    Benchmark the backends, activate the fastest and store the choice in path.
+
+    Returns:
+        tuple: (chosen backend name, timings)
+    """
+    timings = benchmark_backends(sizes, repeats, workers)
+    name = min(timings, key=timings.get)
+    set_backend(name, workers)
+    if path:
+        with open(path, "w") as f:
+            json.dump({"backend": name, "workers": workers, "sizes": list(sizes), "timings": timings}, f, indent=2)
+    return name, timings
+
+
+def load_backend_choice(path=CHOICE_FILE):
+    """
+    Activate the backend stored by select_backend, if the file exists and the
+    backend is still installed. Falls back to numpy otherwise.
+    """
+    try:
+        with open(path) as f:
+            choice = json.load(f)
+    except (OSError, ValueError):
+        return get_backend()
+    if choice.get("backend") not in BACKENDS:
+        return get_backend()
+    return set_backend(choice["backend"], choice.get("workers"))
+
+
+load_backend_choice()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark FFT backends and store the fastest')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1024, 4096, 65536], help='Frame sizes to benchmark')
+    parser.add_argument('--repeats', type=int, default=50, help='Rounds over all sizes per backend')
+    parser.add_argument('--workers', type=int, default=None, help='Threads per transform (scipy/pyfftw)')
+    args = parser.parse_args()
+
+    name, timings = select_backend(args.sizes, args.repeats, args.workers)
+    for backend, seconds in sorted(timings.items(), key=lambda item: item[1]):
+        print(f"{backend:<8} {seconds * 1e6:10.1f} us per round")
+    print(f"Selected '{name}', stored in {CHOICE_FILE}")
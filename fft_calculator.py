@@ -1,30 +1,143 @@
+from concurrent import futures
+from functools import lru_cache
+import os
+import threading
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
-def calculate_fft(signal, sampling_rate=1.0):
+from fft_backends import get_backend
+
+WINDOWS = {
+    "hann": np.hanning,
+    "hamming": np.hamming,
+    "blackman": np.blackman,
+    "rect": np.ones,
+}
+
+
+@lru_cache(maxsize=64)
+def frequency_axis(n, sampling_rate=1.0):
+    """
+    Non-negative FFT frequencies for n samples, up to (not including) Nyquist.
+
+    Cached per (n, sampling_rate); the returned array is shared and read-only.
+    """
+    frequencies = np.fft.rfftfreq(n, d=1/sampling_rate)[:n // 2]
+    frequencies.flags.writeable = False
+    return frequencies
+
+
+@lru_cache(maxsize=64)
+def get_window(name, n):
+    """
+    Window array of length n. Cached per (name, n); the returned array is shared and read-only.
+    """
+    if name not in WINDOWS:
+        raise ValueError(f"Unknown window '{name}', use one of {', '.join(WINDOWS)}")
+    window = WINDOWS[name](n)
+    window.flags.writeable = False
+    return window
+
+
+def calculate_fft(signal, sampling_rate=1.0, window=None):
     """
     Calculate FFT coefficients from a signal.
     
+    Real signals use a real-input FFT that only computes the non-negative half.
+    The transform runs on the active backend from fft_backends.
+
     Args:
         signal (list or np.ndarray): Input signal
         sampling_rate (float): Sampling rate in Hz
+        window (str): Optional window name applied before the FFT (see WINDOWS)
     
     Returns:
-        tuple: (frequencies, real coefficients, imaginary coefficients)
+        tuple: (frequencies, real coefficients, imaginary coefficients), the
+        coefficients as views into one complex result
     """
-    signal = np.array(signal)
+    signal = np.asarray(signal)
     n = len(signal)
+    if window is not None:
+        signal = signal * get_window(window, n)
     
     # Compute FFT
-    fft_result = np.fft.fft(signal)
-    frequencies = np.fft.fftfreq(n, d=1/sampling_rate)
-    
-    # Get real and imaginary parts
-    real_coeffs = fft_result.real
-    imag_coeffs = fft_result.imag
+    if np.iscomplexobj(signal):
+        fft_result = get_backend().fft(signal)
+    else:
+        fft_result = get_backend().rfft(signal)
+    frequencies = frequency_axis(n, sampling_rate)
     
     # Return positive frequencies only (up to Nyquist)
     nyquist_idx = n // 2
-    return frequencies[:nyquist_idx], real_coeffs[:nyquist_idx], imag_coeffs[:nyquist_idx]
+    fft_result = fft_result[:nyquist_idx]
+    return frequencies, fft_result.real, fft_result.imag
+
+
+# One pool for every batch call; each call splits its channels into at most
+# `workers` blocks, which bounds its share of the pool
+BATCH_THREADS = os.cpu_count() or 4
+_batch_pool = None
+_batch_pool_lock = threading.Lock()
+
+
+def _batch_executor():
+    global _batch_pool
+    with _batch_pool_lock:
+        if _batch_pool is None:
+            _batch_pool = futures.ThreadPoolExecutor(max_workers=BATCH_THREADS, thread_name_prefix="fft")
+        return _batch_pool
+
+
+def calculate_fft_batch(signals, sampling_rate=1.0, window=None, workers=1, out=None):
+    """
+    Calculate FFT coefficients for several channels at once.
+
+    The transform runs along the last axis. With workers > 1 the channels are
+    split into up to workers blocks that run on a shared pool of BATCH_THREADS
+    threads; NumPy FFTs release the GIL, so the blocks use separate cores.
+
+    Args:
+        signals (np.ndarray): 2-D array shaped (channels, samples)
+        sampling_rate (float): Sampling rate in Hz
+        window (str): Optional window name applied before the FFT (see WINDOWS)
+        workers (int): Number of blocks to split the channels into, at most BATCH_THREADS
+        out (tuple): Optional preallocated (real, imag) arrays shaped (channels, samples // 2)
+
+    Returns:
+        tuple: (frequencies, real coefficients, imaginary coefficients), coefficients
+        as C-contiguous (channels, samples // 2) arrays
+    """
+    signals = np.asarray(signals)
+    if signals.ndim != 2:
+        raise ValueError(f"signals must be 2-D (channels, samples), got shape {signals.shape}")
+    channels, n = signals.shape
+    nyquist_idx = n // 2
+    if out is None:
+        real_out = np.empty((channels, nyquist_idx))
+        imag_out = np.empty((channels, nyquist_idx))
+    else:
+        real_out, imag_out = out
+    window_array = get_window(window, n) if window is not None else None
+    backend = get_backend()
+    transform = backend.fft if np.iscomplexobj(signals) else backend.rfft
+
+    def run(rows):
+        block = signals[rows]
+        if window_array is not None:
+            block = block * window_array
+        fft_result = transform(block, axis=-1)[:, :nyquist_idx]
+        real_out[rows] = fft_result.real
+        imag_out[rows] = fft_result.imag
+
+    if workers <= 1 or channels < 2:
+        run(slice(0, channels))
+    else:
+        step = -(-channels // min(workers, BATCH_THREADS))
+        blocks = [slice(i, i + step) for i in range(0, channels, step)]
+        # list() re-raises the first worker exception here
+        list(_batch_executor().map(run, blocks))
+
+    return frequency_axis(n, sampling_rate), real_out, imag_out
 
 
 # def calculate_fft(signal, sampling_rate=1.0):
@@ -54,7 +167,7 @@ def calculate_fft(signal, sampling_rate=1.0):
 #     return frequencies[:nyquist_idx], real_coeffs[:nyquist_idx], imag_coeffs[:nyquist_idx]
 
 
-def chunk_fft_data(real_coeffs, imag_coeffs, chunk_size=1000):
+def chunk_fft_data(real_coeffs, imag_coeffs, chunk_size=1000, sizer=None):
     """
     Split FFT coefficients into chunks for streaming.
     
@@ -62,14 +175,217 @@ def chunk_fft_data(real_coeffs, imag_coeffs, chunk_size=1000):
         real_coeffs (np.ndarray): Real FFT coefficients
         imag_coeffs (np.ndarray): Imaginary FFT coefficients
         chunk_size (int): Number of coefficients per chunk
+        sizer (AdaptiveChunkSizer): Optional sizer; its current chunk_size is read
+            for every chunk instead of the fixed chunk_size
     
     Yields:
         tuple: (chunk_id, real_chunk, imag_chunk, is_last_chunk)
     """
     n = len(real_coeffs)
-    for i in range(0, n, chunk_size):
-        is_last_chunk = (i + chunk_size) >= n
-        yield (i // chunk_size,
-               real_coeffs[i:i + chunk_size],
-               imag_coeffs[i:i + chunk_size],
-               is_last_chunk)
\ No newline at end of file
+    if sizer is None:
+        for i in range(0, n, chunk_size):
+            is_last_chunk = (i + chunk_size) >= n
+            yield (i // chunk_size,
+                   real_coeffs[i:i + chunk_size],
+                   imag_coeffs[i:i + chunk_size],
+                   is_last_chunk)
+        return
+
+    chunk_id = 0
+    i = 0
+    while i < n:
+        size = sizer.chunk_size
+        yield (chunk_id,
+               real_coeffs[i:i + size],
+               imag_coeffs[i:i + size],
+               (i + size) >= n)
+        chunk_id += 1
+        i += size
+
+
+class StreamingSTFT:
+    """
+    Short-time FFT over a stream of sample blocks.
+
+    Samples that do not fill a whole frame are kept until the next block, so
+    frames span block boundaries and memory stays bounded by the block size.
+    All complete frames of a block are transformed in one call over a strided
+    view of the samples.
+
+    Real input gives one-sided spectra (fft_size // 2 + 1 bins), complex (IQ)
+    input gives fftshift-ed two-sided spectra (fft_size bins).
+    """
+    def __init__(self, fft_size=1024, overlap=0.5, window="hann", sampling_rate=1.0):
+        if fft_size < 2:
+            raise ValueError(f"fft_size must be at least 2, got {fft_size}")
+        if not 0 <= overlap < 1:
+            raise ValueError(f"overlap must be in [0, 1), got {overlap}")
+        if sampling_rate <= 0:
+            raise ValueError(f"sampling_rate must be greater than zero, got {sampling_rate}")
+
+        self.fft_size = fft_size
+        self.hop = max(1, int(round(fft_size * (1 - overlap))))
+        self.window = get_window(window, fft_size)
+        self.sampling_rate = sampling_rate
+        self.is_complex = None
+        self.frequencies = None
+        self.frames_processed = 0
+        self._pending = None
+
+    def _start(self, samples):
+        self.is_complex = np.iscomplexobj(samples)
+        if self.is_complex:
+            self.frequencies = np.fft.fftshift(np.fft.fftfreq(self.fft_size, d=1/self.sampling_rate))
+        else:
+            self.frequencies = np.fft.rfftfreq(self.fft_size, d=1/self.sampling_rate)
+        self._pending = samples[:0]
+
+    def process(self, samples):
+        """
+        Transform every frame completed by a block of samples.
+
+        Args:
+            samples (np.ndarray): Next block of real or complex samples
+
+        Returns:
+            np.ndarray: Complex spectra shaped (frames, bins), possibly with zero frames
+        """
+        samples = np.asarray(samples)
+        if self.is_complex is None:
+            self._start(samples)
+        buffer = np.concatenate((self._pending, samples)) if len(self._pending) else samples
+        if len(buffer) < self.fft_size:
+            self._pending = buffer.copy()
+            return np.empty((0, len(self.frequencies)), dtype=np.complex128)
+
+        frames = sliding_window_view(buffer, self.fft_size)[::self.hop]
+        self._pending = buffer[len(frames) * self.hop:].copy()
+        self.frames_processed += len(frames)
+
+        frames = frames * self.window
+        if self.is_complex:
+            return np.fft.fftshift(get_backend().fft(frames, axis=-1), axes=-1)
+        return get_backend().rfft(frames, axis=-1)
+
+
+class WelchAverager:
+    """
+    Average power spectra frame by frame.
+
+    With averaging=N an average is emitted for every N frames; with
+    averaging=None a running average over all frames so far is emitted after
+    every add().
+    """
+    def __init__(self, averaging=None):
+        if averaging is not None and averaging < 1:
+            raise ValueError(f"averaging must be at least 1, got {averaging}")
+        self.averaging = averaging
+        self.index = 0
+        self._sum = None
+        self._count = 0
+
+    def _accumulate(self, power):
+        part = power.sum(axis=0)
+        self._sum = part if self._sum is None else self._sum + part
+        self._count += len(power)
+
+    def _emit(self):
+        output = (self.index, self._sum / self._count, self._count)
+        self.index += 1
+        self._sum = None
+        self._count = 0
+        return output
+
+    def add(self, power):
+        """
+        Add power spectra shaped (frames, bins).
+
+        Returns:
+            list: (index, average, frames averaged) for every completed average
+        """
+        if len(power) == 0:
+            return []
+        if self.averaging is None:
+            self._accumulate(power)
+            output = (self.index, self._sum / self._count, self._count)
+            self.index += 1
+            return [output]
+
+        outputs = []
+        i = 0
+        while i < len(power):
+            take = min(self.averaging - self._count, len(power) - i)
+            self._accumulate(power[i:i + take])
+            i += take
+            if self._count == self.averaging:
+                outputs.append(self._emit())
+        return outputs
+
+    def flush(self):
+        """Emit a partial average for frames left over at the end of the stream."""
+        if self.averaging is not None and self._count:
+            return [self._emit()]
+        return []
+
+
+def stft_stream(blocks, fft_size=1024, overlap=0.5, window="hann", sampling_rate=1.0):
+    """
+    Short-time FFT of a stream of sample blocks, one frame at a time.
+
+    The output has the same shape as chunk_fft_data, so it can be fed straight
+    into StreamFFTCoefficients requests.
+
+    Args:
+        blocks (iterable): Sample blocks (np.ndarray) of any size
+        fft_size (int): Samples per frame
+        overlap (float): Fraction of fft_size shared by consecutive frames
+        window (str): Window name (see WINDOWS)
+        sampling_rate (float): Sampling rate in Hz
+
+    Yields:
+        tuple: (frame_index, real coefficients, imaginary coefficients, is_last_frame)
+    """
+    stft = StreamingSTFT(fft_size, overlap, window, sampling_rate)
+    frame_index = 0
+    previous = None
+    for block in blocks:
+        for spectrum in stft.process(block):
+            # Hold one frame back so the final frame can be flagged
+            if previous is not None:
+                yield frame_index, previous.real, previous.imag, False
+                frame_index += 1
+            previous = spectrum
+    if previous is not None:
+        yield frame_index, previous.real, previous.imag, True
+
+
+def welch_stream(blocks, fft_size=1024, overlap=0.5, window="hann", sampling_rate=1.0, averaging=None):
+    """
+    Welch power spectral density of a stream of sample blocks.
+
+    Args:
+        blocks (iterable): Sample blocks (np.ndarray) of any size
+        fft_size (int): Samples per segment
+        overlap (float): Fraction of fft_size shared by consecutive segments
+        window (str): Window name (see WINDOWS)
+        sampling_rate (float): Sampling rate in Hz
+        averaging (int): Segments per estimate, or None for a running estimate after every block
+
+    Yields:
+        tuple: (frequencies, power spectral density, segments averaged)
+    """
+    stft = StreamingSTFT(fft_size, overlap, window, sampling_rate)
+    averager = WelchAverager(averaging)
+    scale = None
+    for block in blocks:
+        spectra = stft.process(block)
+        if scale is None and stft.frequencies is not None:
+            # Density scaling; one-sided spectra fold negative frequencies into the positive bins
+            scale = np.full(len(stft.frequencies), 1 / (sampling_rate * np.sum(stft.window ** 2)))
+            if not stft.is_complex:
+                scale[1:None if fft_size % 2 else -1] *= 2
+        power = (spectra.real ** 2 + spectra.imag ** 2) * scale
+        for _, psd, count in averager.add(power):
+            yield stft.frequencies, psd, count
+    for _, psd, count in averager.flush():
+        yield stft.frequencies, psd, count
@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from device_actor import DeviceActor
+from rpc_log import log, log_call
+from visa_wrapper import VisaWrapper
+
+
+class InstrumentRegistry:
+    """
+    Long-lived VISA instrument sessions keyed by device_id, with a cached identity.
+
+    A session is opened on first use and kept; its queries run one at a time
+    on the instrument's actor. Manufacturer, model, serial number and firmware
+    do not change while the session is open, so they are read once per
+    connection. Pass refresh=True to identity() to read them again, or
+    reconnect() to reopen the session. A session whose query fails is
+    closed, and the next call reconnects and reads the identity again.
+
+    At most max_sessions sessions are kept: opening another closes the least
+    recently used one, and sessions unused for idle_timeout seconds are
+    closed when a new one is opened. A client sending made-up device_ids can
+    therefore not pile up actor threads and VISA sessions.
+
+    usage:
+    instruments = InstrumentRegistry()
+    identity = instruments.identity("mock")
+    errors = instruments.error_queue("mock")
+    """
+    def __init__(self, factory=VisaWrapper, max_sessions=16, idle_timeout=600.0):
+        # factory(device_id) returns an unopened session
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.hits = 0
+        self.misses = 0
+        # device_id -> actor, least recently used first
+        self._sessions = OrderedDict()
+        self._last_used = {}
+        self._identities = {}
+        self._lock = threading.Lock()
+
+    def session(self, device_id):
+        """Actor of the session for device_id; the session connects on its first query."""
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            actor = self._sessions.get(device_id)
+            if actor is not None:
+                self._sessions.move_to_end(device_id)
+                self._last_used[device_id] = now
+                return actor
+            for idle_id, last_used in list(self._last_used.items()):
+                if self.idle_timeout is not None and now - last_used > self.idle_timeout:
+                    evicted.append(self._remove(idle_id))
+            while len(self._sessions) >= self.max_sessions:
+                evicted.append(self._remove(next(iter(self._sessions))))
+            actor = DeviceActor(device_id, self.factory(device_id))
+            self._sessions[device_id] = actor
+            self._last_used[device_id] = now
+        for old in evicted:
+            log.info("Closing idle instrument session %s", old.device_id, extra={"device_id": old.device_id})
+            self._close_actor(old)
+        return actor
+
+    def identity(self, device_id, refresh=False):
+        """Manufacturer, model, serial_number and firmware_revision of device_id."""
+        if not refresh:
+            with self._lock:
+                identity = self._identities.get(device_id)
+                if identity is not None:
+                    self.hits += 1
+                    return identity
+        with self._lock:
+            self.misses += 1
+        identity = self._query(device_id, "GetIdentity")
+        with self._lock:
+            self._identities[device_id] = identity
+        return identity
+
+    def error_queue(self, device_id):
+        """Read the error queue of device_id; one query, identity is not touched."""
+        return self._query(device_id, "GetErrorQueue")
+
+    def execute(self, device_id, commands):
+        """Run SCPI commands on device_id in as few round trips as possible (see VisaWrapper.ExecuteBatch)."""
+        return self._query(device_id, "ExecuteBatch", commands)
+
+    def _query(self, device_id, name, *args):
+        actor = self.session(device_id)
+        try:
+            try:
+                return actor.call(self._run_query, actor.device, name, *args)
+            except RuntimeError:
+                if not actor.closed:
+                    raise
+                # Evicted between session() and call(): open it again
+                actor = self.session(device_id)
+                return actor.call(self._run_query, actor.device, name, *args)
+        except ValueError:
+            # Rejected before anything was sent, or cleared by ExecuteBatch: the session is fine
+            raise
+        except Exception:
+            log_call(name, "Query failed, reconnecting on next use", device_id=device_id, level=logging.WARNING)
+            self.close(device_id)
+            raise
+
+    def _run_query(self, session, name, *args):
+        # Runs on the instrument's actor
+        if not session.connected:
+            session.open()
+        return getattr(session, name)(*args)
+
+    def reconnect(self, device_id):
+        """Reopen the session of device_id; the identity is read again on next use."""
+        self.close(device_id)
+        return self.session(device_id)
+
+    def close(self, device_id):
+        with self._lock:
+            actor = self._remove(device_id)
+        if actor is not None:
+            self._close_actor(actor)
+
+    def _remove(self, device_id):
+        # Called with the lock held
+        self._last_used.pop(device_id, None)
+        self._identities.pop(device_id, None)
+        return self._sessions.pop(device_id, None)
+
+    def _close_actor(self, actor):
+        try:
+            actor.call(actor.device.close)
+        except Exception as e:
+            log.warning("Could not close instrument %s: %s", actor.device_id, e, extra={"device_id": actor.device_id})
+        actor.close()
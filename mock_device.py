@@ -1,5 +1,11 @@
+import time
+
+
 class MockDevice:
-    def __init__(self, device_id="mock", frequency=1e6, gain=10):
+    def __init__(self, device_id="mock", frequency=1e6, gain=10, open_delay=0.0):
+        # open_delay simulates the time a real device takes to open
+        if open_delay:
+            time.sleep(open_delay)
         self.device_id = device_id
         self.frequency = frequency
         self.gain = gain
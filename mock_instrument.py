@@ -0,0 +1,82 @@
+import time
+
+
+class MockInstrument:
+    """
+    Stand-in for a VISA resource that answers a few SCPI commands.
+
+    Follows the pyvisa resource interface (write, read, query), so VisaWrapper
+    drives it like real hardware. Every write and read waits half of latency,
+    simulating the bus or network round trip a query costs on a real
+    instrument. Several commands can be sent in one message, separated by
+    ";"; the replies to its queries come back as one message, also
+    separated by ";".
+
+    usage:
+    instrument = MockInstrument("sa1", latency=0.01)
+    instrument.query("*IDN?;:FREQ?")
+    """
+    def __init__(self, device_id="mock", latency=0.0):
+        self.device_id = device_id
+        self.latency = latency
+        self.frequency = 1e6
+        self.gain = 10.0
+        self.errors = ['0,"Error Code"']
+        self.writes = 0
+        self.reads = 0
+        self._replies = []
+
+    def write(self, message):
+        self.writes += 1
+        if self.latency:
+            time.sleep(self.latency / 2)
+        for command in message.split(";"):
+            command = command.strip().lstrip(":")
+            if command:
+                reply = self._execute(command)
+                if reply is not None:
+                    self._replies.append(reply)
+
+    def read(self):
+        self.reads += 1
+        if self.latency:
+            time.sleep(self.latency / 2)
+        if not self._replies:
+            raise TimeoutError(f"Instrument '{self.device_id}' has nothing to send (query timed out)")
+        reply, self._replies = ";".join(self._replies), []
+        return reply
+
+    def query(self, message):
+        self.write(message)
+        return self.read()
+
+    def clear(self):
+        self._replies = []
+
+    def close(self):
+        self._replies = []
+
+    def _execute(self, command):
+        header, _, argument = command.partition(" ")
+        header = header.upper()
+        if header == "*IDN?":
+            return "XRComm,FlexSDR S8010-01,123456,Alpha 1"
+        if header == "*OPC?":
+            return "1"
+        if header == "*RST":
+            self.frequency, self.gain = 1e6, 10.0
+            return None
+        if header in ("SYST:ERR?", "SYSTEM:ERROR?"):
+            return self.errors.pop(0) if self.errors else '0,"No error"'
+        if header in ("FREQ?", "FREQUENCY?"):
+            return repr(self.frequency)
+        if header in ("GAIN?",):
+            return repr(self.gain)
+        if header in ("FREQ", "FREQUENCY"):
+            self.frequency = float(argument)
+            return None
+        if header == "GAIN":
+            self.gain = float(argument)
+            return None
+        self.errors.append('-113,"Undefined header"')
+        return None if not header.endswith("?") else "0"
@@ -0,0 +1,127 @@
+import math
+import sys
+import numpy as np
+
+import rfcontrol_pb2
+from compression import compress_payload, decompress_payload
+
+PackedArray = rfcontrol_pb2.PackedArray
+
+_DTYPES = {
+    PackedArray.FLOAT64: np.float64,
+    PackedArray.FLOAT32: np.float32,
+    PackedArray.COMPLEX64: np.complex64,
+}
+_DTYPE_NAMES = {
+    "float64": PackedArray.FLOAT64,
+    "float32": PackedArray.FLOAT32,
+    "complex64": PackedArray.COMPLEX64,
+}
+
+
+def pack_array(array, dtype="float64", codec=None):
+    """
+    Pack a numeric array into a PackedArray message.
+
+    Args:
+        array (np.ndarray): Array to send
+        dtype (str): Wire dtype, one of float64, float32, complex64
+        codec (str): Optional payload codec (see compression.CODECS); the data
+            is sent raw if a sample of it does not compress
+
+    Returns:
+        PackedArray: Message with the raw bytes in native byte order
+    """
+    wire_dtype = _DTYPE_NAMES[dtype]
+    array = np.ascontiguousarray(array, dtype=_DTYPES[wire_dtype])
+    data, codec = compress_payload(array.tobytes(), codec)
+    return PackedArray(
+        data=data,
+        dtype=wire_dtype,
+        shape=array.shape,
+        big_endian=sys.byteorder == "big",
+        codec=codec,
+    )
+
+
+def unpack_array(packed):
+    """
+    Decode a PackedArray as a read-only view over the message bytes
+    (or over the decompressed bytes when a codec was used).
+
+    Args:
+        packed (PackedArray): Received message
+
+    Returns:
+        np.ndarray: Array view with the sender's dtype, byte order and shape
+
+    Raises:
+        ValueError: unknown dtype, or data that does not match the shape
+    """
+    if packed.dtype not in _DTYPES:
+        raise ValueError(f"Unknown PackedArray dtype {packed.dtype}")
+    dtype = np.dtype(_DTYPES[packed.dtype]).newbyteorder(">" if packed.big_endian else "<")
+    shape = tuple(packed.shape)
+    if any(n < 0 for n in shape):
+        raise ValueError(f"Invalid PackedArray shape {list(shape)}")
+    if shape:
+        size = math.prod(shape) * dtype.itemsize
+    elif packed.codec:
+        raise ValueError("A compressed PackedArray needs its shape")
+    else:
+        # Without a shape the data is one-dimensional
+        size = None
+    data = decompress_payload(packed.data, packed.codec, size)
+    if size is not None and len(data) != size:
+        raise ValueError(f"PackedArray data has {len(data)} bytes, shape {list(shape)} needs {size}")
+    if len(data) % dtype.itemsize:
+        raise ValueError(f"PackedArray data of {len(data)} bytes is not a whole number of {dtype.name} items")
+    array = np.frombuffer(data, dtype=dtype)
+    if len(shape) > 1:
+        array = array.reshape(shape)
+    return array
+
+
+def pack_coefficients(real_coeffs, imag_coeffs, dtype="complex64", codec=None):
+    """
+    Pack FFT coefficients for FFTCoefficientsRequest.coefficients.
+
+    complex64 sends one complex array; float32/float64 send (2, ...) rows of
+    real and imaginary parts. Multi-channel (channels, n) arrays keep their shape.
+    """
+    if dtype == "complex64":
+        coeffs = np.empty(np.shape(real_coeffs), dtype=np.complex64)
+        coeffs.real = real_coeffs
+        coeffs.imag = imag_coeffs
+        return pack_array(coeffs, dtype, codec)
+    return pack_array(np.stack((real_coeffs, imag_coeffs)), dtype, codec)
+
+
+def unpack_coefficients(packed):
+    """
+    Decode packed FFT coefficients.
+
+    Returns:
+        tuple: (real coefficients, imaginary coefficients) as array views
+
+    Raises:
+        ValueError: the array is not complex or shaped (2, ...)
+    """
+    coeffs = unpack_array(packed)
+    if np.iscomplexobj(coeffs):
+        return coeffs.real, coeffs.imag
+    if coeffs.ndim < 2 or coeffs.shape[0] != 2:
+        raise ValueError(f"Float coefficients must be shaped (2, n), got {coeffs.shape}")
+    return coeffs[0], coeffs[1]
+
+
+def request_coefficients(request):
+    """
+    Read coefficients from an FFT request in either encoding.
+
+    Old clients fill the repeated real/imag fields; new clients fill
+    coefficients with a PackedArray.
+    """
+    if request.HasField("coefficients"):
+        return unpack_coefficients(request.coefficients)
+    return request.real, request.imag
@@ -0,0 +1,167 @@
+"""
+Descriptors of upstream services, fetched over server reflection once per target.
+
+For each (target, service) the file descriptors are fetched once, and the
+message classes and a unary callable for each method are built from them.
+Later calls only serialize the request and call, like a generated stub.
+An entry is refetched only when it is marked stale (the upstream
+reconnected or answered UNIMPLEMENTED); the callables are rebuilt only if
+the fetched descriptors differ.
+"""
+import hashlib
+import threading
+
+from google.protobuf import descriptor_pool, json_format, message_factory
+from google.protobuf.descriptor_pb2 import FileDescriptorProto
+from grpc_reflection.v1alpha import reflection_pb2, reflection_pb2_grpc
+
+
+class UpstreamMethod:
+    """
+    Callable for one upstream method, built from its descriptors.
+
+    usage:
+    method = cache.method(channel, "localhost:5555", "rfcontrol.RFController", "runCustomCmd")
+    response = method({"customCmdName": "pwd"}, timeout=5.0)
+    """
+    def __init__(self, channel, service, method_descriptor):
+        self.name = method_descriptor.name
+        self.path = f"/{service}/{method_descriptor.name}"
+        self.request_class = message_factory.GetMessageClass(method_descriptor.input_type)
+        self.response_class = message_factory.GetMessageClass(method_descriptor.output_type)
+        self._call = channel.unary_unary(
+            self.path,
+            request_serializer=self.request_class.SerializeToString,
+            response_deserializer=self.response_class.FromString,
+        )
+
+    def request(self, data):
+        """Request message from a dict (or an already built message)."""
+        if isinstance(data, self.request_class):
+            return data
+        return json_format.ParseDict(data or {}, self.request_class())
+
+    def __call__(self, data, metadata=None, timeout=None):
+        return self._call(self.request(data), metadata=metadata, timeout=timeout)
+
+    def future(self, data, metadata=None, timeout=None):
+        """Start the call without waiting; returns a grpc.Future."""
+        return self._call.future(self.request(data), metadata=metadata, timeout=timeout)
+
+
+class ServiceEntry:
+    def __init__(self, fingerprint, methods):
+        self.fingerprint = fingerprint
+        self.methods = methods
+        self.stale = False
+
+
+def fetch_file_descriptors(channel, symbol, timeout=None):
+    """
+    File descriptors declaring symbol and everything they import, via server reflection.
+
+    Returns:
+        list: FileDescriptorProto, dependencies before the files importing them
+    """
+    stub = reflection_pb2_grpc.ServerReflectionStub(channel)
+    files = {}
+    requested = set()
+    pending = [reflection_pb2.ServerReflectionRequest(file_containing_symbol=symbol)]
+    while pending:
+        for response in stub.ServerReflectionInfo(iter(pending), timeout=timeout):
+            if response.HasField("error_response"):
+                raise ValueError(f"Reflection lookup failed: {response.error_response.error_message}")
+            for data in response.file_descriptor_response.file_descriptor_proto:
+                proto = FileDescriptorProto.FromString(data)
+                files.setdefault(proto.name, proto)
+        # The server may leave out imports it assumes the client already has
+        missing = {dep for proto in files.values() for dep in proto.dependency} - set(files) - requested
+        requested |= missing
+        pending = [reflection_pb2.ServerReflectionRequest(file_by_filename=name) for name in sorted(missing)]
+
+    ordered = []
+    def add(name):
+        if name in files and files[name] not in ordered:
+            for dep in files[name].dependency:
+                add(dep)
+            ordered.append(files[name])
+    for name in files:
+        add(name)
+    return ordered
+
+
+class ReflectionCache:
+    """
+    Upstream method callables keyed by (target, service).
+
+    usage:
+    cache = ReflectionCache()
+    method = cache.method(channel, "localhost:5555", "rfcontrol.RFController", "runCustomCmd")
+    cache.mark_stale("localhost:5555")   # e.g. after the upstream restarted
+    """
+    def __init__(self, timeout=5.0):
+        self.timeout = timeout
+        self.fetches = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+        # One lookup at a time per (target, service); different targets are fetched in parallel
+        self._refresh_locks = {}
+
+    def cached(self, target, service):
+        """True if the callables of service on target can be used without a reflection lookup."""
+        entry = self._entries.get((target, service))
+        return entry is not None and not entry.stale
+
+    def method(self, channel, target, service, name, timeout=None):
+        """Callable for method name; timeout bounds a reflection lookup (defaults to self.timeout)."""
+        entry = self._entries.get((target, service))
+        if entry is None or entry.stale:
+            entry = self.refresh(channel, target, service, timeout)
+        method = entry.methods.get(name.lower())
+        if method is None:
+            raise ValueError(f"{name} doesn't exist in {service} on {target}")
+        return method
+
+    def refresh(self, channel, target, service, timeout=None):
+        """
+        Fetch the descriptors of service from target and rebuild its callables
+        if they changed.
+
+        Returns:
+            ServiceEntry
+        """
+        with self._lock:
+            refresh_lock = self._refresh_locks.setdefault((target, service), threading.Lock())
+        with refresh_lock:
+            entry = self._entries.get((target, service))
+            if entry is not None and not entry.stale:
+                # Another caller refreshed it while we waited
+                return entry
+            files = fetch_file_descriptors(channel, service, timeout or self.timeout)
+            fingerprint = hashlib.sha256(b"".join(f.SerializeToString(deterministic=True) for f in files)).hexdigest()
+            with self._lock:
+                self.fetches += 1
+                if entry is not None and entry.fingerprint == fingerprint:
+                    entry.stale = False
+                    return entry
+            pool = descriptor_pool.DescriptorPool()
+            for file_proto in files:
+                pool.Add(file_proto)
+            service_descriptor = pool.FindServiceByName(service)
+            methods = {m.name.lower(): UpstreamMethod(channel, service, m) for m in service_descriptor.methods}
+            entry = ServiceEntry(fingerprint, methods)
+            with self._lock:
+                self._entries[(target, service)] = entry
+            return entry
+
+    def mark_stale(self, target, service=None):
+        """Recheck the descriptors of target (all services, or one) on their next use."""
+        with self._lock:
+            for (entry_target, entry_service), entry in self._entries.items():
+                if entry_target == target and service in (None, entry_service):
+                    entry.stale = True
+
+    def clear(self, target=None):
+        with self._lock:
+            for key in [key for key in self._entries if target in (None, key[0])]:
+                del self._entries[key]
@@ -24,37 +24,79 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0frfcontrol.proto\x12\trfcontrol\"4\n\x16\x46\x46TCoefficientsRequest\x12\x0c\n\x04real\x18\x01 \x03(\x01\x12\x0c\n\x04imag\x18\x02 \x03(\x01\")\n\x17\x46\x46TCoefficientsResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\"c\n\x1c\x46\x46TCoefficientsStreamRequest\x12\x0c\n\x04real\x18\x01 \x03(\x01\x12\x0c\n\x04imag\x18\x02 \x03(\x01\x12\x10\n\x08\x63hunk_id\x18\x03 \x01(\x05\x12\x15\n\ris_last_chunk\x18\x04 \x01(\x08\"A\n\x1d\x46\x46TCoefficientsStreamResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x10\n\x08\x63hunk_id\x18\x02 \x01(\x05\"?\n\tRFRequest\x12\x11\n\tdevice_id\x18\x01 \x01(\t\x12\x11\n\tfrequency\x18\x02 \x01(\x01\x12\x0c\n\x04gain\x18\x03 \x01(\x01\".\n\nRFResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\"\n\rDeviceRequest\x12\x11\n\tdevice_id\x18\x01 \x01(\t\"q\n\x14\x44\x65viceStatusResponse\x12\x11\n\tdevice_id\x18\x01 \x01(\t\x12\x11\n\tfrequency\x18\x02 \x01(\x01\x12\x0c\n\x04gain\x18\x03 \x01(\x01\x12\x12\n\nref_locked\x18\x04 \x01(\x08\x12\x11\n\tlo_locked\x18\x05 \x01(\x08\"5\n\rRangeResponse\x12\x11\n\tmin_value\x18\x01 \x01(\x01\x12\x11\n\tmax_value\x18\x02 \x01(\x01\"%\n\x10PPStringResponse\x12\x11\n\tpp_string\x18\x01 \x01(\t\"\x1f\n\x0fGreetingRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\"$\n\x10GreetingResponse\x12\x10\n\x08greeting\x18\x01 \x01(\t2\xc2\x05\n\x0cRFController\x12<\n\rsetRFSettings\x12\x14.rfcontrol.RFRequest\x1a\x15.rfcontrol.RFResponse\x12L\n\x0fgetDeviceStatus\x12\x18.rfcontrol.DeviceRequest\x1a\x1f.rfcontrol.DeviceStatusResponse\x12\x44\n\x0bgetPPString\x12\x18.rfcontrol.DeviceRequest\x1a\x1b.rfcontrol.PPStringResponse\x12\x42\n\x0cgetGainRange\x12\x18.rfcontrol.DeviceRequest\x1a\x18.rfcontrol.RangeResponse\x12G\n\x11getFrequencyRange\x12\x18.rfcontrol.DeviceRequest\x1a\x18.rfcontrol.RangeResponse\x12@\n\x05Greet\x12\x1a.rfcontrol.GreetingRequest\x1a\x1b.rfcontrol.GreetingResponse\x12\x43\n\x04\x43hat\x12\x1a.rfcontrol.GreetingRequest\x1a\x1b.rfcontrol.GreetingResponse(\x01\x30\x01\x12\\\n\x13SendFFTCoefficients\x12!.rfcontrol.FFTCoefficientsRequest\x1a\".rfcontrol.FFTCoefficientsResponse\x12n\n\x15StreamFFTCoefficients\x12\'.rfcontrol.FFTCoefficientsStreamRequest\x1a(.rfcontrol.FFTCoefficientsStreamResponse(\x01\x30\x01\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0frfcontrol.proto\x12\trfcontrol\"e\n\x18\x44\x65viceInformationRequest\x12\x11\n\tdevice_id\x18\x01 \x01(\t\x12\x1c\n\x14\x65rror_queue_populate\x18\x02 \x01(\x08\x12\x18\n\x10refresh_identity\x18\x03 \x01(\x08\"\x8d\x01\n\x19\x44\x65viceInformationResponse\x12\x19\n\x11reply_information\x18\x01 \x01(\t\x12\x14\n\x0cmanufacturer\x18\x02 \x01(\t\x12\r\n\x05model\x18\x03 \x01(\t\x12\x15\n\rserial_number\x18\x04 \x01(\x05\x12\x19\n\x11\x66irmware_revision\x18\x05 \x01(\t\"7\n\x10ScpiBatchRequest\x12\x11\n\tdevice_id\x18\x01 \x01(\t\x12\x10\n\x08\x63ommands\x18\x02 \x03(\t\"$\n\x11ScpiBatchResponse\x12\x0f\n\x07replies\x18\x01 \x03(\t\"]\n\rFanOutRequest\x12\r\n\x05nodes\x18\x01 \x03(\t\x12\x0f\n\x07\x63ommand\x18\x02 \x01(\t\x12\x0c\n\x04mode\x18\x03 \x01(\t\x12\r\n\x05\x63ount\x18\x04 \x01(\x05\x12\x0f\n\x07timeout\x18\x05 \x01(\x01\"p\n\x0c\x46\x61nOutResult\x12\x0c\n\x04node\x18\x01 \x01(\t\x12\x0e\n\x06target\x18\x02 \x01(\t\x12\x0c\n\x04\x63ode\x18\x03 \x01(\x05\x12\x0f\n\x07\x64\x65tails\x18\x04 \x01(\t\x12\x0f\n\x07message\x18\x05 \x01(\t\x12\x12\n\nelapsed_ms\x18\x06 \x01(\x01\"s\n\tDataChunk\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12\x10\n\x08\x63hunk_id\x18\x02 \x01(\x05\x12\x0f\n\x07is_last\x18\x03 \x01(\x08\x12\x12\n\nsession_id\x18\x04 \x01(\t\x12\x0e\n\x06offset\x18\x05 \x01(\x03\x12\x11\n\tack_every\x18\x06 \x01(\x05\"+\n\x15TransferStatusRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"X\n\x16TransferStatusResponse\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x18\n\x10\x63ommitted_offset\x18\x02 \x01(\x03\x12\x10\n\x08\x63omplete\x18\x03 \x01(\x08\"\xac\x01\n\x0bPackedArray\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12+\n\x05\x64type\x18\x02 \x01(\x0e\x32\x1c.rfcontrol.PackedArray.DType\x12\r\n\x05shape\x18\x03 \x03(\x03\x12\x12\n\nbig_endian\x18\x04 \x01(\x08\x12\r\n\x05\x63odec\x18\x05 \x01(\t\"0\n\x05\x44Type\x12\x0b\n\x07\x46LOAT64\x10\x00\x12\x0b\n\x07\x46LOAT32\x10\x01\x12\r\n\tCOMPLEX64\x10\x02\"b\n\x16\x46\x46TCoefficientsRequest\x12\x0c\n\x04real\x18\x01 \x03(\x01\x12\x0c\n\x04imag\x18\x02 \x03(\x01\x12,\n\x0c\x63oefficients\x18\x03 \x01(\x0b\x32\x16.rfcontrol.PackedArray\")\n\x17\x46\x46TCoefficientsResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\"\xa4\x01\n\x1c\x46\x46TCoefficientsStreamRequest\x12\x0c\n\x04real\x18\x01 \x03(\x01\x12\x0c\n\x04imag\x18\x02 \x03(\x01\x12\x10\n\x08\x63hunk_id\x18\x03 \x01(\x05\x12\x15\n\ris_last_chunk\x18\x04 \x01(\x08\x12,\n\x0c\x63oefficients\x18\x05 \x01(\x0b\x32\x16.rfcontrol.PackedArray\x12\x11\n\tack_every\x18\x06 \x01(\x05\"\xa0\x01\n\x0eSpectrumConfig\x12\x0e\n\x06window\x18\x01 \x01(\t\x12\x10\n\x08\x66\x66t_size\x18\x02 \x01(\x05\x12\x0f\n\x07overlap\x18\x03 \x01(\x01\x12\x11\n\taveraging\x18\x04 \x01(\x05\x12\x15\n\rsampling_rate\x18\x05 \x01(\x01\x12\x11\n\tbin_start\x18\x06 \x01(\x05\x12\x10\n\x08\x62in_stop\x18\x07 \x01(\x05\x12\x0c\n\x04\x62ins\x18\x08 \x03(\x05\"r\n\x0bSampleBlock\x12)\n\x06\x63onfig\x18\x01 \x01(\x0b\x32\x19.rfcontrol.SpectrumConfig\x12\'\n\x07samples\x18\x02 \x01(\x0b\x32\x16.rfcontrol.PackedArray\x12\x0f\n\x07is_last\x18\x03 \x01(\x08\"\x91\x01\n\rSpectrumFrame\x12\x13\n\x0b\x66rame_index\x18\x01 \x01(\x03\x12\x17\n\x0f\x66rames_averaged\x18\x02 \x01(\x05\x12%\n\x05power\x18\x03 \x01(\x0b\x32\x16.rfcontrol.PackedArray\x12+\n\x0b\x66requencies\x18\x04 \x01(\x0b\x32\x16.rfcontrol.PackedArray\"A\n\x1d\x46\x46TCoefficientsStreamResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x10\n\x08\x63hunk_id\x18\x02 \x01(\x05\"?\n\tRFRequest\x12\x11\n\tdevice_id\x18\x01 \x01(\t\x12\x11\n\tfrequency\x18\x02 \x01(\x01\x12\x0c\n\x04gain\x18\x03 \x01(\x01\".\n\nRFResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\"\n\rDeviceRequest\x12\x11\n\tdevice_id\x18\x01 \x01(\t\"\x82\x01\n\x14\x44\x65viceStatusResponse\x12\x11\n\tdevice_id\x18\x01 \x01(\t\x12\x11\n\tfrequency\x18\x02 \x01(\x01\x12\x0c\n\x04gain\x18\x03 \x01(\x01\x12\x12\n\nref_locked\x18\x04 \x01(\x08\x12\x11\n\tlo_locked\x18\x05 \x01(\x08\x12\x0f\n\x07version\x18\x06 \x01(\x04\"P\n\x12WatchStatusRequest\x12\x12\n\ndevice_ids\x18\x01 \x03(\t\x12\x14\n\x0cmin_interval\x18\x02 \x01(\x01\x12\x10\n\x08\x63oalesce\x18\x03 \x01(\x01\"5\n\rRangeResponse\x12\x11\n\tmin_value\x18\x01 \x01(\x01\x12\x11\n\tmax_value\x18\x02 \x01(\x01\"%\n\x10PPStringResponse\x12\x11\n\tpp_string\x18\x01 \x01(\t\"8\n\x0e\x42\x61tchRFRequest\x12&\n\x08requests\x18\x01 \x03(\x0b\x32\x14.rfcontrol.RFRequest\"(\n\x12\x42\x61tchDeviceRequest\x12\x12\n\ndevice_ids\x18\x01 \x03(\t\"\xff\x01\n\x0c\x44\x65viceResult\x12\x11\n\tdevice_id\x18\x01 \x01(\t\x12\x0c\n\x04\x63ode\x18\x02 \x01(\x05\x12\x0f\n\x07\x64\x65tails\x18\x03 \x01(\t\x12#\n\x02rf\x18\x04 \x01(\x0b\x32\x15.rfcontrol.RFResponseH\x00\x12\x31\n\x06status\x18\x05 \x01(\x0b\x32\x1f.rfcontrol.DeviceStatusResponseH\x00\x12\x30\n\tpp_string\x18\x06 \x01(\x0b\x32\x1b.rfcontrol.PPStringResponseH\x00\x12)\n\x05range\x18\x07 \x01(\x0b\x32\x18.rfcontrol.RangeResponseH\x00\x42\x08\n\x06result\"?\n\x13\x42\x61tchDeviceResponse\x12(\n\x07results\x18\x01 \x03(\x0b\x32\x17.rfcontrol.DeviceResult\"\x85\x01\n\x10\x44\x65viceQueueStats\x12\x11\n\tdevice_id\x18\x01 \x01(\t\x12\r\n\x05\x64\x65pth\x18\x02 \x01(\r\x12\x11\n\tsubmitted\x18\x03 \x01(\x04\x12\x11\n\tcompleted\x18\x04 \x01(\x04\x12\x14\n\x0cmean_wait_ms\x18\x05 \x01(\x01\x12\x13\n\x0bmax_wait_ms\x18\x06 \x01(\x01\"H\n\x18\x44\x65viceQueueStatsResponse\x12,\n\x07\x64\x65vices\x18\x01 \x03(\x0b\x32\x1b.rfcontrol.DeviceQueueStats\"\x1f\n\x0fGreetingRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\"$\n\x10GreetingResponse\x12\x10\n\x08greeting\x18\x01 \x01(\t2\xf5\r\n\x0cRFController\x12<\n\rsetRFSettings\x12\x14.rfcontrol.RFRequest\x1a\x15.rfcontrol.RFResponse\x12L\n\x0fgetDeviceStatus\x12\x18.rfcontrol.DeviceRequest\x1a\x1f.rfcontrol.DeviceStatusResponse\x12\x44\n\x0bgetPPString\x12\x18.rfcontrol.DeviceRequest\x1a\x1b.rfcontrol.PPStringResponse\x12\x42\n\x0cgetGainRange\x12\x18.rfcontrol.DeviceRequest\x1a\x18.rfcontrol.RangeResponse\x12G\n\x11getFrequencyRange\x12\x18.rfcontrol.DeviceRequest\x1a\x18.rfcontrol.RangeResponse\x12O\n\x12\x62\x61tchSetRFSettings\x12\x19.rfcontrol.BatchRFRequest\x1a\x1e.rfcontrol.BatchDeviceResponse\x12U\n\x14\x62\x61tchGetDeviceStatus\x12\x1d.rfcontrol.BatchDeviceRequest\x1a\x1e.rfcontrol.BatchDeviceResponse\x12Q\n\x10\x62\x61tchGetPPString\x12\x1d.rfcontrol.BatchDeviceRequest\x1a\x1e.rfcontrol.BatchDeviceResponse\x12R\n\x11\x62\x61tchGetGainRange\x12\x1d.rfcontrol.BatchDeviceRequest\x1a\x1e.rfcontrol.BatchDeviceResponse\x12W\n\x16\x62\x61tchGetFrequencyRange\x12\x1d.rfcontrol.BatchDeviceRequest\x1a\x1e.rfcontrol.BatchDeviceResponse\x12Y\n\x13getDeviceQueueStats\x12\x1d.rfcontrol.BatchDeviceRequest\x1a#.rfcontrol.DeviceQueueStatsResponse\x12U\n\x11WatchDeviceStatus\x12\x1d.rfcontrol.WatchStatusRequest\x1a\x1f.rfcontrol.DeviceStatusResponse0\x01\x12@\n\x05Greet\x12\x1a.rfcontrol.GreetingRequest\x1a\x1b.rfcontrol.GreetingResponse\x12\x43\n\x04\x43hat\x12\x1a.rfcontrol.GreetingRequest\x1a\x1b.rfcontrol.GreetingResponse(\x01\x30\x01\x12\\\n\x13SendFFTCoefficients\x12!.rfcontrol.FFTCoefficientsRequest\x1a\".rfcontrol.FFTCoefficientsResponse\x12n\n\x15StreamFFTCoefficients\x12\'.rfcontrol.FFTCoefficientsStreamRequest\x1a(.rfcontrol.FFTCoefficientsStreamResponse(\x01\x30\x01\x12G\n\x0f\x43omputeSpectrum\x12\x16.rfcontrol.SampleBlock\x1a\x18.rfcontrol.SpectrumFrame(\x01\x30\x01\x12@\n\x0cTransferData\x12\x14.rfcontrol.DataChunk\x1a\x14.rfcontrol.DataChunk\"\x00(\x01\x30\x01\x12X\n\x11GetTransferStatus\x12 .rfcontrol.TransferStatusRequest\x1a!.rfcontrol.TransferStatusResponse\x12\x61\n\x14GetDeviceInformation\x12#.rfcontrol.DeviceInformationRequest\x1a$.rfcontrol.DeviceInformationResponse\x12I\n\x0c\x45xecuteBatch\x12\x1b.rfcontrol.ScpiBatchRequest\x1a\x1c.rfcontrol.ScpiBatchResponse\x12\x44\n\rFanOutCommand\x12\x18.rfcontrol.FanOutRequest\x1a\x17.rfcontrol.FanOutResult0\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'rfcontrol_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_FFTCOEFFICIENTSREQUEST']._serialized_start=30
-  _globals['_FFTCOEFFICIENTSREQUEST']._serialized_end=82
-  _globals['_FFTCOEFFICIENTSRESPONSE']._serialized_start=84
-  _globals['_FFTCOEFFICIENTSRESPONSE']._serialized_end=125
-  _globals['_FFTCOEFFICIENTSSTREAMREQUEST']._serialized_start=127
-  _globals['_FFTCOEFFICIENTSSTREAMREQUEST']._serialized_end=226
-  _globals['_FFTCOEFFICIENTSSTREAMRESPONSE']._serialized_start=228
-  _globals['_FFTCOEFFICIENTSSTREAMRESPONSE']._serialized_end=293
-  _globals['_RFREQUEST']._serialized_start=295
-  _globals['_RFREQUEST']._serialized_end=358
-  _globals['_RFRESPONSE']._serialized_start=360
-  _globals['_RFRESPONSE']._serialized_end=406
-  _globals['_DEVICEREQUEST']._serialized_start=408
-  _globals['_DEVICEREQUEST']._serialized_end=442
-  _globals['_DEVICESTATUSRESPONSE']._serialized_start=444
-  _globals['_DEVICESTATUSRESPONSE']._serialized_end=557
-  _globals['_RANGERESPONSE']._serialized_start=559
-  _globals['_RANGERESPONSE']._serialized_end=612
-  _globals['_PPSTRINGRESPONSE']._serialized_start=614
-  _globals['_PPSTRINGRESPONSE']._serialized_end=651
-  _globals['_GREETINGREQUEST']._serialized_start=653
-  _globals['_GREETINGREQUEST']._serialized_end=684
-  _globals['_GREETINGRESPONSE']._serialized_start=686
-  _globals['_GREETINGRESPONSE']._serialized_end=722
-  _globals['_RFCONTROLLER']._serialized_start=725
-  _globals['_RFCONTROLLER']._serialized_end=1431
+  _globals['_DEVICEINFORMATIONREQUEST']._serialized_start=30
+  _globals['_DEVICEINFORMATIONREQUEST']._serialized_end=131
+  _globals['_DEVICEINFORMATIONRESPONSE']._serialized_start=134
+  _globals['_DEVICEINFORMATIONRESPONSE']._serialized_end=275
+  _globals['_SCPIBATCHREQUEST']._serialized_start=277
+  _globals['_SCPIBATCHREQUEST']._serialized_end=332
+  _globals['_SCPIBATCHRESPONSE']._serialized_start=334
+  _globals['_SCPIBATCHRESPONSE']._serialized_end=370
+  _globals['_FANOUTREQUEST']._serialized_start=372
+  _globals['_FANOUTREQUEST']._serialized_end=465
+  _globals['_FANOUTRESULT']._serialized_start=467
+  _globals['_FANOUTRESULT']._serialized_end=579
+  _globals['_DATACHUNK']._serialized_start=581
+  _globals['_DATACHUNK']._serialized_end=696
+  _globals['_TRANSFERSTATUSREQUEST']._serialized_start=698
+  _globals['_TRANSFERSTATUSREQUEST']._serialized_end=741
+  _globals['_TRANSFERSTATUSRESPONSE']._serialized_start=743
+  _globals['_TRANSFERSTATUSRESPONSE']._serialized_end=831
+  _globals['_PACKEDARRAY']._serialized_start=834
+  _globals['_PACKEDARRAY']._serialized_end=1006
+  _globals['_PACKEDARRAY_DTYPE']._serialized_start=958
+  _globals['_PACKEDARRAY_DTYPE']._serialized_end=1006
+  _globals['_FFTCOEFFICIENTSREQUEST']._serialized_start=1008
+  _globals['_FFTCOEFFICIENTSREQUEST']._serialized_end=1106
+  _globals['_FFTCOEFFICIENTSRESPONSE']._serialized_start=1108
+  _globals['_FFTCOEFFICIENTSRESPONSE']._serialized_end=1149
+  _globals['_FFTCOEFFICIENTSSTREAMREQUEST']._serialized_start=1152
+  _globals['_FFTCOEFFICIENTSSTREAMREQUEST']._serialized_end=1316
+  _globals['_SPECTRUMCONFIG']._serialized_start=1319
+  _globals['_SPECTRUMCONFIG']._serialized_end=1479
+  _globals['_SAMPLEBLOCK']._serialized_start=1481
+  _globals['_SAMPLEBLOCK']._serialized_end=1595
+  _globals['_SPECTRUMFRAME']._serialized_start=1598
+  _globals['_SPECTRUMFRAME']._serialized_end=1743
+  _globals['_FFTCOEFFICIENTSSTREAMRESPONSE']._serialized_start=1745
+  _globals['_FFTCOEFFICIENTSSTREAMRESPONSE']._serialized_end=1810
+  _globals['_RFREQUEST']._serialized_start=1812
+  _globals['_RFREQUEST']._serialized_end=1875
+  _globals['_RFRESPONSE']._serialized_start=1877
+  _globals['_RFRESPONSE']._serialized_end=1923
+  _globals['_DEVICEREQUEST']._serialized_start=1925
+  _globals['_DEVICEREQUEST']._serialized_end=1959
+  _globals['_DEVICESTATUSRESPONSE']._serialized_start=1962
+  _globals['_DEVICESTATUSRESPONSE']._serialized_end=2092
+  _globals['_WATCHSTATUSREQUEST']._serialized_start=2094
+  _globals['_WATCHSTATUSREQUEST']._serialized_end=2174
+  _globals['_RANGERESPONSE']._serialized_start=2176
+  _globals['_RANGERESPONSE']._serialized_end=2229
+  _globals['_PPSTRINGRESPONSE']._serialized_start=2231
+  _globals['_PPSTRINGRESPONSE']._serialized_end=2268
+  _globals['_BATCHRFREQUEST']._serialized_start=2270
+  _globals['_BATCHRFREQUEST']._serialized_end=2326
+  _globals['_BATCHDEVICEREQUEST']._serialized_start=2328
+  _globals['_BATCHDEVICEREQUEST']._serialized_end=2368
+  _globals['_DEVICERESULT']._serialized_start=2371
+  _globals['_DEVICERESULT']._serialized_end=2626
+  _globals['_BATCHDEVICERESPONSE']._serialized_start=2628
+  _globals['_BATCHDEVICERESPONSE']._serialized_end=2691
+  _globals['_DEVICEQUEUESTATS']._serialized_start=2694
+  _globals['_DEVICEQUEUESTATS']._serialized_end=2827
+  _globals['_DEVICEQUEUESTATSRESPONSE']._serialized_start=2829
+  _globals['_DEVICEQUEUESTATSRESPONSE']._serialized_end=2901
+  _globals['_GREETINGREQUEST']._serialized_start=2903
+  _globals['_GREETINGREQUEST']._serialized_end=2934
+  _globals['_GREETINGRESPONSE']._serialized_start=2936
+  _globals['_GREETINGRESPONSE']._serialized_end=2972
+  _globals['_RFCONTROLLER']._serialized_start=2975
+  _globals['_RFCONTROLLER']._serialized_end=4756
 # @@protoc_insertion_point(module_scope)
@@ -59,6 +59,41 @@ class RFControllerStub(object):
                 request_serializer=rfcontrol__pb2.DeviceRequest.SerializeToString,
                 response_deserializer=rfcontrol__pb2.RangeResponse.FromString,
                 _registered_method=True)
+        self.batchSetRFSettings = channel.unary_unary(
+                '/rfcontrol.RFController/batchSetRFSettings',
+                request_serializer=rfcontrol__pb2.BatchRFRequest.SerializeToString,
+                response_deserializer=rfcontrol__pb2.BatchDeviceResponse.FromString,
+                _registered_method=True)
+        self.batchGetDeviceStatus = channel.unary_unary(
+                '/rfcontrol.RFController/batchGetDeviceStatus',
+                request_serializer=rfcontrol__pb2.BatchDeviceRequest.SerializeToString,
+                response_deserializer=rfcontrol__pb2.BatchDeviceResponse.FromString,
+                _registered_method=True)
+        self.batchGetPPString = channel.unary_unary(
+                '/rfcontrol.RFController/batchGetPPString',
+                request_serializer=rfcontrol__pb2.BatchDeviceRequest.SerializeToString,
+                response_deserializer=rfcontrol__pb2.BatchDeviceResponse.FromString,
+                _registered_method=True)
+        self.batchGetGainRange = channel.unary_unary(
+                '/rfcontrol.RFController/batchGetGainRange',
+                request_serializer=rfcontrol__pb2.BatchDeviceRequest.SerializeToString,
+                response_deserializer=rfcontrol__pb2.BatchDeviceResponse.FromString,
+                _registered_method=True)
+        self.batchGetFrequencyRange = channel.unary_unary(
+                '/rfcontrol.RFController/batchGetFrequencyRange',
+                request_serializer=rfcontrol__pb2.BatchDeviceRequest.SerializeToString,
+                response_deserializer=rfcontrol__pb2.BatchDeviceResponse.FromString,
+                _registered_method=True)
+        self.getDeviceQueueStats = channel.unary_unary(
+                '/rfcontrol.RFController/getDeviceQueueStats',
+                request_serializer=rfcontrol__pb2.BatchDeviceRequest.SerializeToString,
+                response_deserializer=rfcontrol__pb2.DeviceQueueStatsResponse.FromString,
+                _registered_method=True)
+        self.WatchDeviceStatus = channel.unary_stream(
+                '/rfcontrol.RFController/WatchDeviceStatus',
+                request_serializer=rfcontrol__pb2.WatchStatusRequest.SerializeToString,
+                response_deserializer=rfcontrol__pb2.DeviceStatusResponse.FromString,
+                _registered_method=True)
         self.Greet = channel.unary_unary(
                 '/rfcontrol.RFController/Greet',
                 request_serializer=rfcontrol__pb2.GreetingRequest.SerializeToString,
@@ -79,6 +114,36 @@ class RFControllerStub(object):
                 request_serializer=rfcontrol__pb2.FFTCoefficientsStreamRequest.SerializeToString,
                 response_deserializer=rfcontrol__pb2.FFTCoefficientsStreamResponse.FromString,
                 _registered_method=True)
+        self.ComputeSpectrum = channel.stream_stream(
+                '/rfcontrol.RFController/ComputeSpectrum',
+                request_serializer=rfcontrol__pb2.SampleBlock.SerializeToString,
+                response_deserializer=rfcontrol__pb2.SpectrumFrame.FromString,
+                _registered_method=True)
+        self.TransferData = channel.stream_stream(
+                '/rfcontrol.RFController/TransferData',
+                request_serializer=rfcontrol__pb2.DataChunk.SerializeToString,
+                response_deserializer=rfcontrol__pb2.DataChunk.FromString,
+                _registered_method=True)
+        self.GetTransferStatus = channel.unary_unary(
+                '/rfcontrol.RFController/GetTransferStatus',
+                request_serializer=rfcontrol__pb2.TransferStatusRequest.SerializeToString,
+                response_deserializer=rfcontrol__pb2.TransferStatusResponse.FromString,
+                _registered_method=True)
+        self.GetDeviceInformation = channel.unary_unary(
+                '/rfcontrol.RFController/GetDeviceInformation',
+                request_serializer=rfcontrol__pb2.DeviceInformationRequest.SerializeToString,
+                response_deserializer=rfcontrol__pb2.DeviceInformationResponse.FromString,
+                _registered_method=True)
+        self.ExecuteBatch = channel.unary_unary(
+                '/rfcontrol.RFController/ExecuteBatch',
+                request_serializer=rfcontrol__pb2.ScpiBatchRequest.SerializeToString,
+                response_deserializer=rfcontrol__pb2.ScpiBatchResponse.FromString,
+                _registered_method=True)
+        self.FanOutCommand = channel.unary_stream(
+                '/rfcontrol.RFController/FanOutCommand',
+                request_serializer=rfcontrol__pb2.FanOutRequest.SerializeToString,
+                response_deserializer=rfcontrol__pb2.FanOutResult.FromString,
+                _registered_method=True)
 
 
 class RFControllerServicer(object):
@@ -114,6 +179,52 @@ class RFControllerServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def batchSetRFSettings(self, request, context):
+        """Batch variants: one round trip for many devices, run concurrently across
+        devices on the server, with a status code per device
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def batchGetDeviceStatus(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def batchGetPPString(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def batchGetGainRange(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def batchGetFrequencyRange(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def getDeviceQueueStats(self, request, context):
+        """Command queue depth and wait times per device (empty device_ids: all devices)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WatchDeviceStatus(self, request, context):
+        """Push device status when frequency, gain or lock state changes
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def Greet(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -138,6 +249,48 @@ class RFControllerServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ComputeSpectrum(self, request_iterator, context):
+        """Stream raw real or IQ samples, receive spectra computed on the server
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def TransferData(self, request_iterator, context):
+        """Bidirectional streaming RPC for sending and receiving large data
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetTransferStatus(self, request, context):
+        """Last committed byte offset of a resumable TransferData session
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetDeviceInformation(self, request, context):
+        """VISA API Implementation //
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ExecuteBatch(self, request, context):
+        """Several SCPI commands sent to one instrument in as few round trips as possible
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def FanOutCommand(self, request, context):
+        """Custom command sent to several FlexSDR nodes at once; results stream back as nodes answer
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_RFControllerServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -166,6 +319,41 @@ def add_RFControllerServicer_to_server(servicer, server):
                     request_deserializer=rfcontrol__pb2.DeviceRequest.FromString,
                     response_serializer=rfcontrol__pb2.RangeResponse.SerializeToString,
             ),
+            'batchSetRFSettings': grpc.unary_unary_rpc_method_handler(
+                    servicer.batchSetRFSettings,
+                    request_deserializer=rfcontrol__pb2.BatchRFRequest.FromString,
+                    response_serializer=rfcontrol__pb2.BatchDeviceResponse.SerializeToString,
+            ),
+            'batchGetDeviceStatus': grpc.unary_unary_rpc_method_handler(
+                    servicer.batchGetDeviceStatus,
+                    request_deserializer=rfcontrol__pb2.BatchDeviceRequest.FromString,
+                    response_serializer=rfcontrol__pb2.BatchDeviceResponse.SerializeToString,
+            ),
+            'batchGetPPString': grpc.unary_unary_rpc_method_handler(
+                    servicer.batchGetPPString,
+                    request_deserializer=rfcontrol__pb2.BatchDeviceRequest.FromString,
+                    response_serializer=rfcontrol__pb2.BatchDeviceResponse.SerializeToString,
+            ),
+            'batchGetGainRange': grpc.unary_unary_rpc_method_handler(
+                    servicer.batchGetGainRange,
+                    request_deserializer=rfcontrol__pb2.BatchDeviceRequest.FromString,
+                    response_serializer=rfcontrol__pb2.BatchDeviceResponse.SerializeToString,
+            ),
+            'batchGetFrequencyRange': grpc.unary_unary_rpc_method_handler(
+                    servicer.batchGetFrequencyRange,
+                    request_deserializer=rfcontrol__pb2.BatchDeviceRequest.FromString,
+                    response_serializer=rfcontrol__pb2.BatchDeviceResponse.SerializeToString,
+            ),
+            'getDeviceQueueStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.getDeviceQueueStats,
+                    request_deserializer=rfcontrol__pb2.BatchDeviceRequest.FromString,
+                    response_serializer=rfcontrol__pb2.DeviceQueueStatsResponse.SerializeToString,
+            ),
+            'WatchDeviceStatus': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchDeviceStatus,
+                    request_deserializer=rfcontrol__pb2.WatchStatusRequest.FromString,
+                    response_serializer=rfcontrol__pb2.DeviceStatusResponse.SerializeToString,
+            ),
             'Greet': grpc.unary_unary_rpc_method_handler(
                     servicer.Greet,
                     request_deserializer=rfcontrol__pb2.GreetingRequest.FromString,
@@ -186,6 +374,36 @@ def add_RFControllerServicer_to_server(servicer, server):
                     request_deserializer=rfcontrol__pb2.FFTCoefficientsStreamRequest.FromString,
                     response_serializer=rfcontrol__pb2.FFTCoefficientsStreamResponse.SerializeToString,
             ),
+            'ComputeSpectrum': grpc.stream_stream_rpc_method_handler(
+                    servicer.ComputeSpectrum,
+                    request_deserializer=rfcontrol__pb2.SampleBlock.FromString,
+                    response_serializer=rfcontrol__pb2.SpectrumFrame.SerializeToString,
+            ),
+            'TransferData': grpc.stream_stream_rpc_method_handler(
+                    servicer.TransferData,
+                    request_deserializer=rfcontrol__pb2.DataChunk.FromString,
+                    response_serializer=rfcontrol__pb2.DataChunk.SerializeToString,
+            ),
+            'GetTransferStatus': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetTransferStatus,
+                    request_deserializer=rfcontrol__pb2.TransferStatusRequest.FromString,
+                    response_serializer=rfcontrol__pb2.TransferStatusResponse.SerializeToString,
+            ),
+            'GetDeviceInformation': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetDeviceInformation,
+                    request_deserializer=rfcontrol__pb2.DeviceInformationRequest.FromString,
+                    response_serializer=rfcontrol__pb2.DeviceInformationResponse.SerializeToString,
+            ),
+            'ExecuteBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.ExecuteBatch,
+                    request_deserializer=rfcontrol__pb2.ScpiBatchRequest.FromString,
+                    response_serializer=rfcontrol__pb2.ScpiBatchResponse.SerializeToString,
+            ),
+            'FanOutCommand': grpc.unary_stream_rpc_method_handler(
+                    servicer.FanOutCommand,
+                    request_deserializer=rfcontrol__pb2.FanOutRequest.FromString,
+                    response_serializer=rfcontrol__pb2.FanOutResult.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'rfcontrol.RFController', rpc_method_handlers)
@@ -332,6 +550,195 @@ class RFController(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def batchSetRFSettings(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/rfcontrol.RFController/batchSetRFSettings',
+            rfcontrol__pb2.BatchRFRequest.SerializeToString,
+            rfcontrol__pb2.BatchDeviceResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def batchGetDeviceStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/rfcontrol.RFController/batchGetDeviceStatus',
+            rfcontrol__pb2.BatchDeviceRequest.SerializeToString,
+            rfcontrol__pb2.BatchDeviceResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def batchGetPPString(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/rfcontrol.RFController/batchGetPPString',
+            rfcontrol__pb2.BatchDeviceRequest.SerializeToString,
+            rfcontrol__pb2.BatchDeviceResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def batchGetGainRange(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/rfcontrol.RFController/batchGetGainRange',
+            rfcontrol__pb2.BatchDeviceRequest.SerializeToString,
+            rfcontrol__pb2.BatchDeviceResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def batchGetFrequencyRange(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/rfcontrol.RFController/batchGetFrequencyRange',
+            rfcontrol__pb2.BatchDeviceRequest.SerializeToString,
+            rfcontrol__pb2.BatchDeviceResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def getDeviceQueueStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/rfcontrol.RFController/getDeviceQueueStats',
+            rfcontrol__pb2.BatchDeviceRequest.SerializeToString,
+            rfcontrol__pb2.DeviceQueueStatsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def WatchDeviceStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/rfcontrol.RFController/WatchDeviceStatus',
+            rfcontrol__pb2.WatchStatusRequest.SerializeToString,
+            rfcontrol__pb2.DeviceStatusResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def Greet(request,
             target,
@@ -439,3 +846,165 @@ class RFController(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def ComputeSpectrum(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/rfcontrol.RFController/ComputeSpectrum',
+            rfcontrol__pb2.SampleBlock.SerializeToString,
+            rfcontrol__pb2.SpectrumFrame.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def TransferData(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/rfcontrol.RFController/TransferData',
+            rfcontrol__pb2.DataChunk.SerializeToString,
+            rfcontrol__pb2.DataChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetTransferStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/rfcontrol.RFController/GetTransferStatus',
+            rfcontrol__pb2.TransferStatusRequest.SerializeToString,
+            rfcontrol__pb2.TransferStatusResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetDeviceInformation(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/rfcontrol.RFController/GetDeviceInformation',
+            rfcontrol__pb2.DeviceInformationRequest.SerializeToString,
+            rfcontrol__pb2.DeviceInformationResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ExecuteBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/rfcontrol.RFController/ExecuteBatch',
+            rfcontrol__pb2.ScpiBatchRequest.SerializeToString,
+            rfcontrol__pb2.ScpiBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def FanOutCommand(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/rfcontrol.RFController/FanOutCommand',
+            rfcontrol__pb2.FanOutRequest.SerializeToString,
+            rfcontrol__pb2.FanOutResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,133 @@
+"""
+Logging for the RPC servers, kept off the request path.
+
+Records are put on a queue by the calling thread and formatted and written
+by a QueueListener thread, so a slow terminal or disk never stalls an RPC.
+Messages use logging's lazy %-style arguments: nothing is formatted for
+records below the configured level, and formatting of the others happens
+on the listener thread.
+
+Per-call lines go through log_call(), which can sample them per method:
+with a rate of 0.01 one call in a hundred is logged, 0 turns a method's
+lines off. Warnings and errors are never sampled.
+
+Records are structured: log_call() attaches the method and device_id as
+record attributes (logging's extra), and the formatter prints them as
+method=... device_id=... fields ("-" for records without them). Other
+lines about a device pass extra={"device_id": device_id}.
+
+usage:
+setup_logging(logging.INFO, {"getDeviceStatus": 0.01, "TransferData": 0})
+log_call("getDeviceStatus", "Request", device_id=device_id)
+"""
+import atexit
+import itertools
+import logging
+import logging.handlers
+import queue
+
+log = logging.getLogger("rfcontrol")
+
+FORMAT = "%(asctime)s %(levelname)s %(name)s method=%(method)s device_id=%(device_id)s: %(message)s"
+
+_listener = None
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread."""
+    def prepare(self, record):
+        # The stock prepare() formats the message here, on the calling thread.
+        # The queue stays in this process, so the record can be passed as is.
+        return record
+
+
+class MethodSampler:
+    """
+    Decides which calls of a method are logged.
+
+    Args:
+        rates (dict): method name -> fraction of calls to log (1 logs all, 0 none)
+        default (float): Rate of methods not in rates
+    """
+    def __init__(self, rates=None, default=1.0):
+        self.rates = dict(rates or {})
+        self.default = default
+        self._counters = {}
+
+    def rate(self, method):
+        return self.rates.get(method, self.default)
+
+    def sample(self, method):
+        rate = self.rate(method)
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        # Every n-th call instead of random(): cheaper and evenly spread
+        counter = self._counters.get(method)
+        if counter is None:
+            counter = self._counters.setdefault(method, itertools.count())
+        return next(counter) % round(1.0 / rate) == 0
+
+
+sampler = MethodSampler()
+
+
+def log_call(method, msg, *args, device_id=None, level=logging.INFO):
+    """Log msg % args for a call of method, if the level is enabled and the call is sampled."""
+    if log.isEnabledFor(level) and (level >= logging.WARNING or sampler.sample(method)):
+        extra = {"method": method}
+        if device_id is not None:
+            extra["device_id"] = device_id
+        log.log(level, msg, *args, extra=extra)
+
+
+def parse_sample_rates(values):
+    """["getDeviceStatus=0.01", ...] -> {"getDeviceStatus": 0.01, ...}"""
+    rates = {}
+    for value in values or ():
+        method, sep, rate = value.partition("=")
+        if not sep:
+            raise ValueError(f"Expected METHOD=RATE, got '{value}'")
+        rates[method.strip()] = float(rate)
+    return rates
+
+
+def setup_logging(level=None, sample_rates=None, stream=None):
+    """
+    Send log records through a queue to a background writer thread.
+
+    Calling it again only changes the level and the sample rates given.
+    level defaults to INFO on the first call.
+
+    Returns:
+        logging.handlers.QueueListener
+    """
+    global _listener
+    root = logging.getLogger()
+    if level is not None or _listener is None:
+        root.setLevel(level or logging.INFO)
+    if sample_rates is not None:
+        sampler.rates = dict(sample_rates)
+    if _listener is not None:
+        return _listener
+
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(FORMAT, defaults={"method": "-", "device_id": "-"}))
+    records = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+    _listener.start()
+    root.addHandler(LazyQueueHandler(records))
+    # Write out what is still queued when the server exits
+    atexit.register(_listener.stop)
+    return _listener
+
+
+def add_logging_arguments(parser):
+    parser.add_argument('--log-level', default='INFO', help='Log level (DEBUG logs every streamed chunk)')
+    parser.add_argument('--log-sample', action='append', default=[], metavar='METHOD=RATE',
+                        help='Log only this fraction of the calls of METHOD, e.g. getDeviceStatus=0.01 (repeatable)')
+
+
+def setup_logging_from_args(args):
+    return setup_logging(args.log_level.upper(), parse_sample_rates(args.log_sample))
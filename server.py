@@ -4,51 +4,179 @@ import time
 import rfcontrol_pb2_grpc
 import rfcontrol_pb2
 import argparse
+import functools
 import sys
+import os
+import threading
+import uuid
 import logging
 
-## Enable grpc_invoke
-from grpc_invoke.grpc_client import GrpcClient
 from grpc_reflection.v1alpha import reflection
-from grpc_invoke import GrpcInvoker
 
+from capability_cache import CapabilityCache
+from compression import CompressionPolicy
+from device_registry import DeviceRegistry
+from device_snapshot import DeviceSnapshot, SnapshotDevice
+from instrument_registry import InstrumentRegistry
 from mock_device import MockDevice
-from visa_wrapper import VisaWrapper
+from packed_array import request_coefficients, pack_array, unpack_array
+from rpc_log import add_logging_arguments, log, log_call, setup_logging, setup_logging_from_args
+from spectrum_engine import SpectrumEngine
+from status_hub import StatusHub, watch_delay
+from transfer import ECHO_SUFFIX, MmapSink, TransferSession, TransferStore
+from upstream import UpstreamPool
 try:
     import uhd
     uhd_driver = True
 except ImportError:
     uhd_driver = False
 
+def open_usrp(device_addr):
+    usrp = uhd.usrp.MultiUSRP(device_addr)
+    device_id = usrp.get_mboard_name()
+    log.info("Found USRP device: %s", device_id)
+    return device_id, usrp
+
+def open_mock(device_id="mock", open_delay=0.0):
+    return device_id, MockDevice(device_id, open_delay=open_delay)
+
+def scan_devices(mock_devices=1, mock_open_delay=0.0):
+    """
+    (key, opener) for every connected device, for DeviceRegistry scans.
+    Mock devices come first, so they start opening while uhd.find_devices()
+    runs. USRPs are keyed by their device address.
+    """
+    for i in range(mock_devices):
+        device_id = "mock" if i == 0 else f"mock{i}"
+        yield f"mock:{device_id}", functools.partial(open_mock, device_id, mock_open_delay)
+    if uhd_driver:
+        for device_addr in uhd.find_devices():
+            yield str(device_addr), functools.partial(open_usrp, device_addr)
+
 class RFControllerServicer(rfcontrol_pb2_grpc.RFControllerServicer):
-    def __init__(self):
-        self.devices = {}
+    def __init__(self, transfer_dir=None, compression_policy=None, status_poll=1.0,
+                 device_wait=5.0, mock_devices=1, mock_open_delay=0.0, rescan_interval=10.0,
+                 snapshot_path=None, reapply_settings=False, upstreams=None, instruments=None):
+        # device_id -> DeviceActor; every device call goes through the device's actor.
+        # Devices are opened in the background and registered as they become ready.
+        self.devices = DeviceRegistry(prepare=self._prepare_device)
+        self.device_wait = device_wait
+        self.compression_policy = compression_policy or CompressionPolicy()
+        self.transfer_dir = transfer_dir
+        self.transfer_store = TransferStore(transfer_dir) if transfer_dir is not None else None
+        self.status_hub = StatusHub(self.devices, status_poll)
+        # Channels to the FlexSDR and other upstream servers, shared by all calls
+        self.upstreams = upstreams or UpstreamPool()
+        # VISA instrument sessions stay open between requests
+        self.instruments = instruments or InstrumentRegistry()
+
+        # Ranges and identity do not change while a device is open
+        self.capabilities = CapabilityCache()
+        self.devices.add_listener(self._device_changed)
+
+        # Serve the devices of the last run from the snapshot until they are open again
+        self.snapshot = DeviceSnapshot(snapshot_path) if snapshot_path else None
+        self.reapply_settings = reapply_settings
+        if self.snapshot:
+            for device_id, entry in self.snapshot.devices.items():
+                self.devices.register(device_id, SnapshotDevice(device_id, entry), entry["key"], provisional=True)
+
+        if not uhd_driver:
+            log.info("No hardware is connected or driver not installed, use 'mock' as device_id")
+        scan = functools.partial(scan_devices, mock_devices, mock_open_delay)
+        self.devices.discover(scan)
+        # Pick up devices that are plugged in, power-cycled or removed while serving
+        if rescan_interval:
+            self.devices.start_rescan(scan, rescan_interval)
+
+    def _device_changed(self, event, device_id, device):
+        if event == "removed":
+            self.capabilities.invalidate(device)
+            if device_id not in self.devices:
+                self.status_hub.forget(device_id)
+            if self.snapshot and device_id not in self.devices:
+                self.snapshot.forget(device_id)
+            return
         try:
-            _devices = uhd.find_devices()
-            for device in _devices:
-                usrp = uhd.usrp.MultiUSRP(device)
-                device_id = usrp.get_mboard_name()
-                self.devices[device_id] = usrp
-                print(f"Found USRP device: {device_id}")
+            self.capabilities.fill(device)
         except Exception as e:
-            print("No hardware is connected or driver not installed, use 'mock' as device_id")
+            log.warning("Could not read capabilities of %s: %s", device_id, e, extra={"device_id": device_id})
+            return
+
+    def _prepare_device(self, device_id, device):
+        # Queued before the device is published, so it runs before any request
+        if self.snapshot:
+            device.submit(self._reconcile_device, device_id, device)
+
+    def _reconcile_device(self, device_id, device):
+        previous = self.snapshot.devices.get(device_id)
+        if self.reapply_settings and previous is not None:
+            status = previous["status"]
+            log.info("Reapplying settings to %s: frequency=%s, gain=%s", device_id, status["frequency"], status["gain"],
+                     extra={"device_id": device_id})
+            request = rfcontrol_pb2.RFRequest(device_id=device_id, frequency=status["frequency"], gain=status["gain"])
+            self._configure_device(device, request)
+        capabilities = {name: self.capabilities.get(device, name) for name in CapabilityCache.QUERIES}
+        self.snapshot.record_device(device_id, device.key, capabilities, device.get_status())
+
+    def _get_device(self, device_id, context, ready=False):
+        # ready=True: the call changes the device, so a snapshot stand-in will not do
+        device = self.devices.get(device_id)
+        if device is not None and ready and device.provisional:
+            device = None
+        if device is None and self.devices.discovering:
+            # The device may still be opening: wait up to device_wait or the call deadline
+            timeout = self.device_wait
+            remaining = context.time_remaining()
+            if remaining is not None:
+                timeout = min(timeout, remaining)
+            device = self.devices.wait_for(device_id, max(timeout, 0), ready)
+        if device is None:
+            if self.devices.discovering or device_id in self.devices:
+                context.set_code(grpc.StatusCode.UNAVAILABLE)
+                context.set_details(f"Device '{device_id}' is not ready yet")
+            else:
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details("No hardware connected, please use 'mock' as device_id")
+            return None
+        return device
 
-        self.devices["mock"] = MockDevice()
+    def _device_request(self, device_id, context, func, *args, ready=False):
+        """
+        func(device, *args) on device_id, or None with the status set on context.
 
-    def _get_device(self, device_id, context):
-        if device_id not in self.devices:
-            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-            context.set_details("No hardware connected, please use 'mock' as device_id")
-            return None
-        return self.devices[device_id]
+        A rescan may retire or replace the device while the request runs; its
+        closed actor then refuses commands, and the device is looked up again once.
+        """
+        for attempt in range(2):
+            device = self._get_device(device_id, context, ready)
+            if device is None:
+                return None
+            try:
+                return func(device, *args)
+            except RuntimeError:
+                if not device.closed:
+                    raise
+        self._device_removed(device_id, context)
+        return None
+
+    def _device_removed(self, device_id, context):
+        context.set_code(grpc.StatusCode.UNAVAILABLE)
+        context.set_details(f"Device '{device_id}' was removed while the request ran")
 
     def setRFSettings(self, request, context):
-        print(f"Config: device_id={request.device_id}, frequency={request.frequency}, gain={request.gain}")
+        log_call("setRFSettings", "Config: frequency=%s, gain=%s", request.frequency, request.gain, device_id=request.device_id)
 
-        device = self._get_device(request.device_id, context)
-        if device is None:
+        response = self._device_request(request.device_id, context, self._apply_rf_settings, request, ready=True)
+        if response is None:
             return rfcontrol_pb2.RFResponse(success=False, message=context.details())
+        return response
 
+    def _apply_rf_settings(self, device, request):
+        # One actor command, so no other call to the device runs between the two settings
+        return device.call(self._configure_device, device, request)
+
+    def _configure_device(self, device, request):
         freq_s, freq_m = True, "Unchanged"
         gain_s, gain_m = True, "Unchanged"
 
@@ -56,6 +184,12 @@ class RFControllerServicer(rfcontrol_pb2_grpc.RFControllerServicer):
             freq_s, freq_m = device.set_center_frequency(request.frequency)
         if request.gain != -9999:
             gain_s, gain_m = device.set_gain(request.gain)
+        # The printable string reports frequency and gain
+        self.capabilities.invalidate(device, "pp_string")
+        self.status_hub.notify(request.device_id)
+        if self.snapshot and not device.provisional:
+            self.snapshot.record_status(request.device_id, device.get_status(),
+                                        self.capabilities.get(device, "pp_string"))
 
         if not (freq_s and gain_s):
             return rfcontrol_pb2.RFResponse(success=False, message=f"Frequency: {freq_m}\nGain: {gain_m}")
@@ -64,9 +198,9 @@ class RFControllerServicer(rfcontrol_pb2_grpc.RFControllerServicer):
 
     ### VISA Commands Starts ###
     def GetDeviceInformation(self, request, context):
-        visaWrp = VisaWrapper()
-        error_queue_populate = request.error_queue_populate
-        response = visaWrp.GetDeviceInformation()
+        # Identity is cached per instrument; only the error queue is queried every time
+        response = dict(self.instruments.identity(request.device_id, refresh=request.refresh_identity))
+        response["reply_information"] = self.instruments.error_queue(request.device_id) if request.error_queue_populate else ""
         commandName = request.device_id
         #result = self.invoke_server_b(commandName,context)
         result = self.callFlexSDR(commandName,context)
@@ -77,43 +211,106 @@ class RFControllerServicer(rfcontrol_pb2_grpc.RFControllerServicer):
                 serial_number=response["serial_number"],
                 firmware_revision=response["firmware_revision"]
         )
+
+    def ExecuteBatch(self, request, context):
+        log_call("ExecuteBatch", "%d commands", len(request.commands), device_id=request.device_id)
+        try:
+            replies = self.instruments.execute(request.device_id, list(request.commands))
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return rfcontrol_pb2.ScpiBatchResponse()
+        except OSError as e:
+            context.set_code(grpc.StatusCode.UNAVAILABLE)
+            context.set_details(str(e))
+            return rfcontrol_pb2.ScpiBatchResponse()
+        return rfcontrol_pb2.ScpiBatchResponse(replies=replies)
     
     ### VISA Commands Ends ###
 
     def getDeviceStatus(self, request, context):
-        print(f"getDeviceStatus: device_id={request.device_id}")
+        log_call("getDeviceStatus", "Request", device_id=request.device_id)
 
-        device = self._get_device(request.device_id, context)
-        if device is None:
+        response = self._device_request(request.device_id, context, self._device_status)
+        if response is None:
             return rfcontrol_pb2.DeviceStatusResponse()
+        return response
 
-        status = device.get_status()
+    def _device_status(self, device, request=None):
+        return self._status_response(device.get_status())
+
+    def _status_response(self, status, version=0):
         return rfcontrol_pb2.DeviceStatusResponse(
                 device_id=status["device_id"],
                 frequency=status["frequency"],
                 gain=status["gain"],
                 ref_locked=status["ref_locked"],
                 lo_locked=status["lo_locked"],
+                version=version,
         )
 
+    def WatchDeviceStatus(self, request, context):
+        device_ids = self._watch_device_ids(request, context)
+        if device_ids is None:
+            return
+        log_call("WatchDeviceStatus", "Watching %s", device_ids or "all devices")
+
+        wakeup = threading.Event()
+        self.status_hub.subscribe(wakeup.set)
+        try:
+            for device_id in self._watched(device_ids):
+                self.status_hub.notify(device_id)
+            seen = {}
+            last_sent = 0.0
+            while context.is_active():
+                wakeup.clear()
+                if not self.status_hub.changed(self._watched(device_ids), dict(seen)):
+                    wakeup.wait(1.0)
+                    continue
+                # Only the latest snapshot of each device is sent after the delay
+                if seen:
+                    time.sleep(watch_delay(last_sent, request.min_interval, request.coalesce))
+                for device_id, version, status in self.status_hub.changed(self._watched(device_ids), seen):
+                    yield self._status_response(status, version)
+                last_sent = time.monotonic()
+        finally:
+            self.status_hub.unsubscribe(wakeup.set)
+
+    def _watch_device_ids(self, request, context):
+        # An empty list watches the whole fleet, resolved again on every check
+        # so devices found or removed while watching are followed
+        device_ids = list(request.device_ids)
+        unknown = [device_id for device_id in device_ids if device_id not in self.devices]
+        if unknown:
+            context.set_code(grpc.StatusCode.UNAVAILABLE if self.devices.discovering else grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"Unknown device_id: {', '.join(unknown)}")
+            return None
+        return device_ids
+
+    def _watched(self, device_ids):
+        return device_ids or list(self.devices)
+
     def getPPString(self, request, context):
-        print(f"getPPString: device_id={request.device_id}")
+        log_call("getPPString", "Request", device_id=request.device_id)
 
-        device = self._get_device(request.device_id, context)
-        if device is None:
+        response = self._device_request(request.device_id, context, self._pp_string)
+        if response is None:
             return rfcontrol_pb2.PPStringResponse(pp_string="")
+        return response
 
-        pp_string = device.get_pp_string()
-        return rfcontrol_pb2.PPStringResponse(pp_string=pp_string)
+    def _pp_string(self, device, request=None):
+        return rfcontrol_pb2.PPStringResponse(pp_string=self.capabilities.get(device, "pp_string"))
 
     def getGainRange(self, request, context):
-        print(f"getGainRange: device_id={request.device_id}")
+        log_call("getGainRange", "Request", device_id=request.device_id)
 
-        device = self._get_device(request.device_id, context)
-        if device is None:
+        response = self._device_request(request.device_id, context, self._gain_range)
+        if response is None:
             return rfcontrol_pb2.RangeResponse()
+        return response
 
-        min_gain, max_gain = device.get_rx_gain_range()
+    def _gain_range(self, device, request=None):
+        min_gain, max_gain = self.capabilities.get(device, "gain_range")
         return rfcontrol_pb2.RangeResponse(
             min_value=min_gain,
             max_value=max_gain,
@@ -130,25 +327,116 @@ class RFControllerServicer(rfcontrol_pb2_grpc.RFControllerServicer):
             yield rfcontrol_pb2.GreetingResponse(greeting=f"Welcome, {request.name}!")
     
     def getFrequencyRange(self, request, context):
-        print(f"getFrequencyRange: device_id={request.device_id}")
+        log_call("getFrequencyRange", "Request", device_id=request.device_id)
 
-        device = self._get_device(request.device_id, context)
-        if device is None:
+        response = self._device_request(request.device_id, context, self._frequency_range)
+        if response is None:
             return rfcontrol_pb2.RangeResponse()
+        return response
 
-        min_freq, max_freq = device.get_rx_freq_range()
+    def _frequency_range(self, device, request=None):
+        min_freq, max_freq = self.capabilities.get(device, "freq_range")
         return rfcontrol_pb2.RangeResponse(
             min_value=min_freq,
             max_value=max_freq,
         )
+
+    ### Batch device calls ###
+    # Every request is queued on its device's actor: devices work in parallel,
+    # requests for the same device run in order.
+
+    def batchSetRFSettings(self, request, context):
+        log_call("batchSetRFSettings", "%d requests", len(request.requests))
+        return self._run_batch([(r.device_id, r) for r in request.requests], "rf", self._apply_rf_settings)
+
+    def batchGetDeviceStatus(self, request, context):
+        log_call("batchGetDeviceStatus", "%d devices", len(request.device_ids))
+        return self._run_batch([(d, None) for d in request.device_ids], "status", self._device_status)
+
+    def batchGetPPString(self, request, context):
+        log_call("batchGetPPString", "%d devices", len(request.device_ids))
+        return self._run_batch([(d, None) for d in request.device_ids], "pp_string", self._pp_string)
+
+    def batchGetGainRange(self, request, context):
+        log_call("batchGetGainRange", "%d devices", len(request.device_ids))
+        return self._run_batch([(d, None) for d in request.device_ids], "range", self._gain_range)
+
+    def batchGetFrequencyRange(self, request, context):
+        log_call("batchGetFrequencyRange", "%d devices", len(request.device_ids))
+        return self._run_batch([(d, None) for d in request.device_ids], "range", self._frequency_range)
+
+    def _device_result(self, device_id, device, field, call, request):
+        if device is None:
+            if self.devices.discovering:
+                return rfcontrol_pb2.DeviceResult(
+                    device_id=device_id,
+                    code=grpc.StatusCode.UNAVAILABLE.value[0],
+                    details=f"Device '{device_id}' is not ready, discovery is still running",
+                )
+            return rfcontrol_pb2.DeviceResult(
+                device_id=device_id,
+                code=grpc.StatusCode.INVALID_ARGUMENT.value[0],
+                details=f"Unknown device_id '{device_id}'",
+            )
+        try:
+            response = call(device, request)
+        except Exception as e:
+            return rfcontrol_pb2.DeviceResult(
+                device_id=device_id,
+                code=grpc.StatusCode.INTERNAL.value[0],
+                details=str(e),
+            )
+        code = grpc.StatusCode.OK
+        details = ""
+        if field == "rf" and device.provisional:
+            code, details = grpc.StatusCode.UNAVAILABLE, f"Device '{device_id}' is still opening"
+        elif field == "rf" and not response.success:
+            code, details = grpc.StatusCode.INVALID_ARGUMENT, response.message
+        return rfcontrol_pb2.DeviceResult(device_id=device_id, code=code.value[0], details=details, **{field: response})
+
+    def _submit_batch(self, requests, field, call):
+        """Queue (device_id, request) pairs on their devices; returns futures in request order."""
+        jobs = []
+        for device_id, request in requests:
+            device = self.devices.get(device_id)
+            if device is None:
+                job = futures.Future()
+                job.set_result(self._device_result(device_id, None, field, call, request))
+            else:
+                try:
+                    job = device.submit(self._device_result, device_id, device, field, call, request)
+                except RuntimeError as e:
+                    # Retired by a rescan after the lookup
+                    job = futures.Future()
+                    job.set_result(rfcontrol_pb2.DeviceResult(
+                        device_id=device_id,
+                        code=grpc.StatusCode.UNAVAILABLE.value[0],
+                        details=str(e),
+                    ))
+            jobs.append(job)
+        return jobs
+
+    def _run_batch(self, requests, field, call):
+        jobs = self._submit_batch(requests, field, call)
+        return rfcontrol_pb2.BatchDeviceResponse(results=[job.result() for job in jobs])
+
+    def getDeviceQueueStats(self, request, context):
+        device_ids = list(request.device_ids) or list(self.devices)
+        stats = [self.devices[device_id].metrics() for device_id in device_ids if device_id in self.devices]
+        return rfcontrol_pb2.DeviceQueueStatsResponse(
+            devices=[rfcontrol_pb2.DeviceQueueStats(**metrics) for metrics in stats]
+        )
     
     def SendFFTCoefficients(self, request, context):
-        # Extract real and imaginary coefficients
-        real_coeffs = request.real
-        imag_coeffs = request.imag
+        # Extract real and imaginary coefficients (repeated or packed encoding)
+        try:
+            real_coeffs, imag_coeffs = request_coefficients(request)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return rfcontrol_pb2.FFTCoefficientsResponse(status="Invalid coefficients")
         
-        # Example: Print received coefficients
-        print(f"Received FFT coefficients: {len(real_coeffs)} real, {len(imag_coeffs)} imaginary")
+        log_call("SendFFTCoefficients", "Received FFT coefficients: %d real, %d imaginary", len(real_coeffs), len(imag_coeffs))
         
         # Process coefficients as needed (e.g., store, analyze)
         # For demo, just return a success status
@@ -160,48 +448,219 @@ class RFControllerServicer(rfcontrol_pb2_grpc.RFControllerServicer):
         Handle bidirectional streaming of FFT coefficients.
         Receive chunks and send back status for each chunk.
         """
+        chunk_count = 0
         for request in request_iterator:
-            chunk_id = request.chunk_id
-            real_coeffs = request.real
-            imag_coeffs = request.imag
-            is_last_chunk = request.is_last_chunk
-            
-            # Process chunk (e.g., store, analyze)
-            print(f"Received chunk {chunk_id}: {len(real_coeffs)} real, {len(imag_coeffs)} imag coefficients")
-            
-            # Send response for this chunk
-            status = f"Processed chunk {chunk_id}" + (" (last)" if is_last_chunk else "")
-            yield rfcontrol_pb2.FFTCoefficientsStreamResponse(
-                status=status,
-                chunk_id=chunk_id
-            )
+            chunk_count += 1
+            try:
+                response = self._process_fft_chunk(request)
+            except ValueError as e:
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details(f"Chunk {request.chunk_id}: {e}")
+                return
+            if self._ack_due(request.ack_every, chunk_count, request.is_last_chunk):
+                yield response
+
+    def _ack_due(self, ack_every, chunk_count, is_last):
+        # Clients that set ack_every > 1 only want every ack_every-th reply
+        return ack_every <= 1 or is_last or chunk_count % ack_every == 0
+
+    def _process_fft_chunk(self, request):
+        chunk_id = request.chunk_id
+        real_coeffs, imag_coeffs = request_coefficients(request)
+        is_last_chunk = request.is_last_chunk
+
+        # Process chunk (e.g., store, analyze)
+        log_call("StreamFFTCoefficients", "Received chunk %d: %d real, %d imag coefficients", chunk_id, len(real_coeffs), len(imag_coeffs), level=logging.DEBUG)
+
+        # Send response for this chunk
+        status = f"Processed chunk {chunk_id}" + (" (last)" if is_last_chunk else "")
+        return rfcontrol_pb2.FFTCoefficientsStreamResponse(
+            status=status,
+            chunk_id=chunk_id
+        )
     
+    def ComputeSpectrum(self, request_iterator, context):
+        context.set_compression(self.compression_policy.transport("ComputeSpectrum"))
+        compression = self.compression_policy.stream(context, "ComputeSpectrum")
+        engine = None
+        for block in request_iterator:
+            if engine is None:
+                engine = self._create_spectrum_engine(block, context)
+                if engine is None:
+                    return
+            try:
+                frames = self._spectrum_frames(engine, block)
+            except ValueError as e:
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details(str(e))
+                return
+            for frame in frames:
+                compression.apply(frame.power.data)
+                yield frame
+            if block.is_last:
+                break
+
+    def _create_spectrum_engine(self, block, context):
+        try:
+            return SpectrumEngine.from_config(block.config)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return None
+
+    def _spectrum_frames(self, engine, block):
+        outputs = engine.feed(unpack_array(block.samples)) if block.HasField("samples") else []
+        if block.is_last:
+            outputs += engine.flush()
+
+        frames = []
+        for frame_index, power, frames_averaged in outputs:
+            frame = rfcontrol_pb2.SpectrumFrame(
+                frame_index=frame_index,
+                frames_averaged=frames_averaged,
+                power=pack_array(power, "float32", self.compression_policy.codec("ComputeSpectrum")),
+            )
+            if frame_index == 0:
+                frame.frequencies.CopyFrom(pack_array(engine.frequencies))
+            frames.append(frame)
+        return frames
+
     def TransferData(self, request_iterator, context):
-        # Process incoming data chunks and send back processed chunks
+        # Process incoming data chunks and send back processed chunks,
+        # store them in a memory-mapped file when transfer_dir is set,
+        # or append them to a resumable session when chunks carry a session_id
+        context.set_compression(self.compression_policy.transport("TransferData"))
+        compression = self.compression_policy.stream(context, "TransferData")
+        sink = None
+        completed = False
         chunk_count = 0
-        for chunk in request_iterator:
-            chunk_count += 1
-            # Simulate processing: just echo back with modified data
-            processed_data = chunk.data + b"_processed"
-            logging.info(f"{chunk.data} ==Chunk: {chunk_count}==  \n\n\n\n")
-            yield rfcontrol_pb2.DataChunk(
-                data=processed_data,
+        try:
+            for chunk in request_iterator:
+                chunk_count += 1
+                try:
+                    if chunk_count == 1:
+                        sink = self._open_transfer_sink(chunk)
+                    response = self._process_data_chunk(chunk, chunk_count, sink)
+                except ValueError as e:
+                    context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+                    context.set_details(str(e))
+                    return
+                completed = chunk.is_last
+                # Echoed chunks carry data, so only stored chunks may skip their reply
+                if sink is None or self._ack_due(chunk.ack_every, chunk_count, chunk.is_last):
+                    compression.apply(response.data)
+                    yield response
+                if chunk.is_last:
+                    log_call("TransferData", "Processed %d chunks", chunk_count)
+                    break
+        finally:
+            self._close_transfer_sink(sink, completed)
+
+    def _open_transfer_sink(self, first_chunk):
+        if first_chunk.session_id:
+            if self.transfer_store is None:
+                raise ValueError("Resumable transfers need a server started with --transfer-dir")
+            return self.transfer_store.open(first_chunk.session_id)
+        if self.transfer_dir is None:
+            return None
+        # A gRPC stream keeps its order: chunks are written as they arrive and
+        # anything out of sequence fails the stream instead of piling up in memory
+        return MmapSink(os.path.join(self.transfer_dir, f"transfer-{uuid.uuid4().hex}.bin"),
+                        max_pending=0)
+
+    def _close_transfer_sink(self, sink, completed):
+        if isinstance(sink, TransferSession):
+            if completed:
+                sink.complete()
+                log.info("Session %s complete: %d bytes", sink.session_id, sink.offset)
+            else:
+                sink.close()
+                log.info("Session %s interrupted at offset %d", sink.session_id, sink.offset)
+        elif sink is not None:
+            sink.close()
+            log.info("Stored %d bytes in %s", sink.size, sink.path)
+
+    def _process_data_chunk(self, chunk, chunk_count, sink=None):
+        if isinstance(sink, TransferSession):
+            # Append to the session and acknowledge with the committed offset
+            committed = sink.write(chunk.offset, chunk.data)
+            return rfcontrol_pb2.DataChunk(
                 chunk_id=chunk.chunk_id,
-                is_last=chunk.is_last
+                is_last=chunk.is_last,
+                session_id=sink.session_id,
+                offset=committed
             )
-            if chunk.is_last:
-                logging.info(f"Processed {chunk_count} chunks")
-                break
+        if sink is not None:
+            # Store the chunk and acknowledge it without echoing the data back
+            sink.add(chunk.chunk_id, chunk.data)
+            return rfcontrol_pb2.DataChunk(chunk_id=chunk.chunk_id, is_last=chunk.is_last)
+
+        # Simulate processing: just echo back with modified data
+        processed_data = chunk.data + ECHO_SUFFIX
+        log_call("TransferData", "Chunk %d: %d bytes", chunk_count, len(chunk.data), level=logging.DEBUG)
+        return rfcontrol_pb2.DataChunk(
+            data=processed_data,
+            chunk_id=chunk.chunk_id,
+            is_last=chunk.is_last
+        )
+
+    def GetTransferStatus(self, request, context):
+        if self.transfer_store is None:
+            context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+            context.set_details("Resumable transfers need a server started with --transfer-dir")
+            return rfcontrol_pb2.TransferStatusResponse()
+        try:
+            committed_offset, complete = self.transfer_store.status(request.session_id)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return rfcontrol_pb2.TransferStatusResponse()
+        return rfcontrol_pb2.TransferStatusResponse(
+            session_id=request.session_id,
+            committed_offset=committed_offset,
+            complete=complete
+        )
     
+    def FanOutCommand(self, request, context):
+        # Node calls are gRPC futures, but this stream still holds a worker thread
+        # while it waits for them, like every streaming call of the thread pool
+        # server; use --async to serve fan-outs without one
+        fan = self._fan_out(request, context)
+        if fan is None:
+            return
+        # Stop waiting for the other nodes when the client goes away
+        context.add_callback(fan.cancel)
+        for result in fan:
+            yield self._fan_out_result(result)
+
+    def _fan_out(self, request, context):
+        nodes = list(request.nodes) or ["flexsdr"]
+        log_call("FanOutCommand", "%s to %s (%s)", request.command, nodes, request.mode or "all")
+        try:
+            return self.upstreams.fan_out(
+                nodes, "runCustomCmd", {"customCmdName": request.command},
+                mode=request.mode or "all", count=request.count or 1, timeout=request.timeout or None
+            )
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return None
+
+    def _fan_out_result(self, result):
+        return rfcontrol_pb2.FanOutResult(
+            node=result.name,
+            target=result.target,
+            code=result.code.value[0],
+            details=result.details,
+            message=result.response.get("message", "") if result.ok else "",
+            elapsed_ms=result.elapsed * 1e3
+        )
+
     # Function to invoke Server B's SayHello method
     def invoke_server_b(self, name, context):
-        ##flexSDRGRPCServer = "192.168.137.232:5555"
-        flexSDRGRPCServer = "localhost:2222"
-        
-        with GrpcClient(flexSDRGRPCServer, "RFController", "rfcontrol.RFController.runCustomCmd") as client:
-            resp = client.invoke(data={"CustomRequest": "pwd"}, header={"auth": "testcall"})
-            print(resp)
-            exit()
+        resp = self.upstreams.invoke("server_b", "runCustomCmd", {"CustomRequest": "pwd"}, header={"auth": "testcall"})
+        log.info("Server B response: %s", resp)
+        exit()
 
         ##with grpc.insecure_channel(flexSDRGRPCServer) as channel:
         ##    stub = rfcontrol_pb2_grpc.RFControllerStub(channel)
@@ -212,27 +671,14 @@ class RFControllerServicer(rfcontrol_pb2_grpc.RFControllerServicer):
 
     # Function to invoke Server B's method
     def callFlexSDR(self, name, context):
-        
-        ## Server's FQDN Need to take later from the Config file 
-        flexSDRGRPCServer = "192.168.137.232:5555"
-
-        # Initialize GrpcInvoker
-        invoker = GrpcInvoker(flexSDRGRPCServer)
-    
+        # The FlexSDR address comes from the upstream config (--upstreams)
         # Invoke runCustomCmd method
         #request = rfcontrol_pb2.CustomRequest(customCmdName=device_id)
-        flexsdr_response = invoker.invoke(
-            service='rfcontrol.RFController',
-            method='runCustomCmd',
-            request={'customCmdName': 'pwd'}
-        )
-        print(f"Greet response: {flexsdr_response['message']}")
+        flexsdr_response = self.upstreams.invoke("flexsdr", "runCustomCmd", {'customCmdName': 'pwd'})
+        log_call("GetDeviceInformation", "Greet response: %s", flexsdr_response.get("message"))
 
     
-def serve(port=5555):
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
-    rfcontrol_pb2_grpc.add_RFControllerServicer_to_server(RFControllerServicer(), server)
- 
+def enable_reflection(server):
     ## gRPC Server Reflection Start ##
     ## Replace with your actual service name
     SERVICE_NAMES = (
@@ -243,11 +689,20 @@ def serve(port=5555):
     reflection.enable_server_reflection(SERVICE_NAMES, server)
     ## Refelction Done ##
 
+def create_server(port=5555, max_workers=4, servicer=None, **options):
+    # options are passed to RFControllerServicer (transfer_dir, compression_policy, ...)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    servicer = servicer or RFControllerServicer(**options)
+    rfcontrol_pb2_grpc.add_RFControllerServicer_to_server(servicer, server)
+    enable_reflection(server)
     server.add_insecure_port(f'[::]:{port}')
+    return server
+
+def serve(port=5555, max_workers=4, **options):
+    setup_logging()
+    server = create_server(port, max_workers, **options)
     server.start()
-    print(f"Server started on port {port}")
-    logging.basicConfig(level=logging.INFO)
-    logging.info(f"Server starting on port: {port}")
+    log.info("Server started on port %d", port)
 
     try:
         while True:
@@ -255,8 +710,46 @@ def serve(port=5555):
     except KeyboardInterrupt:
         server.stop(0)
 
+def add_servicer_arguments(parser):
+    """Command line options shared by server.py and async_server.py."""
+    parser.add_argument('--transfer-dir', default=None, help='Store TransferData uploads as files in this directory instead of echoing them')
+    parser.add_argument('--compression', default=None, help='JSON file with per-method compression rules (see compression.py)')
+    parser.add_argument('--status-poll', type=float, default=1.0, help='Seconds between device status polls while WatchDeviceStatus streams are open')
+    parser.add_argument('--device-wait', type=float, default=5.0, help='Seconds a request waits for a device that is still opening (0 fails fast)')
+    parser.add_argument('--mock-devices', type=int, default=1, help='Number of mock devices (mock, mock1, ...)')
+    parser.add_argument('--mock-open-delay', type=float, default=0.0, help='Seconds each mock device takes to open')
+    parser.add_argument('--snapshot', default=None, help='JSON file to persist discovered devices and their last settings for warm restarts')
+    parser.add_argument('--reapply-settings', action='store_true', help='Apply the last known frequency and gain from the snapshot when a device reopens')
+    parser.add_argument('--upstreams', default=None, help='JSON file with upstream servers (FlexSDR address, timeouts, keepalive; see upstream.py)')
+    parser.add_argument('--rescan', type=float, default=10.0, help='Seconds between scans for added or removed devices (0 disables)')
+
+def servicer_options(args):
+    return dict(
+        transfer_dir=args.transfer_dir,
+        compression_policy=CompressionPolicy.load(args.compression) if args.compression else None,
+        status_poll=args.status_poll,
+        device_wait=args.device_wait,
+        mock_devices=args.mock_devices,
+        mock_open_delay=args.mock_open_delay,
+        rescan_interval=args.rescan,
+        snapshot_path=args.snapshot,
+        reapply_settings=args.reapply_settings,
+        upstreams=UpstreamPool.load(args.upstreams) if args.upstreams else None,
+    )
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='RF Control gRPC Server')
     parser.add_argument('-p', '--port', type=int, default=5555, help='Port to run the gRPC server on')
+    parser.add_argument('--async', dest='use_async', action='store_true', help='Serve on grpc.aio (asyncio) instead of a thread pool')
+    parser.add_argument('-w', '--workers', type=int, default=4, help='Worker threads (thread pool server) or device executor size (--async)')
+    add_servicer_arguments(parser)
+    add_logging_arguments(parser)
     args = parser.parse_args()
-    serve(port=args.port)
+    setup_logging_from_args(args)
+    options = servicer_options(args)
+    if args.use_async:
+        import asyncio
+        from async_server import serve_async
+        asyncio.run(serve_async(port=args.port, max_workers=args.workers, **options))
+    else:
+        serve(port=args.port, max_workers=args.workers, **options)
@@ -0,0 +1,69 @@
+import numpy as np
+
+from fft_calculator import StreamingSTFT, WelchAverager
+
+
+class SpectrumEngine:
+    """
+    Server-side spectrum computation for one ComputeSpectrum stream.
+
+    Samples are fed in blocks of any size and framed by a StreamingSTFT.
+    The power of the selected bins is averaged over `averaging` frames.
+    """
+    def __init__(self, fft_size=1024, window="hann", overlap=0.0, averaging=1,
+                 sampling_rate=1.0, bin_start=0, bin_stop=0, bins=None):
+        self.stft = StreamingSTFT(fft_size, overlap, window, sampling_rate)
+        self.averager = WelchAverager(averaging)
+        self.bin_start = bin_start
+        self.bin_stop = bin_stop
+        self.bins = list(bins) if bins else None
+        self.selection = None
+        self.frequencies = None
+
+    @classmethod
+    def from_config(cls, config):
+        """Build an engine from a SpectrumConfig message, applying defaults for unset fields."""
+        return cls(
+            fft_size=config.fft_size or 1024,
+            window=config.window or "hann",
+            overlap=config.overlap,
+            averaging=config.averaging or 1,
+            sampling_rate=config.sampling_rate or 1.0,
+            bin_start=config.bin_start,
+            bin_stop=config.bin_stop,
+            bins=config.bins,
+        )
+
+    def _select_bins(self):
+        n_bins = len(self.stft.frequencies)
+        if self.bins is not None:
+            selection = np.asarray(self.bins)
+            if selection.min() < 0 or selection.max() >= n_bins:
+                raise ValueError(f"bins must be in [0, {n_bins})")
+        else:
+            stop = self.bin_stop or n_bins
+            if not 0 <= self.bin_start < stop <= n_bins:
+                raise ValueError(f"Invalid bin range [{self.bin_start}, {stop}) for {n_bins} bins")
+            selection = slice(self.bin_start, stop)
+        self.selection = selection
+        self.frequencies = self.stft.frequencies[selection]
+
+    def feed(self, samples):
+        """
+        Add a block of samples.
+
+        Args:
+            samples (np.ndarray): Real or complex (IQ) samples
+
+        Returns:
+            list: (frame_index, averaged power, frames averaged) for every completed average
+        """
+        spectra = self.stft.process(samples)
+        if self.selection is None:
+            self._select_bins()
+        selected = spectra[:, self.selection]
+        return self.averager.add(selected.real ** 2 + selected.imag ** 2)
+
+    def flush(self):
+        """Emit a partial average for frames left over at the end of the stream."""
+        return self.averager.flush()
@@ -0,0 +1,155 @@
+import threading
+import time
+from concurrent import futures
+
+from rpc_log import log
+
+
+def _state(status):
+    # Fields a watcher is notified about
+    return (status["frequency"], status["gain"], status["ref_locked"], status["lo_locked"])
+
+
+class StatusHub:
+    """
+    Shared device status for WatchDeviceStatus subscribers.
+
+    One background thread polls every device while at least one subscriber
+    is registered, however many streams are watching. Devices are read in
+    parallel on their actors; a device that does not answer within
+    poll_timeout is skipped, and not asked again until its pending read
+    finishes, so a hung device only stops its own updates. A device's snapshot
+    only gets a new version when frequency, gain or lock state changes;
+    subscribers are then woken through their callback and read the latest
+    snapshots, so updates between two reads are coalesced.
+
+    usage:
+    hub = StatusHub(servicer.devices)
+    hub.subscribe(event.set)
+    updates = hub.changed(["mock"], seen)
+    """
+    def __init__(self, devices, poll_interval=1.0, poll_timeout=5.0):
+        self.devices = devices
+        self.poll_interval = poll_interval
+        self.poll_timeout = poll_timeout
+        self._snapshots = {}
+        # device_id -> status read still queued or running on the device's actor
+        self._reads = {}
+        self._version = 0
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def active(self):
+        return bool(self._subscribers)
+
+    def subscribe(self, callback):
+        """Register a callback run (on the poller or a request thread) after any snapshot changes."""
+        with self._lock:
+            self._subscribers.append(callback)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._poll_loop, name="status-hub", daemon=True)
+                self._thread.start()
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def update(self, device_id, status):
+        """Store a status read elsewhere; returns True if it changed the snapshot."""
+        with self._lock:
+            current = self._snapshots.get(device_id)
+            if current is not None and _state(current[1]) == _state(status):
+                return False
+            self._version += 1
+            self._snapshots[device_id] = (self._version, status)
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback()
+        return True
+
+    def refresh(self, device_id):
+        device = self.devices.get(device_id)
+        if device is None:
+            return False
+        return self.update(device_id, device.get_status())
+
+    def forget(self, device_id):
+        """Drop the snapshot of a removed device."""
+        with self._lock:
+            self._snapshots.pop(device_id, None)
+
+    def notify(self, device_id):
+        """Refresh a device right after a command changed it, if anyone is watching."""
+        if self.active:
+            try:
+                self.refresh(device_id)
+            except Exception as e:
+                log.warning("Status refresh of %s failed: %s", device_id, e, extra={"device_id": device_id})
+
+    def changed(self, device_ids, seen):
+        """
+        Latest snapshots newer than seen.
+
+        Args:
+            device_ids (list): Devices to check
+            seen (dict): device_id -> last version sent, updated in place
+
+        Returns:
+            list: (device_id, version, status) for every device with a newer snapshot
+        """
+        updates = []
+        with self._lock:
+            for device_id in device_ids:
+                snapshot = self._snapshots.get(device_id)
+                if snapshot is not None and snapshot[0] > seen.get(device_id, 0):
+                    updates.append((device_id, snapshot[0], snapshot[1]))
+                    seen[device_id] = snapshot[0]
+        return updates
+
+    def poll(self):
+        reads = {}
+        for device_id, device in list(self.devices.items()):
+            previous = self._reads.get(device_id)
+            if previous is not None and not previous.done():
+                continue
+            try:
+                future = device.submit(device.get_status)
+            except RuntimeError:
+                # Removed since the list was taken
+                continue
+            self._reads[device_id] = future
+            reads[future] = device_id
+        done, not_done = futures.wait(reads, timeout=self.poll_timeout)
+        for future in done:
+            device_id = reads[future]
+            try:
+                self.update(device_id, future.result())
+            except Exception as e:
+                log.warning("Status poll of %s failed: %s", device_id, e, extra={"device_id": device_id})
+        for future in not_done:
+            log.warning("Status poll of %s got no answer within %.1f s", reads[future], self.poll_timeout,
+                        extra={"device_id": reads[future]})
+        for device_id in set(self._reads) - set(self.devices):
+            del self._reads[device_id]
+
+    def _poll_loop(self):
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            self.poll()
+            time.sleep(self.poll_interval)
+
+
+def watch_delay(last_sent, min_interval, coalesce, now=None):
+    """
+    Seconds a watcher should wait after noticing a change before sending it:
+    at least coalesce, to merge quick successive updates, and long enough to
+    keep min_interval between two sends.
+    """
+    now = time.monotonic() if now is None else now
+    return max(coalesce, last_sent + min_interval - now, 0.0)
@@ -0,0 +1,64 @@
+import threading
+
+from capability_cache import CapabilityCache
+from mock_device import MockDevice
+
+
+class CountingDevice(MockDevice):
+    def __init__(self):
+        super().__init__()
+        self.queries = 0
+
+    def get_pp_string(self):
+        self.queries += 1
+        return super().get_pp_string()
+
+
+def test_values_are_queried_once():
+    cache, device = CapabilityCache(), CountingDevice()
+    cache.fill(device)
+    assert cache.get(device, "pp_string") == device.get_pp_string()
+    assert device.queries == 2
+    assert cache.get(device, "gain_range") == (1, 30)
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+def test_invalidate_one_entry():
+    cache, device = CapabilityCache(), MockDevice()
+    cache.fill(device)
+    device.set_gain(20)
+    cache.invalidate(device, "pp_string")
+    assert "Gain: 20 dB" in cache.get(device, "pp_string")
+    assert cache.has(device, "gain_range")
+
+
+def test_devices_are_cached_separately():
+    cache = CapabilityCache()
+    old, new = MockDevice("a"), MockDevice("a", frequency=2e6)
+    cache.fill(old)
+    cache.invalidate(old)
+    assert not cache.has(old, "pp_string")
+    assert "2000000.0" in cache.get(new, "pp_string")
+
+
+def test_value_read_before_an_invalidate_is_not_cached():
+    cache, device = CapabilityCache(), MockDevice()
+    reading, release = threading.Event(), threading.Event()
+
+    class SlowDevice(MockDevice):
+        def get_pp_string(self):
+            text = device.get_pp_string()
+            reading.set()
+            release.wait(5.0)
+            return text
+
+    slow = SlowDevice()
+    result = []
+    reader = threading.Thread(target=lambda: result.append(cache.get(slow, "pp_string")))
+    reader.start()
+    reading.wait(5.0)
+    # A setting changes while the old string is being read
+    cache.invalidate(slow, "pp_string")
+    release.set()
+    reader.join()
+    assert result and not cache.has(slow, "pp_string")
@@ -0,0 +1,78 @@
+import os
+
+import grpc
+import pytest
+
+from compression import (CODECS, CompressionPolicy, CompressionRule, compress_payload,
+                         decompress_payload, sampled_ratio)
+
+
+class FakeContext:
+    def __init__(self):
+        self.disabled = 0
+
+    def disable_next_message_compression(self):
+        self.disabled += 1
+
+
+def test_sampled_ratio():
+    assert sampled_ratio(b"ABC XYZ " * 100_000) < 0.1
+    assert sampled_ratio(os.urandom(1_000_000)) > 0.95
+    assert sampled_ratio(b"") == 1.0
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+def test_codec_round_trip(codec):
+    data = b"ABC XYZ " * 10_000
+    payload, used = compress_payload(data, codec)
+    assert used == codec and len(payload) < len(data)
+    assert decompress_payload(payload, used, len(data)) == data
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+def test_decompress_stops_at_declared_size(codec):
+    payload, _ = compress_payload(b"\0" * 100_000, codec)
+    with pytest.raises(ValueError):
+        decompress_payload(payload, codec, 1000)
+
+
+def test_incompressible_payload_is_sent_raw():
+    data = os.urandom(100_000)
+    assert compress_payload(data, "zlib") == (data, "")
+
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError):
+        CompressionRule(codec="zsdt")
+    with pytest.raises(ValueError):
+        decompress_payload(b"", "zsdt", 0)
+
+
+def test_transfer_data_is_uncompressed_by_default():
+    policy = CompressionPolicy()
+    assert policy.transport("TransferData") == grpc.Compression.NoCompression
+    assert policy.transport("ComputeSpectrum") == grpc.Compression.Gzip
+
+
+def test_stream_samples_only_the_first_messages(monkeypatch):
+    import compression
+    calls = []
+
+    def ratio(payload):
+        calls.append(len(payload))
+        return 1.0
+
+    monkeypatch.setattr(compression, "sampled_ratio", ratio)
+    context = FakeContext()
+    stream = CompressionPolicy().stream(context, "ComputeSpectrum")
+    for _ in range(10):
+        stream.apply(b"x" * 8192)
+    assert len(calls) == 2
+    assert context.disabled == 10
+
+
+def test_stream_never_compresses_small_messages():
+    context = FakeContext()
+    stream = CompressionPolicy().stream(context, "ComputeSpectrum")
+    stream.apply(b"x" * 10)
+    assert context.disabled == 1
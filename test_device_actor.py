@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from device_actor import DeviceActor
+from mock_device import MockDevice
+
+
+def test_device_methods_run_on_the_actor():
+    actor = DeviceActor("mock", MockDevice())
+    assert actor.set_gain(20) == (True, "Gain set successfully")
+    assert actor.get_status()["gain"] == 20
+    assert actor.device_id == "mock"
+    actor.close()
+
+
+def test_commands_run_one_at_a_time_in_order():
+    actor = DeviceActor("mock", MockDevice())
+    order = []
+    jobs = [actor.submit(order.append, i) for i in range(100)]
+    for job in jobs:
+        job.result(5.0)
+    assert order == list(range(100))
+    assert actor.metrics()["completed"] == 100
+    actor.close()
+
+
+def test_calls_from_the_actor_thread_run_inline():
+    actor = DeviceActor("mock", MockDevice())
+
+    def configure():
+        # Would deadlock if queued behind this command
+        actor.set_center_frequency(2e6)
+        return actor.get_center_frequency()
+
+    assert actor.call(configure, timeout=5.0) == 2e6
+    actor.close()
+
+
+def test_exceptions_reach_the_caller():
+    actor = DeviceActor("mock", MockDevice())
+    with pytest.raises(ZeroDivisionError):
+        actor.call(lambda: 1 / 0, timeout=5.0)
+    actor.close()
+
+
+def test_closed_actor_finishes_queued_commands_and_refuses_new_ones():
+    actor = DeviceActor("mock", MockDevice())
+    release = threading.Event()
+    actor.submit(release.wait, 5.0)
+    queued = actor.submit(lambda: "done")
+    actor.close(wait=False)
+    with pytest.raises(RuntimeError):
+        actor.submit(lambda: None)
+    release.set()
+    assert queued.result(5.0) == "done"
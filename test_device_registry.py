@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+
+from device_registry import DeviceRegistry
+from mock_device import MockDevice
+
+
+def scan_of(*device_ids):
+    return lambda: [(f"mock:{d}", lambda d=d: (d, MockDevice(d))) for d in device_ids]
+
+
+def test_rescan_adds_and_retires_devices():
+    registry = DeviceRegistry()
+    added, removed = registry.rescan(scan_of("a", "b"))
+    assert sorted(added) == ["a", "b"] and removed == []
+    added, removed = registry.rescan(scan_of("a"))
+    assert added == [] and removed == ["b"]
+    assert "b" not in registry
+
+
+def test_retired_actor_refuses_commands():
+    registry = DeviceRegistry()
+    registry.rescan(scan_of("a"))
+    actor = registry.get("a")
+    registry.rescan(scan_of())
+    with pytest.raises(RuntimeError):
+        actor.get_status()
+
+
+def test_retire_does_not_wait_for_a_hung_device():
+    registry = DeviceRegistry()
+    registry.rescan(scan_of("a"))
+    release = threading.Event()
+    registry.get("a").submit(release.wait, 5.0)
+
+    started = time.perf_counter()
+    registry.rescan(scan_of())
+    assert time.perf_counter() - started < 1.0
+    release.set()
+
+
+def test_discovery_opens_devices_concurrently():
+    registry = DeviceRegistry(open_workers=4)
+
+    def slow_open(device_id):
+        time.sleep(0.2)
+        return device_id, MockDevice(device_id)
+
+    started = time.perf_counter()
+    registry.discover(lambda: [(f"mock:{d}", lambda d=d: slow_open(d)) for d in "abcd"])
+    assert registry.wait_for("d", timeout=5.0) is not None
+    assert time.perf_counter() - started < 0.6
+    assert registry.wait_for("missing", timeout=5.0) is None
+    assert not registry.discovering
+
+
+def test_a_failing_device_does_not_stop_the_others():
+    registry = DeviceRegistry()
+
+    def broken():
+        raise OSError("no answer")
+
+    added, _ = registry.rescan(lambda: [("mock:bad", broken), ("mock:a", lambda: ("a", MockDevice("a")))])
+    assert added == ["a"]
+
+
+def test_failed_scan_retires_nothing():
+    registry = DeviceRegistry()
+    registry.rescan(scan_of("a"))
+
+    def failing():
+        raise OSError("bus error")
+
+    assert registry.rescan(failing) == ([], [])
+    assert "a" in registry
+
+
+def test_provisional_device_is_replaced_when_opened():
+    registry = DeviceRegistry()
+    stand_in = registry.register("a", MockDevice("a"), "mock:a", provisional=True)
+    assert "a" in registry and not registry.ready("a")
+    registry.rescan(scan_of("a"))
+    assert registry.ready("a") and registry.get("a") is not stand_in
+    assert stand_in.closed
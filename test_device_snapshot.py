@@ -0,0 +1,50 @@
+from device_snapshot import DeviceSnapshot, SnapshotDevice
+from mock_device import MockDevice
+
+
+def capabilities_of(device):
+    return {"gain_range": device.get_rx_gain_range(), "freq_range": device.get_rx_freq_range(),
+            "pp_string": device.get_pp_string()}
+
+
+def test_restored_device_answers_from_the_snapshot(tmp_path):
+    path = str(tmp_path / "devices.json")
+    device = MockDevice("a")
+    snapshot = DeviceSnapshot(path)
+    snapshot.record_device("a", "mock:a", capabilities_of(device), device.get_status())
+    snapshot.flush()
+
+    restored = SnapshotDevice("a", DeviceSnapshot(path).devices["a"])
+    assert restored.get_status() == device.get_status()
+    assert restored.get_rx_gain_range() == device.get_rx_gain_range()
+    assert restored.set_gain(5)[0] is False
+
+
+def test_recorded_status_keeps_pp_string_in_step(tmp_path):
+    path = str(tmp_path / "devices.json")
+    device = MockDevice("a")
+    snapshot = DeviceSnapshot(path)
+    snapshot.record_device("a", "mock:a", capabilities_of(device), device.get_status())
+    device.set_center_frequency(2e6)
+    snapshot.record_status("a", device.get_status(), device.get_pp_string())
+    snapshot.flush()
+
+    restored = SnapshotDevice("a", DeviceSnapshot(path).devices["a"])
+    assert restored.get_status()["frequency"] == 2e6
+    assert restored.get_pp_string() == device.get_pp_string()
+
+
+def test_unknown_and_forgotten_devices(tmp_path):
+    snapshot = DeviceSnapshot(str(tmp_path / "devices.json"))
+    snapshot.record_status("a", MockDevice("a").get_status(), "")
+    assert "a" not in snapshot.devices
+    snapshot.record_device("a", "mock:a", capabilities_of(MockDevice("a")), MockDevice("a").get_status())
+    snapshot.forget("a")
+    snapshot.flush()
+    assert DeviceSnapshot(str(tmp_path / "devices.json")).devices == {}
+
+
+def test_unreadable_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "devices.json"
+    path.write_text("{not json")
+    assert DeviceSnapshot(str(path)).devices == {}
@@ -0,0 +1,94 @@
+import asyncio
+
+import grpc
+import pytest
+
+from fan_out import FanOut, NodeResult
+
+
+class FakeCall:
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def ok(name):
+    return NodeResult(name, f"{name}:5555", {"message": name})
+
+
+def failed(name, error=None):
+    return NodeResult(name, f"{name}:5555", error=error or OSError("down"))
+
+
+def test_all_waits_for_every_node_even_after_failures():
+    fan = FanOut(["a", "b", "c"], "all")
+    fan.deliver(failed("a"))
+    fan.deliver(failed("b"))
+    assert not fan.done
+    fan.deliver(ok("c"))
+    assert fan.done
+    assert [r.name for r in fan] == ["a", "b", "c"]
+
+
+def test_first_stops_after_count_answers_and_cancels_the_rest():
+    fan = FanOut(["a", "b", "c"], "first", count=1)
+    slow = FakeCall()
+    fan.add_call(slow)
+    fan.deliver(ok("b"))
+    assert fan.done and slow.cancelled
+    fan.deliver(ok("a"))
+    assert [r.name for r in fan] == ["b"]
+
+
+def test_quorum_needs_a_majority():
+    fan = FanOut(["a", "b", "c", "d"], "quorum")
+    assert fan.needed == 3
+    fan.deliver(ok("a"))
+    fan.deliver(ok("b"))
+    assert not fan.done
+    fan.deliver(ok("c"))
+    assert fan.done
+
+
+def test_quorum_gives_up_when_a_majority_is_out_of_reach():
+    fan = FanOut(["a", "b", "c"], "quorum")
+    fan.deliver(failed("a"))
+    assert not fan.done
+    fan.deliver(failed("b"))
+    assert fan.done
+
+
+def test_call_added_after_done_is_cancelled():
+    fan = FanOut(["a"], "all")
+    fan.deliver(ok("a"))
+    late = FakeCall()
+    fan.add_call(late)
+    assert late.cancelled
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        FanOut(["a"], "most")
+    with pytest.raises(ValueError):
+        FanOut([], "all")
+
+
+def test_result_codes():
+    assert ok("a").code == grpc.StatusCode.OK
+    assert failed("a").code == grpc.StatusCode.UNAVAILABLE
+    assert failed("a", ValueError("bad")).code == grpc.StatusCode.INVALID_ARGUMENT
+    assert failed("a", TimeoutError("late")).code == grpc.StatusCode.DEADLINE_EXCEEDED
+
+
+def test_async_iteration():
+    fan = FanOut(["a", "b"], "all")
+
+    async def collect():
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.01, fan.deliver, ok("a"))
+        loop.call_later(0.02, fan.deliver, ok("b"))
+        return [result.name async for result in fan]
+
+    assert asyncio.run(collect()) == ["a", "b"]
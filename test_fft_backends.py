@@ -0,0 +1,43 @@
+import json
+
+import numpy as np
+import pytest
+
+import fft_backends
+from fft_backends import BACKENDS, get_backend, load_backend_choice, select_backend, set_backend
+
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    backend = get_backend()
+    yield
+    fft_backends._backend = backend
+
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+def test_backends_agree_with_numpy(name):
+    signal = np.random.default_rng(0).standard_normal((3, 256))
+    backend = set_backend(name)
+    np.testing.assert_allclose(backend.rfft(signal), np.fft.rfft(signal), atol=1e-9)
+    np.testing.assert_allclose(backend.fft(signal + 1j), np.fft.fft(signal + 1j), atol=1e-9)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        set_backend("cufft")
+
+
+def test_select_stores_and_load_restores_the_choice(tmp_path):
+    path = tmp_path / "fft_backend.json"
+    name, timings = select_backend([64, 256], repeats=2, path=str(path))
+    assert set(timings) == set(BACKENDS) and json.loads(path.read_text())["backend"] == name
+    set_backend("numpy")
+    assert load_backend_choice(str(path)).name == name
+
+
+def test_missing_or_unknown_choice_keeps_the_backend(tmp_path):
+    set_backend("numpy")
+    assert load_backend_choice(str(tmp_path / "missing.json")).name == "numpy"
+    path = tmp_path / "fft_backend.json"
+    path.write_text(json.dumps({"backend": "gone"}))
+    assert load_backend_choice(str(path)).name == "numpy"
@@ -0,0 +1,105 @@
+import threading
+
+import numpy as np
+import pytest
+
+from fft_calculator import (BATCH_THREADS, StreamingSTFT, WelchAverager, calculate_fft, calculate_fft_batch,
+                            frequency_axis, get_window, stft_stream, welch_stream)
+
+
+@pytest.mark.parametrize("n", [1024, 1001])
+def test_real_signal_matches_full_fft(n):
+    signal = np.random.default_rng(0).standard_normal(n)
+    frequencies, real, imag = calculate_fft(signal, sampling_rate=1000.0)
+    expected = np.fft.fft(signal)[:n // 2]
+    np.testing.assert_allclose(real, expected.real, atol=1e-9)
+    np.testing.assert_allclose(imag, expected.imag, atol=1e-9)
+    np.testing.assert_allclose(frequencies, np.fft.fftfreq(n, d=1 / 1000.0)[:n // 2])
+
+
+def test_complex_signal_uses_full_fft():
+    signal = np.exp(2j * np.pi * 0.1 * np.arange(256))
+    _, real, imag = calculate_fft(signal)
+    expected = np.fft.fft(signal)[:128]
+    np.testing.assert_allclose(real + 1j * imag, expected, atol=1e-9)
+
+
+def test_window_is_applied():
+    signal = np.ones(64)
+    _, real, _ = calculate_fft(signal, window="hann")
+    assert real[0] == pytest.approx(np.hanning(64).sum())
+
+
+def test_cached_arrays_are_shared_and_read_only():
+    assert frequency_axis(128, 10.0) is frequency_axis(128, 10.0)
+    assert not get_window("hann", 128).flags.writeable
+    with pytest.raises(ValueError):
+        get_window("kaiser", 128)
+
+
+@pytest.mark.parametrize("workers", [1, 3, 64])
+def test_batch_matches_single_channel(workers):
+    signals = np.random.default_rng(1).standard_normal((8, 512))
+    _, real, imag = calculate_fft_batch(signals, workers=workers)
+    for row, signal in enumerate(signals):
+        _, expected_real, expected_imag = calculate_fft(signal)
+        np.testing.assert_allclose(real[row], expected_real, atol=1e-9)
+        np.testing.assert_allclose(imag[row], expected_imag, atol=1e-9)
+
+
+def test_batch_calls_share_one_bounded_pool():
+    signals = np.zeros((16, 64))
+    for workers in range(2, 10):
+        calculate_fft_batch(signals, workers=workers)
+    fft_threads = [t for t in threading.enumerate() if t.name.startswith("fft")]
+    assert len(fft_threads) <= BATCH_THREADS
+
+
+def test_batch_rejects_1d_input():
+    with pytest.raises(ValueError):
+        calculate_fft_batch(np.zeros(64))
+
+
+def test_streaming_stft_frames_span_blocks():
+    signal = np.random.default_rng(2).standard_normal(1000)
+    stft = StreamingSTFT(fft_size=128, overlap=0.5, window="rect")
+    spectra = np.concatenate([stft.process(block) for block in np.array_split(signal, 9)])
+    assert stft.frames_processed == len(spectra) == (1000 - 128) // 64 + 1
+    np.testing.assert_allclose(spectra[3], np.fft.rfft(signal[192:320]), atol=1e-9)
+
+
+def test_streaming_stft_complex_input_is_two_sided():
+    stft = StreamingSTFT(fft_size=64, overlap=0.0, window="rect")
+    spectra = stft.process(np.exp(2j * np.pi * 0.25 * np.arange(64)))
+    assert spectra.shape == (1, 64)
+    assert stft.frequencies[np.argmax(np.abs(spectra[0]))] == pytest.approx(0.25)
+
+
+@pytest.mark.parametrize("options", [{"fft_size": 1}, {"overlap": 1.0}, {"sampling_rate": 0}])
+def test_streaming_stft_rejects_bad_options(options):
+    with pytest.raises(ValueError):
+        StreamingSTFT(**options)
+
+
+def test_stft_stream_flags_only_the_last_frame():
+    frames = list(stft_stream([np.zeros(100), np.zeros(100)], fft_size=64, overlap=0.5))
+    assert [f[0] for f in frames] == list(range(len(frames)))
+    assert [f[3] for f in frames] == [False] * (len(frames) - 1) + [True]
+
+
+def test_welch_stream_matches_white_noise_density():
+    rng = np.random.default_rng(3)
+    blocks = [rng.standard_normal(4096) for _ in range(16)]
+    *_, (frequencies, psd, count) = welch_stream(blocks, fft_size=256, sampling_rate=2.0)
+    # Unit-variance white noise: one-sided density 2 / sampling_rate = 1
+    assert np.median(psd[1:-1]) == pytest.approx(1.0, rel=0.1)
+    assert frequencies[-1] == pytest.approx(1.0)
+
+
+def test_welch_averager_counts():
+    averager = WelchAverager(averaging=3)
+    outputs = averager.add(np.ones((7, 4)))
+    assert [count for _, _, count in outputs] == [3, 3]
+    assert [count for _, _, count in averager.flush()] == [1]
+    with pytest.raises(ValueError):
+        WelchAverager(averaging=0)
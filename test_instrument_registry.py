@@ -0,0 +1,68 @@
+import pytest
+
+from instrument_registry import InstrumentRegistry
+from mock_instrument import MockInstrument
+from visa_wrapper import VisaWrapper
+
+
+class Factory:
+    """Sessions on mock instruments that stay reachable from the test."""
+    def __init__(self):
+        self.instruments = {}
+
+    def __call__(self, device_id):
+        instrument = MockInstrument(device_id)
+        self.instruments.setdefault(device_id, []).append(instrument)
+        return VisaWrapper(device_id, instrument=instrument)
+
+
+def test_identity_is_read_once_per_session():
+    factory = Factory()
+    registry = InstrumentRegistry(factory)
+    identity = registry.identity("sa1")
+    assert identity["manufacturer"] == "XRComm"
+    assert registry.identity("sa1") is identity
+    assert factory.instruments["sa1"][0].writes == 1
+    registry.identity("sa1", refresh=True)
+    assert factory.instruments["sa1"][0].writes == 2
+
+
+def test_sessions_are_reused():
+    factory = Factory()
+    registry = InstrumentRegistry(factory)
+    registry.error_queue("sa1")
+    registry.execute("sa1", ["FREQ?"])
+    assert len(factory.instruments["sa1"]) == 1
+
+
+def test_least_recently_used_session_is_closed():
+    factory = Factory()
+    registry = InstrumentRegistry(factory, max_sessions=2)
+    for device_id in ["a", "b", "a", "c"]:
+        registry.execute(device_id, ["*OPC?"])
+    registry.execute("b", ["*OPC?"])
+    assert len(factory.instruments["a"]) == 1 and len(factory.instruments["b"]) == 2
+
+
+def test_idle_sessions_are_closed():
+    factory = Factory()
+    registry = InstrumentRegistry(factory, idle_timeout=0.0)
+    registry.execute("a", ["*OPC?"])
+    registry.execute("b", ["*OPC?"])
+    registry.execute("a", ["*OPC?"])
+    assert len(factory.instruments["a"]) == 2
+
+
+def test_failed_query_reconnects_on_next_use():
+    factory = Factory()
+    registry = InstrumentRegistry(factory)
+    identity = registry.identity("sa1")
+
+    def timeout():
+        raise TimeoutError("no reply")
+
+    factory.instruments["sa1"][0].read = timeout
+    with pytest.raises(TimeoutError):
+        registry.error_queue("sa1")
+    assert registry.identity("sa1") is not identity
+    assert len(factory.instruments["sa1"]) == 2
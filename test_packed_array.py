@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from packed_array import PackedArray, pack_array, pack_coefficients, unpack_array, unpack_coefficients
+
+
+@pytest.mark.parametrize("dtype", ["float64", "float32", "complex64"])
+def test_array_round_trip(dtype):
+    array = (np.arange(12) * (1 + 1j if dtype == "complex64" else 1)).reshape(3, 4)
+    unpacked = unpack_array(pack_array(array, dtype))
+    assert unpacked.shape == (3, 4)
+    np.testing.assert_array_equal(unpacked, array.astype(dtype))
+
+
+def test_compressed_round_trip():
+    array = np.zeros(10_000)
+    packed = pack_array(array, "float64", codec="zlib")
+    assert packed.codec == "zlib"
+    np.testing.assert_array_equal(unpack_array(packed), array)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "complex64"])
+def test_coefficients_round_trip(dtype):
+    real, imag = np.arange(8.0), -np.arange(8.0)
+    out_real, out_imag = unpack_coefficients(pack_coefficients(real, imag, dtype))
+    np.testing.assert_array_equal(out_real, real)
+    np.testing.assert_array_equal(out_imag, imag)
+
+
+def test_unpacked_array_is_a_read_only_view():
+    unpacked = unpack_array(pack_array(np.arange(4.0)))
+    assert not unpacked.flags.writeable
+
+
+def test_unknown_dtype():
+    packed = pack_array(np.arange(4.0))
+    packed.dtype = 7
+    with pytest.raises(ValueError):
+        unpack_array(packed)
+
+
+def test_shape_not_matching_data():
+    packed = pack_array(np.arange(6.0).reshape(2, 3))
+    packed.shape[:] = [4, 3]
+    with pytest.raises(ValueError):
+        unpack_array(packed)
+
+
+def test_data_not_a_whole_number_of_items():
+    packed = PackedArray(data=b"\0" * 7, dtype=PackedArray.FLOAT64)
+    with pytest.raises(ValueError):
+        unpack_array(packed)
+
+
+def test_float_coefficients_must_be_two_rows():
+    with pytest.raises(ValueError):
+        unpack_coefficients(pack_array(np.arange(8.0), "float32"))
+
+
+def test_corrupt_compressed_payload():
+    packed = pack_array(np.zeros(10_000), "float64", codec="zlib")
+    packed.data = b"not zlib" + packed.data[8:]
+    with pytest.raises(ValueError):
+        unpack_array(packed)
@@ -0,0 +1,66 @@
+import threading
+
+import grpc
+import pytest
+
+from reflection_cache import ReflectionCache
+from server import create_server
+
+SERVICE = "rfcontrol.RFController"
+
+
+@pytest.fixture
+def upstream():
+    server = create_server(port=0, mock_devices=1, rescan_interval=0)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    target = f"localhost:{port}"
+    channel = grpc.insecure_channel(target)
+    yield channel, target
+    channel.close()
+    server.stop(0)
+
+
+def test_descriptors_are_fetched_once(upstream):
+    channel, target = upstream
+    cache = ReflectionCache()
+    method = cache.method(channel, target, SERVICE, "getDeviceStatus")
+    assert method({"device_id": "mock"}, timeout=5.0).device_id == "mock"
+    assert cache.method(channel, target, SERVICE, "GETDEVICESTATUS") is method
+    assert cache.fetches == 1 and cache.cached(target, SERVICE)
+
+
+def test_stale_entry_keeps_callables_if_descriptors_are_unchanged(upstream):
+    channel, target = upstream
+    cache = ReflectionCache()
+    method = cache.method(channel, target, SERVICE, "getDeviceStatus")
+    cache.mark_stale(target)
+    assert not cache.cached(target, SERVICE)
+    assert cache.method(channel, target, SERVICE, "getDeviceStatus") is method
+    assert cache.fetches == 2
+
+
+def test_concurrent_lookups_fetch_once(upstream):
+    channel, target = upstream
+    cache = ReflectionCache()
+    threads = [threading.Thread(target=cache.method, args=(channel, target, SERVICE, "getPPString"))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.fetches == 1
+
+
+def test_unknown_method(upstream):
+    channel, target = upstream
+    with pytest.raises(ValueError):
+        ReflectionCache().method(channel, target, SERVICE, "noSuchMethod")
+
+
+def test_clear_drops_the_target(upstream):
+    channel, target = upstream
+    cache = ReflectionCache()
+    cache.method(channel, target, SERVICE, "getDeviceStatus")
+    cache.clear(target)
+    assert not cache.cached(target, SERVICE)
@@ -0,0 +1,60 @@
+import logging
+
+import pytest
+
+import rpc_log
+from rpc_log import LazyQueueHandler, MethodSampler, log_call, parse_sample_rates
+
+
+def test_sampler_logs_every_nth_call():
+    sampler = MethodSampler({"getDeviceStatus": 0.25, "TransferData": 0})
+    assert [sampler.sample("getDeviceStatus") for _ in range(8)] == [True, False, False, False] * 2
+    assert not any(sampler.sample("TransferData") for _ in range(10))
+    assert all(sampler.sample("setRFSettings") for _ in range(10))
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates(["getDeviceStatus=0.01", " TransferData =0"]) == {
+        "getDeviceStatus": 0.01, "TransferData": 0.0}
+    assert parse_sample_rates(None) == {}
+    with pytest.raises(ValueError):
+        parse_sample_rates(["getDeviceStatus"])
+
+
+class Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def records(monkeypatch):
+    handler = Records()
+    rpc_log.log.addHandler(handler)
+    level = rpc_log.log.level
+    rpc_log.log.setLevel(logging.INFO)
+    monkeypatch.setattr(rpc_log, "sampler", MethodSampler({"getDeviceStatus": 0}))
+    yield handler.records
+    rpc_log.log.removeHandler(handler)
+    rpc_log.log.setLevel(level)
+
+
+def test_log_call_attaches_method_and_device(records):
+    log_call("setRFSettings", "frequency=%s", 2e6, device_id="mock")
+    record, = records
+    assert (record.method, record.device_id, record.getMessage()) == ("setRFSettings", "mock", "frequency=2000000.0")
+
+
+def test_warnings_are_never_sampled(records):
+    log_call("getDeviceStatus", "Request")
+    log_call("getDeviceStatus", "Failed", level=logging.WARNING)
+    assert [record.getMessage() for record in records] == ["Failed"]
+
+
+def test_queue_handler_leaves_formatting_to_the_listener():
+    record = logging.LogRecord("rfcontrol", logging.INFO, __file__, 1, "value=%s", (42,), None)
+    prepared = LazyQueueHandler(None).prepare(record)
+    assert prepared is record and prepared.args == (42,)
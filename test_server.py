@@ -0,0 +1,79 @@
+import asyncio
+import threading
+
+import grpc
+import pytest
+
+import rfcontrol_pb2
+import rfcontrol_pb2_grpc
+from async_server import create_async_server
+from server import create_server
+
+
+def start_sync():
+    server = create_server(port=0, mock_devices=2, rescan_interval=0)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    return port, lambda: server.stop(0)
+
+
+def start_async():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    async def start():
+        server = create_async_server(port=0, mock_devices=2, rescan_interval=0)
+        port = server.add_insecure_port("localhost:0")
+        await server.start()
+        return server, port
+
+    server, port = asyncio.run_coroutine_threadsafe(start(), loop).result()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(server.stop(0), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+    return port, stop
+
+
+@pytest.fixture(params=["sync", "async"])
+def stub(request):
+    port, stop = start_sync() if request.param == "sync" else start_async()
+    channel = grpc.insecure_channel(f"localhost:{port}")
+    yield rfcontrol_pb2_grpc.RFControllerStub(channel)
+    channel.close()
+    stop()
+
+
+def test_settings_and_status(stub):
+    response = stub.setRFSettings(rfcontrol_pb2.RFRequest(device_id="mock", frequency=2e6, gain=5))
+    assert response.success
+    status = stub.getDeviceStatus(rfcontrol_pb2.DeviceRequest(device_id="mock"))
+    assert (status.frequency, status.gain) == (2e6, 5)
+    assert "Frequency: 2000000.0 Hz" in stub.getPPString(rfcontrol_pb2.DeviceRequest(device_id="mock")).pp_string
+
+
+def test_unknown_device(stub):
+    with pytest.raises(grpc.RpcError) as error:
+        stub.getDeviceStatus(rfcontrol_pb2.DeviceRequest(device_id="nope"))
+    assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+
+def test_batch_reports_a_status_per_device(stub):
+    response = stub.batchSetRFSettings(rfcontrol_pb2.BatchRFRequest(requests=[
+        rfcontrol_pb2.RFRequest(device_id="mock", frequency=3e6, gain=-9999),
+        rfcontrol_pb2.RFRequest(device_id="nope", frequency=3e6, gain=-9999),
+        rfcontrol_pb2.RFRequest(device_id="mock1", frequency=-1, gain=-9999),
+    ]))
+    assert [r.device_id for r in response.results] == ["mock", "nope", "mock1"]
+    assert [r.code for r in response.results][:2] == [0, grpc.StatusCode.INVALID_ARGUMENT.value[0]]
+    assert response.results[0].rf.success and not response.results[2].rf.success
+
+    statuses = stub.batchGetDeviceStatus(rfcontrol_pb2.BatchDeviceRequest(device_ids=["mock", "mock1"]))
+    assert [r.status.frequency for r in statuses.results] == [3e6, 1e6]
+
+
+def test_batch_ranges(stub):
+    response = stub.batchGetGainRange(rfcontrol_pb2.BatchDeviceRequest(device_ids=["mock", "mock1"]))
+    assert [(r.range.min_value, r.range.max_value) for r in response.results] == [(1, 30), (1, 30)]
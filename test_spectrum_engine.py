@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+import rfcontrol_pb2
+from spectrum_engine import SpectrumEngine
+
+
+def tone(n, bin_index, fft_size):
+    return np.cos(2 * np.pi * bin_index / fft_size * np.arange(n))
+
+
+def test_tone_peaks_at_its_bin():
+    engine = SpectrumEngine(fft_size=256, window="hann", averaging=4)
+    outputs = engine.feed(tone(256 * 4, 32, 256))
+    assert len(outputs) == 1
+    index, power, frames = outputs[0]
+    assert (index, frames) == (0, 4)
+    assert np.argmax(power) == 32
+    assert engine.frequencies[32] == pytest.approx(32 / 256)
+
+
+def test_blocks_of_any_size_give_the_same_averages():
+    samples = np.random.default_rng(0).standard_normal(4096)
+    whole = SpectrumEngine(fft_size=256, averaging=2).feed(samples)
+    engine = SpectrumEngine(fft_size=256, averaging=2)
+    split = [output for block in np.array_split(samples, 7) for output in engine.feed(block)]
+    assert len(whole) == len(split)
+    for (_, a, _), (_, b, _) in zip(whole, split):
+        np.testing.assert_allclose(a, b)
+
+
+def test_flush_emits_the_partial_average():
+    engine = SpectrumEngine(fft_size=64, averaging=4)
+    assert engine.feed(np.zeros(64 * 3)) == []
+    assert [frames for _, _, frames in engine.flush()] == [3]
+
+
+def test_bin_selection():
+    engine = SpectrumEngine(fft_size=64, bin_start=4, bin_stop=8)
+    engine.feed(np.zeros(64))
+    assert len(engine.frequencies) == 4
+    engine = SpectrumEngine(fft_size=64, bins=[1, 5, 9])
+    (_, power, _), = engine.feed(np.zeros(64))
+    assert power.shape == (3,)
+
+
+@pytest.mark.parametrize("options", [{"bin_start": 10, "bin_stop": 5}, {"bins": [0, 99]}])
+def test_invalid_bins(options):
+    with pytest.raises(ValueError):
+        SpectrumEngine(fft_size=64, **options).feed(np.zeros(64))
+
+
+def test_config_defaults():
+    engine = SpectrumEngine.from_config(rfcontrol_pb2.SpectrumConfig())
+    assert engine.stft.fft_size == 1024 and engine.averager.averaging == 1
@@ -0,0 +1,54 @@
+import threading
+import time
+
+from device_registry import DeviceRegistry
+from mock_device import MockDevice
+from status_hub import StatusHub, watch_delay
+
+
+def registry_of(*device_ids):
+    registry = DeviceRegistry()
+    registry.rescan(lambda: [(f"mock:{d}", lambda d=d: (d, MockDevice(d))) for d in device_ids])
+    return registry
+
+
+def test_poll_versions_only_changes():
+    registry = registry_of("a")
+    hub = StatusHub(registry)
+    hub.poll()
+    seen = {}
+    assert [update[0] for update in hub.changed(["a"], seen)] == ["a"]
+    hub.poll()
+    assert hub.changed(["a"], seen) == []
+    registry.get("a").set_gain(20)
+    hub.poll()
+    assert [update[0] for update in hub.changed(["a"], seen)] == ["a"]
+
+
+def test_hung_device_does_not_stop_the_others():
+    registry = registry_of("a", "b")
+    hub = StatusHub(registry, poll_timeout=0.2)
+    release = threading.Event()
+    registry.get("a").submit(release.wait, 5.0)
+
+    started = time.perf_counter()
+    hub.poll()
+    assert time.perf_counter() - started < 1.0
+    assert [update[0] for update in hub.changed(["a", "b"], {})] == ["b"]
+    # The pending read is not queued a second time behind the hung command
+    depth = registry.get("a").depth
+    hub.poll()
+    assert registry.get("a").depth == depth
+    release.set()
+
+
+def test_forget_drops_the_snapshot():
+    hub = StatusHub(registry_of("a"))
+    hub.poll()
+    hub.forget("a")
+    assert hub.changed(["a"], {}) == []
+
+
+def test_watch_delay():
+    assert watch_delay(0.0, 1.0, 0.1, now=0.5) == 0.5
+    assert watch_delay(0.0, 1.0, 0.1, now=5.0) == 0.1
@@ -0,0 +1,114 @@
+import pytest
+
+from transfer import AdaptiveChunkSizer, BufferSink, FileSink, MmapSink, TransferStore
+
+
+def test_buffer_sink_reorders_early_chunks():
+    sink = BufferSink(size_hint=6)
+    sink.add(2, b"cd")
+    sink.add(3, b"ef")
+    assert sink.size == 0 and sink.pending == 2
+    sink.add(1, b"ab")
+    assert bytes(sink.getbuffer()) == b"abcdef"
+    assert sink.pending == 0
+
+
+def test_buffer_sink_rejects_duplicates():
+    sink = BufferSink()
+    sink.add(1, b"ab")
+    with pytest.raises(ValueError):
+        sink.add(1, b"ab")
+    sink.add(3, b"ef")
+    with pytest.raises(ValueError):
+        sink.add(3, b"ef")
+    with pytest.raises(ValueError):
+        sink.add(0, b"??")
+    assert bytes(sink.getbuffer()) == b"ab"
+
+
+def test_buffer_sink_limits_held_chunks():
+    sink = BufferSink(max_pending=2)
+    sink.add(2, b"b")
+    sink.add(3, b"c")
+    with pytest.raises(ValueError):
+        sink.add(4, b"d")
+
+
+def test_buffer_sink_grows_by_shortfall():
+    sink = BufferSink(size_hint=100)
+    sink.add(1, b"x" * 100)
+    sink.add(2, b"y" * 10)
+    assert sink.size == 110
+    assert len(sink._buffer) == 125
+
+
+def test_file_sink_writes_in_chunk_order(tmp_path):
+    path = tmp_path / "out.bin"
+    sink = FileSink(str(path), first_chunk_id=0)
+    for chunk_id, data in [(1, b"cd"), (0, b"ab"), (2, b"ef")]:
+        sink.add(chunk_id, data)
+    sink.close()
+    assert path.read_bytes() == b"abcdef"
+
+
+def test_mmap_sink_in_sequence_only(tmp_path):
+    path = tmp_path / "out.bin"
+    sink = MmapSink(str(path), max_pending=0)
+    sink.add(1, b"abc")
+    with pytest.raises(ValueError):
+        sink.add(3, b"ghi")
+    with pytest.raises(ValueError):
+        sink.add(1, b"abc")
+    sink.add(2, b"def")
+    sink.close()
+    assert path.read_bytes() == b"abcdef"
+
+
+def test_transfer_session_offsets(tmp_path):
+    store = TransferStore(str(tmp_path))
+    session = store.open("s1")
+    assert session.write(0, b"abcd") == 4
+    # Overlapping resend: only the new bytes are written
+    assert session.write(2, b"cdef") == 6
+    with pytest.raises(ValueError):
+        session.write(10, b"gap")
+    session.close()
+
+    assert store.status("s1") == (6, False)
+    session = store.open("s1")
+    assert session.offset == 6
+    session.write(6, b"gh")
+    session.complete()
+    assert store.status("s1") == (8, True)
+    assert (tmp_path / "s1.bin").read_bytes() == b"abcdefgh"
+
+
+def test_transfer_store_rejects_bad_and_busy_sessions(tmp_path):
+    store = TransferStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        store.open("../escape")
+    session = store.open("s1")
+    with pytest.raises(ValueError):
+        store.open("s1")
+    session.close()
+    store.open("s1").close()
+
+
+def test_adaptive_chunk_sizer_grows_while_throughput_improves():
+    sizer = AdaptiveChunkSizer(initial=100, minimum=10, maximum=10_000, step=2.0)
+    assert sizer.update(100, 1.0, 0.01) == 200
+    assert sizer.update(400, 1.0, 0.02) == 400
+
+
+def test_adaptive_chunk_sizer_shrinks_when_rtt_grows():
+    sizer = AdaptiveChunkSizer(initial=100, minimum=10, maximum=10_000, step=2.0)
+    sizer.update(100, 1.0, 0.01)
+    # Round trip per unit of chunk size far above the best seen: queuing
+    assert sizer.update(200, 1.0, 1.0) == 100
+
+
+def test_adaptive_chunk_sizer_stays_in_bounds():
+    sizer = AdaptiveChunkSizer(initial=100, minimum=50, maximum=150, step=2.0)
+    assert sizer.update(100, 1.0, 0.01) == 150
+    assert sizer.update(100, 1.0, 10.0) == 75
+    assert sizer.update(100, 1.0, 100.0) == 50
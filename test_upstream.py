@@ -0,0 +1,45 @@
+import grpc
+import pytest
+
+from server import create_server
+from upstream import Upstream, UpstreamPool
+
+
+@pytest.fixture
+def pool():
+    server = create_server(port=0, mock_devices=1, rescan_interval=0)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    pool = UpstreamPool({"local": Upstream(f"localhost:{port}", timeout=5.0)})
+    yield pool, server
+    pool.close()
+    server.stop(0)
+
+
+def failures(pool):
+    return sum(health["failures"] for health in pool.health().values())
+
+
+def test_invoke_records_success(pool):
+    pool, _ = pool
+    response = pool.invoke("local", "getDeviceStatus", {"device_id": "mock"})
+    assert response
+    assert pool.healthy("local") and failures(pool) == 0
+
+
+def test_caller_errors_do_not_count_against_the_upstream(pool):
+    pool, _ = pool
+    with pytest.raises(ValueError):
+        pool.invoke("local", "noSuchMethod", {})
+    with pytest.raises(ValueError):
+        pool.invoke("nowhere", "getDeviceStatus", {})
+    assert pool.healthy("local") and failures(pool) == 0
+
+
+def test_failed_calls_count_against_the_upstream(pool):
+    pool, server = pool
+    pool.invoke("local", "getDeviceStatus", {"device_id": "mock"})
+    server.stop(0).wait()
+    with pytest.raises(grpc.RpcError):
+        pool.invoke("local", "getDeviceStatus", {"device_id": "mock"})
+    assert not pool.healthy("local") and failures(pool) == 1
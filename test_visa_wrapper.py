@@ -0,0 +1,50 @@
+import pytest
+
+from instrument_registry import InstrumentRegistry
+from mock_instrument import MockInstrument
+from visa_wrapper import VisaWrapper, split_replies
+
+
+def connected(**kwargs):
+    wrapper = VisaWrapper("sa1", instrument=MockInstrument("sa1"), **kwargs)
+    wrapper.open()
+    return wrapper
+
+
+def test_split_replies_keeps_quoted_separators():
+    assert split_replies('1;"a;b";2\n') == ["1", '"a;b"', "2"]
+
+
+def test_batch_is_one_round_trip_per_message():
+    wrapper = connected()
+    replies = wrapper.ExecuteBatch(["*IDN?", "FREQ 2e6", "FREQ?"])
+    assert replies[1:] == ["", "2000000.0"]
+    assert wrapper.instrument.writes == 1 and wrapper.instrument.reads == 1
+
+
+def test_long_batches_are_split():
+    wrapper = connected()
+    replies = wrapper.ExecuteBatch(["FREQ?"] * 10, max_length=20)
+    assert replies == ["1000000.0"] * 10
+    assert wrapper.instrument.writes == 4
+
+
+def test_invalid_commands_are_rejected_before_sending():
+    wrapper = connected()
+    with pytest.raises(ValueError):
+        wrapper.ExecuteBatch(["FREQ?;GAIN?"])
+    assert wrapper.instrument.writes == 0
+
+
+def test_failed_batch_leaves_no_replies_behind():
+    wrapper = connected()
+    with pytest.raises(ValueError):
+        wrapper.ExecuteBatch(["FREQ?", "FREQ abc"])
+    assert wrapper.Query("GAIN?") == "10.0"
+
+
+def test_registry_session_is_usable_after_a_failed_batch():
+    registry = InstrumentRegistry(factory=lambda device_id: VisaWrapper(device_id, instrument=MockInstrument(device_id)))
+    with pytest.raises(ValueError):
+        registry.execute("sa1", ["*IDN?", "GAIN x"])
+    assert registry.execute("sa1", ["FREQ?"]) == ["1000000.0"]
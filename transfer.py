@@ -0,0 +1,380 @@
+import mmap
+import os
+import re
+import threading
+import time
+
+# gRPC rejects received messages over 4 MiB by default; leave room for the other fields
+MAX_CHUNK_SIZE = 4 * 1024 * 1024 - 64 * 1024
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Appended to every chunk the server echoes back
+ECHO_SUFFIX = b"_processed"
+
+
+class ChunkSink:
+    """
+    Base class for TransferData receive sinks.
+
+    Chunks are placed by chunk_id. A chunk that arrives before its
+    predecessors is held until the gap is filled, so chunks may arrive in any
+    order while the output is still written front to back exactly once.
+    At most max_pending chunks are held; max_pending=0 accepts chunks only in
+    sequence. A duplicate chunk_id, one before first_chunk_id or one beyond
+    the held limit raises ValueError.
+    """
+    def __init__(self, first_chunk_id=1, max_pending=64):
+        self.next_chunk_id = first_chunk_id
+        self.max_pending = max_pending
+        self.size = 0
+        self.chunks = 0
+        self._early = {}
+        self._started = None
+        self._finished = None
+
+    def add(self, chunk_id, data):
+        if self._started is None:
+            self._started = time.perf_counter()
+        if chunk_id < self.next_chunk_id or chunk_id in self._early:
+            raise ValueError(f"Duplicate or out-of-sequence chunk_id {chunk_id}, expected {self.next_chunk_id}")
+        if chunk_id != self.next_chunk_id:
+            if len(self._early) >= self.max_pending:
+                raise ValueError(f"Chunk {chunk_id} arrived ahead of missing chunk {self.next_chunk_id}")
+            self._early[chunk_id] = data
+            return
+        self._append(data)
+        while self.next_chunk_id in self._early:
+            self._append(self._early.pop(self.next_chunk_id))
+        self._finished = time.perf_counter()
+
+    def _append(self, data):
+        self._write(self.size, data)
+        self.size += len(data)
+        self.chunks += 1
+        self.next_chunk_id += 1
+
+    def _write(self, offset, data):
+        raise NotImplementedError
+
+    @property
+    def pending(self):
+        """Number of chunks received ahead of a missing predecessor."""
+        return len(self._early)
+
+    @property
+    def elapsed(self):
+        if self._started is None or self._finished is None:
+            return 0.0
+        return self._finished - self._started
+
+    @property
+    def throughput(self):
+        """Bytes per second between the first chunk and the last written chunk."""
+        return self.size / self.elapsed if self.elapsed else 0.0
+
+    def close(self):
+        pass
+
+
+class BufferSink(ChunkSink):
+    """
+    Reassemble chunks into one preallocated bytearray.
+
+    size_hint preallocates the expected size; if more data arrives the buffer
+    grows in place by the missing bytes, at least by a quarter, so a small
+    overrun does not double the memory and total copying stays linear.
+    """
+    def __init__(self, size_hint=0, first_chunk_id=1, max_pending=64):
+        super().__init__(first_chunk_id, max_pending)
+        self._buffer = bytearray(size_hint)
+
+    def _write(self, offset, data):
+        end = offset + len(data)
+        if end > len(self._buffer):
+            self._buffer += bytes(max(end, len(self._buffer) + len(self._buffer) // 4) - len(self._buffer))
+        self._buffer[offset:end] = data
+
+    def getbuffer(self):
+        """Received bytes as a memoryview, without copying."""
+        return memoryview(self._buffer)[:self.size]
+
+
+class FileSink(ChunkSink):
+    """Write reassembled chunks to a file, front to back."""
+    def __init__(self, path, first_chunk_id=1, max_pending=64):
+        super().__init__(first_chunk_id, max_pending)
+        self.path = path
+        self._file = open(path, "wb")
+
+    def _write(self, offset, data):
+        self._file.write(data)
+
+    def close(self):
+        self._file.close()
+
+
+class MmapSink(ChunkSink):
+    """
+    Write reassembled chunks into a memory-mapped file.
+
+    The file is grown in doubling steps while data arrives and truncated to
+    the received size on close.
+    """
+    def __init__(self, path, size_hint=0, first_chunk_id=1, max_pending=64):
+        super().__init__(first_chunk_id, max_pending)
+        self.path = path
+        self._file = open(path, "w+b")
+        self._map = None
+        self._resize(max(size_hint, mmap.PAGESIZE))
+
+    def _resize(self, capacity):
+        if self._map is not None:
+            self._map.close()
+        self._file.truncate(capacity)
+        self._map = mmap.mmap(self._file.fileno(), capacity)
+
+    def _write(self, offset, data):
+        end = offset + len(data)
+        if end > len(self._map):
+            self._resize(max(end, 2 * len(self._map)))
+        self._map[offset:end] = data
+
+    def close(self):
+        if self._map is None:
+            return
+        self._map.flush()
+        self._map.close()
+        self._map = None
+        self._file.truncate(self.size)
+        self._file.close()
+
+
+class MmapSource:
+    """
+    Read-only memory map of a file for sending.
+
+    view is a memoryview over the mapping, so slices for chunks do not copy
+    and files larger than RAM are paged in as they are sent.
+
+    usage:
+    with MmapSource("capture.bin") as view:
+        Client.transfer_data(stub, view)
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        if os.fstat(self._file.fileno()).st_size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.view = memoryview(self._map)
+        else:
+            # mmap cannot map an empty file
+            self._map = None
+            self.view = memoryview(b"")
+
+    def __enter__(self):
+        return self.view
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.view.release()
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # A request generator still holds a view; the mapping is
+                # unmapped when that view is released
+                pass
+        self._file.close()
+
+
+class TransferSession:
+    """
+    Append-only partial file of one resumable transfer.
+
+    offset is the committed offset: every byte before it has been written to
+    the file. Chunks must start at or before the committed offset; bytes the
+    server already has are skipped, so a client may resend overlapping data.
+    """
+    def __init__(self, store, session_id):
+        self.store = store
+        self.session_id = session_id
+        self.path = store.partial_path(session_id)
+        self._file = open(self.path, "ab")
+        self.offset = self._file.tell()
+
+    def write(self, offset, data):
+        """Write data found at offset in the payload, return the new committed offset."""
+        if offset > self.offset:
+            raise ValueError(f"Chunk at offset {offset} leaves a gap after committed offset {self.offset}")
+        skip = self.offset - offset
+        if skip < len(data):
+            self._file.write(memoryview(data)[skip:])
+            # Flush so GetTransferStatus sees the committed offset in the file size
+            self._file.flush()
+            self.offset = offset + len(data)
+        return self.offset
+
+    def complete(self):
+        """Close the partial file and move it to its final name."""
+        self._file.close()
+        os.replace(self.path, self.store.final_path(self.session_id))
+        self.store.release(self.session_id)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+            self.store.release(self.session_id)
+
+
+class TransferStore:
+    """
+    Server-side store for resumable TransferData sessions.
+
+    A session writes to <root>/<session_id>.part and is renamed to
+    <root>/<session_id>.bin once its last chunk arrives. The committed offset
+    of an unfinished session is the size of its partial file.
+    """
+    SESSION_ID = re.compile(r"^[A-Za-z0-9_.-]{1,128}$")
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._active = set()
+        self._lock = threading.Lock()
+
+    def _check(self, session_id):
+        if not self.SESSION_ID.match(session_id) or session_id.startswith("."):
+            raise ValueError(f"Invalid session_id '{session_id}'")
+
+    def partial_path(self, session_id):
+        return os.path.join(self.root, f"{session_id}.part")
+
+    def final_path(self, session_id):
+        return os.path.join(self.root, f"{session_id}.bin")
+
+    def status(self, session_id):
+        """
+        Returns:
+            tuple: (committed offset, complete)
+        """
+        self._check(session_id)
+        if os.path.exists(self.final_path(session_id)):
+            return os.path.getsize(self.final_path(session_id)), True
+        if os.path.exists(self.partial_path(session_id)):
+            return os.path.getsize(self.partial_path(session_id)), False
+        return 0, False
+
+    def open(self, session_id):
+        """Open a session for writing. Only one stream may write a session at a time."""
+        self._check(session_id)
+        if os.path.exists(self.final_path(session_id)):
+            raise ValueError(f"Session '{session_id}' is already complete")
+        with self._lock:
+            if session_id in self._active:
+                raise ValueError(f"Session '{session_id}' is already being written by another stream")
+            self._active.add(session_id)
+        try:
+            return TransferSession(self, session_id)
+        except OSError:
+            self.release(session_id)
+            raise
+
+    def release(self, session_id):
+        with self._lock:
+            self._active.discard(session_id)
+
+
+class AdaptiveChunkSizer:
+    """
+    Tune the chunk size of a bulk stream from measured throughput and round trip.
+
+    After every acknowledged window the size takes one multiplicative step.
+    It keeps moving in the same direction while throughput improves and turns
+    around when throughput drops. The round trip is compared per unit of chunk
+    size: if it grows beyond rtt_limit times the best seen, chunks are queuing
+    rather than filling the link, and the size shrinks.
+    Sizes are in the caller's unit (bytes, coefficients, ...).
+    """
+    def __init__(self, initial=1024*1024, minimum=64*1024, maximum=MAX_CHUNK_SIZE, step=1.5, rtt_limit=4.0):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.chunk_size = min(max(initial, minimum), maximum)
+        self.step = step
+        self.rtt_limit = rtt_limit
+        self.direction = 1
+        self.min_unit_rtt = None
+        self.throughput = None
+
+    def update(self, nbytes, seconds, rtt):
+        """Record one acknowledged window and return the next chunk size."""
+        if seconds <= 0:
+            return self.chunk_size
+        throughput = nbytes / seconds
+        unit_rtt = rtt / self.chunk_size
+        self.min_unit_rtt = unit_rtt if self.min_unit_rtt is None else min(self.min_unit_rtt, unit_rtt)
+        if unit_rtt > self.rtt_limit * self.min_unit_rtt:
+            self.direction = -1
+        elif self.throughput is not None and throughput < 0.95 * self.throughput:
+            self.direction = -self.direction
+        # Smooth out per-window noise
+        self.throughput = throughput if self.throughput is None else 0.5 * (self.throughput + throughput)
+
+        size = int(self.chunk_size * self.step ** self.direction)
+        self.chunk_size = min(max(size, self.minimum), self.maximum)
+        return self.chunk_size
+
+
+class FlowControl:
+    """
+    Credit window for a bulk client stream with cumulative acks.
+
+    The receiver acknowledges every ack_every-th chunk. The sender may have at
+    most ack_every * window_acks chunks unacknowledged; acquire() blocks in the
+    request generator until an ack returns credit. Each ack also feeds the
+    measured round trip and throughput to the chunk sizer.
+    """
+    def __init__(self, ack_every=4, window_acks=2, sizer=None):
+        self.ack_every = ack_every
+        self.window = ack_every * window_acks
+        self.sizer = sizer or AdaptiveChunkSizer()
+        self._sent = {}
+        self._last_ack_time = None
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def chunk_size(self):
+        return self.sizer.chunk_size
+
+    def acquire(self):
+        """Wait for credit to send another chunk. Returns False once the stream is closed."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._closed or len(self._sent) < self.window)
+            return not self._closed
+
+    def sent(self, seq, nbytes):
+        with self._cond:
+            now = time.perf_counter()
+            if self._last_ack_time is None:
+                self._last_ack_time = now
+            self._sent[seq] = (now, nbytes)
+
+    def acked(self, seq):
+        """Release credit for every chunk up to and including seq."""
+        with self._cond:
+            now = time.perf_counter()
+            acked = [s for s in self._sent if s <= seq]
+            if not acked:
+                return
+            sent_at = self._sent[max(acked)][0]
+            nbytes = sum(self._sent.pop(s)[1] for s in acked)
+            self.sizer.update(nbytes, now - self._last_ack_time, now - sent_at)
+            self._last_ack_time = now
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
@@ -0,0 +1,310 @@
+"""
+Shared channels to upstream gRPC servers (the FlexSDR and friends).
+
+Each upstream target gets one long-lived channel with HTTP/2 keepalive,
+created on first use and shared by every servicer method, instead of a new
+connection (and TCP/HTTP2 handshake) per call. The pool tracks the
+connectivity state and call results of each target so an unreachable
+upstream shows up in the logs and in health().
+
+Methods are called dynamically, by name and with dict requests, through
+callables built from descriptors fetched once per target (see reflection_cache.py).
+"""
+import json
+import threading
+import time
+from concurrent import futures
+
+import grpc
+from google.protobuf import json_format
+
+from fan_out import FanOut, NodeResult
+from reflection_cache import ReflectionCache
+from rpc_log import log
+
+
+class Upstream:
+    """
+    Settings for one upstream server.
+
+    Args:
+        target (str): host:port of the server
+        service (str): Full service name used for calls, e.g. "rfcontrol.RFController"
+        timeout (float): Deadline in seconds for each call (None waits forever)
+        keepalive_time (float): Seconds between HTTP/2 keepalive pings
+        keepalive_timeout (float): Seconds to wait for a ping ack before the connection is dropped
+        keepalive_without_calls (bool): Also ping idle connections, see below
+        group (str): Name of the group of nodes this one belongs to, e.g. "flexsdr" for a rack
+
+    A gRPC server with default settings accepts a ping at most every 5 minutes
+    and none while no call is active; more pings get the connection closed
+    with GOAWAY "too_many_pings". The defaults stay within that. A shorter
+    keepalive_time, or keepalive_without_calls to keep idle connections warm,
+    needs the upstream server to allow it, e.g. with the server options
+    ("grpc.http2.min_ping_interval_without_data_ms", <= keepalive_time in ms)
+    and ("grpc.keepalive_permit_without_calls", 1).
+    """
+    def __init__(self, target, service="rfcontrol.RFController", timeout=5.0,
+                 keepalive_time=300.0, keepalive_timeout=20.0, keepalive_without_calls=False, group=None):
+        self.target = target
+        self.group = group
+        self.service = service
+        self.timeout = timeout
+        self.keepalive_time = keepalive_time
+        self.keepalive_timeout = keepalive_timeout
+        self.keepalive_without_calls = keepalive_without_calls
+
+    def channel_options(self):
+        options = [
+            ("grpc.keepalive_time_ms", int(self.keepalive_time * 1000)),
+            ("grpc.keepalive_timeout_ms", int(self.keepalive_timeout * 1000)),
+        ]
+        if self.keepalive_without_calls:
+            options += [
+                ("grpc.keepalive_permit_without_calls", 1),
+                ("grpc.http2.max_pings_without_data", 0),
+            ]
+        return options
+
+
+DEFAULT_UPSTREAMS = {
+    "flexsdr": Upstream("192.168.137.232:5555"),
+    "server_b": Upstream("localhost:2222", service="RFController"),
+}
+
+
+class UpstreamHealth:
+    """Connectivity state and call results of one target."""
+    def __init__(self, target):
+        self.target = target
+        self.state = None
+        self.connects = 0
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_error = None
+        self.last_success = None
+
+    def as_dict(self):
+        return {
+            "target": self.target,
+            "state": self.state.name if self.state is not None else "IDLE",
+            "connects": self.connects,
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+            "last_success": self.last_success,
+        }
+
+
+def _remaining(name, started, budget):
+    """Seconds left of a deadline of budget seconds from started (None: no deadline)."""
+    if budget is None:
+        return None
+    remaining = started + budget - time.perf_counter()
+    if remaining <= 0:
+        raise TimeoutError(f"Deadline of {name} expired before its call started")
+    return remaining
+
+
+class UpstreamPool:
+    """
+    One channel per upstream target, shared by all callers.
+
+    Upstreams are named; names pointing at the same target share its channel.
+
+    usage:
+    upstreams = UpstreamPool.load("upstreams.json")
+    response = upstreams.invoke("flexsdr", "runCustomCmd", {"customCmdName": "pwd"})
+
+    upstreams.json maps names to Upstream arguments:
+    {"flexsdr": {"target": "192.168.137.232:5555", "timeout": 5.0},
+     "flexsdr-2": {"target": "192.168.137.233:5555", "group": "flexsdr"}}
+    """
+    def __init__(self, upstreams=None):
+        self.upstreams = dict(DEFAULT_UPSTREAMS)
+        if upstreams:
+            self.upstreams.update(upstreams)
+        self._channels = {}
+        self._health = {}
+        self._lock = threading.Lock()
+        self.descriptors = ReflectionCache()
+        # Reflection lookups for nodes without cached descriptors run here, in parallel
+        self._resolver = futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="upstream")
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            config = json.load(f)
+        return cls({name: Upstream(**upstream) for name, upstream in config.items()})
+
+    def upstream(self, name):
+        if name not in self.upstreams:
+            raise ValueError(f"Unknown upstream '{name}', configure one of {', '.join(self.upstreams)}")
+        return self.upstreams[name]
+
+    def channel(self, name):
+        """Shared channel to the target of upstream name, connected on first use."""
+        upstream = self.upstream(name)
+        with self._lock:
+            channel = self._channels.get(upstream.target)
+            if channel is not None:
+                return channel
+            channel = grpc.insecure_channel(upstream.target, options=upstream.channel_options())
+            self._channels[upstream.target] = channel
+            self._health[upstream.target] = UpstreamHealth(upstream.target)
+        channel.subscribe(lambda state: self._state_changed(upstream.target, state), try_to_connect=True)
+        return channel
+
+    def nodes(self, names):
+        """Expand group names into the upstreams of the group (an upstream is in its own group)."""
+        nodes = []
+        for name in names:
+            members = [n for n, upstream in self.upstreams.items() if n == name or upstream.group == name]
+            if not members:
+                raise ValueError(f"Unknown upstream '{name}', configure one of {', '.join(self.upstreams)}")
+            nodes.extend(n for n in members if n not in nodes)
+        return nodes
+
+    def method(self, name, method, timeout=None):
+        """Callable for method of upstream name, built from cached descriptors (looked up within timeout)."""
+        upstream = self.upstream(name)
+        return self.descriptors.method(self.channel(name), upstream.target, upstream.service, method,
+                                       timeout or upstream.timeout)
+
+    def invoke(self, name, method, request, header=None):
+        """
+        Call method of upstream name with a dict request.
+
+        Returns:
+            dict: the response message
+        """
+        upstream = self.upstream(name)
+        metadata = [(str(k), str(v)) for k, v in header.items()] if header else None
+        try:
+            try:
+                response = self.method(name, method)(request, metadata, upstream.timeout)
+            except grpc.RpcError as e:
+                if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                    raise
+                # The upstream may have been redeployed with another API: recheck once
+                self.descriptors.mark_stale(upstream.target, upstream.service)
+                response = self.method(name, method)(request, metadata, upstream.timeout)
+        except Exception as e:
+            self._record(upstream.target, error=e)
+            raise
+        self._record(upstream.target)
+        return json_format.MessageToDict(response)
+
+    def fan_out(self, names, method, request, mode="all", count=1, timeout=None, header=None):
+        """
+        Send request to method of every upstream in names (or their groups) concurrently.
+
+        Args:
+            names (list): Upstream or group names
+            method (str): Method name, e.g. "runCustomCmd"
+            request (dict): Request message as a dict
+            mode (str): "all", "first" (count answers) or "quorum", see FanOut
+            count (int): Successful answers needed in "first" mode
+            timeout (float): Deadline per node, defaults to each upstream's timeout
+
+        Returns:
+            FanOut: iterate it for a NodeResult per node as the nodes answer
+        """
+        nodes = self.nodes(names)
+        fan = FanOut(nodes, mode, count)
+        metadata = [(str(k), str(v)) for k, v in header.items()] if header else None
+        # Deadlines and elapsed times include a wait for a free resolver thread
+        started = time.perf_counter()
+        for name in nodes:
+            upstream = self.upstreams[name]
+            if self.descriptors.cached(upstream.target, upstream.service):
+                self._start_node(fan, name, method, request, metadata, timeout, started)
+            else:
+                self._resolver.submit(self._start_node, fan, name, method, request, metadata, timeout, started)
+        return fan
+
+    def _start_node(self, fan, name, method, request, metadata, timeout, started):
+        upstream = self.upstreams[name]
+        if fan.done:
+            return
+        budget = timeout or upstream.timeout
+        try:
+            # The descriptor lookup of a cold node counts against its deadline
+            callable_ = self.method(name, method, _remaining(name, started, budget))
+            call = callable_.future(request, metadata, _remaining(name, started, budget))
+        except Exception as e:
+            self._record(upstream.target, error=e)
+            fan.deliver(NodeResult(name, upstream.target, error=e, elapsed=time.perf_counter() - started))
+            return
+        fan.add_call(call)
+
+        def done(call):
+            elapsed = time.perf_counter() - started
+            if call.cancelled():
+                return
+            try:
+                response = json_format.MessageToDict(call.result())
+            except Exception as e:
+                self._record(upstream.target, error=e)
+                fan.deliver(NodeResult(name, upstream.target, error=e, elapsed=elapsed))
+                return
+            self._record(upstream.target)
+            fan.deliver(NodeResult(name, upstream.target, response, elapsed=elapsed))
+
+        call.add_done_callback(done)
+
+    def _state_changed(self, target, state):
+        with self._lock:
+            health = self._health[target]
+            previous, health.state = health.state, state
+            reconnected = state == grpc.ChannelConnectivity.READY and health.connects > 0
+            if state == grpc.ChannelConnectivity.READY:
+                health.connects += 1
+        if state == grpc.ChannelConnectivity.TRANSIENT_FAILURE:
+            log.warning("Upstream %s is unreachable", target)
+        elif state == grpc.ChannelConnectivity.READY and previous == grpc.ChannelConnectivity.TRANSIENT_FAILURE:
+            log.info("Upstream %s is reachable again", target)
+        if reconnected:
+            # The upstream may have restarted with a new version
+            self.descriptors.mark_stale(target)
+
+    def _record(self, target, error=None):
+        # Only failed calls count against the upstream; an unknown method, a
+        # bad request or a deadline that expired before sending say nothing about it
+        if error is not None and not isinstance(error, grpc.RpcError):
+            return
+        with self._lock:
+            health = self._health.get(target)
+            if health is None:
+                return
+            if error is None:
+                health.successes += 1
+                health.consecutive_failures = 0
+                health.last_success = time.time()
+            else:
+                health.failures += 1
+                health.consecutive_failures += 1
+                health.last_error = str(error)
+
+    def healthy(self, name):
+        """False if the target of upstream name is unreachable or its last call failed."""
+        with self._lock:
+            health = self._health.get(self.upstream(name).target)
+            if health is None:
+                return True
+            return health.state != grpc.ChannelConnectivity.TRANSIENT_FAILURE and health.consecutive_failures == 0
+
+    def health(self):
+        """Health of every target with an open channel, keyed by target."""
+        with self._lock:
+            return {target: health.as_dict() for target, health in self._health.items()}
+
+    def close(self):
+        with self._lock:
+            channels, self._channels = self._channels, {}
+        self.descriptors.clear()
+        self._resolver.shutdown(wait=False)
+        for channel in channels.values():
+            channel.close()
@@ -1,26 +1,150 @@
+from mock_instrument import MockInstrument
+
+# Longest message sent to an instrument; longer batches are split (input buffers are small)
+MAX_MESSAGE_LENGTH = 512
+
+
+def is_query(command):
+    return command.split(" ", 1)[0].endswith("?")
+
+
+def split_replies(message):
+    """Split a combined reply on ";", except inside quoted strings."""
+    replies, current, quoted = [], [], False
+    for char in message.strip():
+        if char == '"':
+            quoted = not quoted
+        if char == ";" and not quoted:
+            replies.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    replies.append("".join(current))
+    return replies
+
+
+def parse_identity(reply):
+    """Fields of an *IDN? reply: manufacturer,model,serial,firmware."""
+    manufacturer, model, serial_number, firmware_revision = (reply.split(",", 3) + [""] * 4)[:4]
+    return {
+        "manufacturer"      : manufacturer,
+        "model"             : model,
+        "serial_number"     : int(serial_number) if serial_number.isdigit() else 0,
+        "firmware_revision" : firmware_revision,
+    }
+
+
+def parse_error(reply):
+    """Message of a SYST:ERR? reply (code,"message")."""
+    code, _, message = reply.partition(",")
+    return message.strip('"') or code
+
+
 class VisaWrapper:
-    def __init__(self, device_id="mock", frequency=1e6, gain=10):
+    def __init__(self, device_id="mock", frequency=1e6, gain=10, query_delay=0.0, instrument=None):
         self.device_id = device_id
         self.frequency = frequency
         self.gain = gain
         self.ref_locked = True
         self.lo_locked = True
+        # query_delay simulates the round trip of one VISA query on the mock instrument;
+        # instrument can be any resource with write() and read(), e.g. a pyvisa resource
+        self.query_delay = query_delay
+        self.instrument = instrument
+        self.connected = False
+
+    def open(self):
+        if self.instrument is None:
+            self.instrument = MockInstrument(self.device_id, latency=self.query_delay)
+        self.connected = True
+
+    def close(self):
+        if self.instrument is not None:
+            self.instrument.close()
+        self.connected = False
 
     
     ### VISA Commands Wrapper Starts ### 
-    
-    def GetDeviceInformation(error_queue_populate=True):
-        ##error_queue_populate = request.error_queue_populate
-        response = {
-            "manufacturer"      : "XRComm",
-            "model"             : "FlexSDR S8010-01",
-            "serial_number"     : 123456,
-            "firmware_revision" : "Alpha 1",
-            "reply_information" : "Error Code"
-            ##"reply_information" : {"status" : 101,
-            ##                        "message": "Device could not be found"
-            ##                      }
-        }
+
+    def ExecuteBatch(self, commands, max_length=MAX_MESSAGE_LENGTH):
+        """
+        Run several SCPI commands with as few round trips as possible.
+
+        Commands are joined with ";" into messages of up to max_length
+        characters. Each message is one write, followed by one read for the
+        replies of all queries in it.
+
+        Args:
+            commands (list): SCPI commands, e.g. ["*IDN?", "FREQ 2e6", "FREQ?"]
+            max_length (int): Longest message sent to the instrument
+
+        Returns:
+            list: one reply per command, "" for commands that are not queries
+        """
+        if not self.connected:
+            raise ConnectionError(f"Instrument '{self.device_id}' is not connected")
+        for command in commands:
+            if not command.strip() or any(c in command for c in ';\n'):
+                raise ValueError(f"Invalid SCPI command {command!r}: send one command per entry")
+
+        replies = []
+        message = []
+        try:
+            for command in commands:
+                # A leading ":" starts each command at the root of the command tree
+                command = command.strip()
+                if not command.startswith((":", "*")):
+                    command = ":" + command
+                if message and len(";".join(message + [command])) > max_length:
+                    replies.extend(self._send(message))
+                    message = []
+                message.append(command)
+            if message:
+                replies.extend(self._send(message))
+        except Exception:
+            # Replies to the queries already sent would be read by the next query
+            self.clear()
+            raise
+        return replies
+
+    def clear(self):
+        """Discard replies the instrument has not sent yet (VISA device clear)."""
+        clear = getattr(self.instrument, "clear", None)
+        if clear is not None:
+            clear()
+
+    def _send(self, message):
+        self.instrument.write(";".join(message))
+        queries = sum(1 for command in message if is_query(command))
+        if not queries:
+            return [""] * len(message)
+        answers = split_replies(self.instrument.read())
+        if len(answers) != queries:
+            # Replies no longer line up with queries, the session has to be reopened
+            raise ConnectionError(f"Expected {queries} replies from '{self.device_id}', got {len(answers)}")
+        answers = iter(answers)
+        return [next(answers) if is_query(command) else "" for command in message]
+
+    def Query(self, command):
+        return self.ExecuteBatch([command])[0]
+
+    def GetIdentity(self):
+        """Manufacturer, model, serial number and firmware (*IDN?); fixed while connected."""
+        return parse_identity(self.Query("*IDN?"))
+
+    def GetErrorQueue(self):
+        """Next entry of the instrument error queue (SYST:ERR?), without its code."""
+        return parse_error(self.Query("SYST:ERR?"))
+        ##return {"status" : 101,
+        ##        "message": "Device could not be found"
+        ##       }
+
+    def GetDeviceInformation(self, error_queue_populate=True):
+        commands = ["*IDN?", "SYST:ERR?"] if error_queue_populate else ["*IDN?"]
+        # Both queries in one round trip
+        replies = self.ExecuteBatch(commands)
+        response = parse_identity(replies[0])
+        response["reply_information"] = parse_error(replies[1]) if error_queue_populate else ""
         return response
 
     ### VISA Commands Wrapper Ends ###